@@ -0,0 +1,150 @@
+import argparse
+import importlib
+import json
+import logging
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = ROOT / 'tests' / 'fixtures'
+REPORT_DIR = ROOT / 'benchmarks' / 'reports'
+
+# name -> (module, parse function, recorded page)
+CASES = {
+    "nl_profile": ("src.utils.parsers.parse_profile", "extract_profile_data", "nl_profile.html"),
+    "es_profile": ("src.utils.parsers.es_parse_profile", "es_extract_profile_data", "es_profile.html"),
+    "nl_listing": ("src.utils.parsers.parse_listing", "extract_listing_endpoints", "nl_listing.html"),
+    "es_listing": ("src.utils.parsers.parse_listing", "es_extract_listing_endpoints", "es_listing.html"),
+}
+
+# Throughput may drop, and peak traced memory may grow, by this fraction before a case counts as a regression
+DEFAULT_TOLERANCE = 0.2
+
+
+def count_records(result):
+    if isinstance(result, list):
+        return len(result)
+    return 0 if not result or "error" in result else 1
+
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def run_case(name, iterations, backend):
+    # Runs in a fresh process so peak RSS belongs to this case alone
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    module_name, func_name, fixture = CASES[name]
+    parse = getattr(importlib.import_module(module_name), func_name)
+    page_content = (CORPUS_DIR / fixture).read_text(encoding='utf-8')
+
+    # The parsers log every record; keep that out of the measurement
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        records = count_records(parse(page_content, backend))
+
+        tracemalloc.start()
+        parse(page_content, backend)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak_traced = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        retained_blocks = sum(stat.count for stat in snapshot.statistics('filename'))
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            parse(page_content, backend)
+        elapsed = time.perf_counter() - started
+    finally:
+        logging.disable(previous_disable)
+
+    return {
+        "iterations": iterations,
+        "records_per_page": records,
+        "seconds_per_page": elapsed / iterations,
+        "pages_per_sec": iterations / elapsed,
+        "records_per_sec": records * iterations / elapsed,
+        "peak_traced_kb": peak_traced / 1024,
+        "retained_blocks": retained_blocks,
+        "peak_rss_kb": peak_rss_kb(),
+        "page_kb": len(page_content.encode('utf-8')) / 1024
+    }
+
+
+def run_benchmarks(cases, iterations, backend):
+    ctx = multiprocessing.get_context('spawn')
+    results = {}
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for name in cases:
+            results[name] = pool.apply(run_case, (name, iterations, backend))
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "backend": backend,
+        "cases": results
+    }
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for name, current in report["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if not previous:
+            continue
+        if current["pages_per_sec"] < previous["pages_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: pages/sec {previous['pages_per_sec']:.1f} -> {current['pages_per_sec']:.1f}")
+        if current["records_per_page"] != previous["records_per_page"]:
+            regressions.append(f"{name}: records/page {previous['records_per_page']} -> {current['records_per_page']}")
+        if current["peak_traced_kb"] > previous["peak_traced_kb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak traced {previous['peak_traced_kb']:.0f}KB -> "
+                               f"{current['peak_traced_kb']:.0f}KB")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'case':<12}{'pages/s':>10}{'records/s':>12}{'ms/page':>10}{'peak KB':>10}{'retained':>10}{'RSS KB':>10}")
+    for name, case in report["cases"].items():
+        print(f"{name:<12}{case['pages_per_sec']:>10.1f}{case['records_per_sec']:>12.1f}"
+              f"{case['seconds_per_page'] * 1000:>10.2f}{case['peak_traced_kb']:>10.0f}"
+              f"{case['retained_blocks']:>10}{case['peak_rss_kb']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NL/ES profile and listing parsers on recorded pages.")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--backend", choices=["lxml", "html.parser"], default=None,
+                        help="parser backend (defaults to the configured one)")
+    parser.add_argument("--output", type=Path, default=None, help="where to write the JSON report")
+    parser.add_argument("--baseline", type=Path, default=None, help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.cases, args.iterations, args.backend)
+    print_report(report)
+
+    output = args.output or REPORT_DIR / f"parsers-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Report written to {output}")
+
+    if args.baseline:
+        regressions = compare_reports(report, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
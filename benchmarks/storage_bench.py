@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import importlib
+import io
+import json
+import logging
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from src.utils.storage import storage_hundler
+from src.utils.storage.sinks import OUTPUT_SINKS
+from src.utils.storage.testing import InMemoryS3
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = ROOT / 'tests' / 'fixtures'
+REPORT_DIR = ROOT / 'benchmarks' / 'reports'
+BUCKET = "yellow-pages-bench"
+
+# name -> (processor module, class, save method, recorded record)
+CASES = {
+    "save_stream": (None, None, None, "nl_profile.expected.json"),
+    "nl_save_to_s3": ("src.spiders.profiler_spider", "MainProfileProcessor", "_save_to_s3", "nl_profile.expected.json"),
+    "es_save_to_s3": ("src.spiders.es.es_profiles", "EsMainProfileProcessor", "es_save_to_s3",
+                      "es_profile.expected.json"),
+}
+
+# Throughput may drop, and loop blocking grow, by this fraction before a case counts as a regression
+DEFAULT_TOLERANCE = 0.2
+# Blocking differences below this many milliseconds are timer noise
+BLOCKING_FLOOR_MS = 5.0
+
+
+class LoopMonitor:
+    # A timer that should fire every `interval` seconds; however late it fires is time the
+    # event loop spent blocked. Lateness above `threshold` is summed into `blocked`.
+    def __init__(self, interval=0.005, threshold=0.001):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples = 0
+        self.max_lag = 0.0
+        self.blocked = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.samples += 1
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.blocked += lag
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+def load_record(fixture):
+    return json.loads((CORPUS_DIR / fixture).read_text(encoding='utf-8'))
+
+
+async def save_streams(record, records):
+    # One object per record, the way profiles were stored before the batching sinks
+    payload = json.dumps(record).encode('utf-8')
+    await asyncio.gather(*(
+        storage_hundler.save_stream_to_s3(io.BytesIO(payload), f"bench/record-{i:06d}.json",
+                                          content_type='application/json')
+        for i in range(records)
+    ))
+
+
+async def save_through_processor(name, record, records, output_sink):
+    module_name, class_name, method_name, _ = CASES[name]
+    processor_cls = getattr(importlib.import_module(module_name), class_name)
+    processor = processor_cls(save_to_s3=True, save_to_local=False, output_sink=output_sink)
+    save = getattr(processor, method_name)
+    for i in range(records):
+        await save("bench", dict(record, uuid=f"uuid-{i}"))
+    await processor.close_sinks()
+
+
+async def measure(name, records, output_sink):
+    record = load_record(CASES[name][3])
+    monitor = LoopMonitor().start()
+    started = time.perf_counter()
+    if name == "save_stream":
+        await save_streams(record, records)
+    else:
+        await save_through_processor(name, record, records, output_sink)
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    uploader = storage_hundler.get_uploader()
+    objects, uploaded_bytes = uploader.uploaded, uploader.uploaded_bytes
+    await storage_hundler.close_uploader()
+    return {
+        "records": records,
+        "objects": objects,
+        "bytes": uploaded_bytes,
+        "seconds": elapsed,
+        "records_per_sec": records / elapsed,
+        "objects_per_sec": objects / elapsed,
+        "bytes_per_sec": uploaded_bytes / elapsed,
+        "loop_max_lag_ms": monitor.max_lag * 1000,
+        "loop_blocked_ms": monitor.blocked * 1000,
+        "loop_blocked_pct": 100 * monitor.blocked / elapsed
+    }
+
+
+def run_case(name, records, output_sink="csv", latency=0.02, bandwidth=50 * 1024 * 1024, endpoint=None):
+    # Against the in-process stand-in unless an S3-compatible endpoint (MinIO, moto server) is given
+    client = None if endpoint else InMemoryS3(latency=latency, bandwidth=bandwidth)
+    previous = (storage_hundler.AWS_BUCKET_NAME, storage_hundler.AWS_ENDPOINT_URL)
+    storage_hundler.AWS_BUCKET_NAME = BUCKET
+    storage_hundler.AWS_ENDPOINT_URL = endpoint or storage_hundler.AWS_ENDPOINT_URL
+    storage_hundler.set_s3_client(client)
+
+    # Every save logs a line; keep that out of the measurement
+    previous_disable = logging.root.manager.disable
+    logging.disable(logging.CRITICAL)
+    try:
+        return asyncio.run(measure(name, records, output_sink))
+    finally:
+        logging.disable(previous_disable)
+        storage_hundler.set_s3_client(None)
+        storage_hundler.AWS_BUCKET_NAME, storage_hundler.AWS_ENDPOINT_URL = previous
+
+
+def run_benchmarks(cases, records, output_sink="csv", latency=0.02, bandwidth=50 * 1024 * 1024, endpoint=None):
+    results = {name: run_case(name, records, output_sink, latency, bandwidth, endpoint) for name in cases}
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "output_sink": output_sink,
+        "s3": endpoint or f"in-memory (latency {latency}s, {bandwidth / 1024 / 1024:.0f}MB/s)",
+        "cases": results
+    }
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    regressions = []
+    for name, current in report["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if not previous:
+            continue
+        for metric in ("records_per_sec", "bytes_per_sec"):
+            if current[metric] < previous[metric] * (1 - tolerance):
+                regressions.append(f"{name}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f}")
+        blocked, was_blocked = current["loop_blocked_ms"], previous["loop_blocked_ms"]
+        if blocked > was_blocked * (1 + tolerance) and blocked - was_blocked > BLOCKING_FLOOR_MS:
+            regressions.append(f"{name}: loop blocked {was_blocked:.1f}ms -> {blocked:.1f}ms")
+    return regressions
+
+
+def print_report(report):
+    print(f"{'case':<15}{'records/s':>11}{'objects/s':>11}{'KB/s':>11}{'objects':>9}{'max lag ms':>12}"
+          f"{'blocked ms':>12}")
+    for name, case in report["cases"].items():
+        print(f"{name:<15}{case['records_per_sec']:>11.1f}{case['objects_per_sec']:>11.1f}"
+              f"{case['bytes_per_sec'] / 1024:>11.1f}{case['objects']:>9}{case['loop_max_lag_ms']:>12.2f}"
+              f"{case['loop_blocked_ms']:>12.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the S3 storage paths against an S3 stand-in.")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--records", type=int, default=2000)
+    parser.add_argument("--output-sink", choices=[sink for sink in OUTPUT_SINKS if sink != "sqlite"], default="csv")
+    parser.add_argument("--latency", type=float, default=0.02, help="stand-in seconds per upload")
+    parser.add_argument("--bandwidth-mb", type=float, default=50, help="stand-in MB/s per upload")
+    parser.add_argument("--endpoint", default=None, help="S3-compatible endpoint to use instead of the stand-in")
+    parser.add_argument("--output", type=Path, default=None, help="where to write the JSON report")
+    parser.add_argument("--baseline", type=Path, default=None, help="report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.cases, args.records, args.output_sink, args.latency,
+                            args.bandwidth_mb * 1024 * 1024, args.endpoint)
+    print_report(report)
+
+    output = args.output or REPORT_DIR / f"storage-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"Report written to {output}")
+
+    if args.baseline:
+        regressions = compare_reports(report, json.loads(args.baseline.read_text(encoding='utf-8')), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
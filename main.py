@@ -9,6 +9,10 @@ from src.spiders.es.es_urls_spider import es_collect_profile_endpoints
 from src.spiders.es.es_profiles import EsMainProfileProcessor
 from src.spiders.profiler_spider import MainProfileProcessor
 from src.utils.logger.logger import custom_logger
+from src.utils.resource_policy import get_resource_policy
+from src.utils.browser_session import BrowserSession
+from src.utils.task_utils.rate_controller import rate_control_summary
+from src.utils.storage.storage_hundler import close_uploader
 
 configs = load_configs()
 
@@ -21,12 +25,23 @@ if not configs:
 run_pipeline = configs["run_pipeline"]
 country = configs["country"]
 max_depth = configs["depth"]
+fetch_mode = configs["fetch_mode"]
+shards = configs["shards"]
+parse_workers = configs["parse_workers"]
+output_sink = configs["output_sink"]
+listing_concurrency = configs["listing_concurrency"]
 
 
 async def main():
+    session = None
     try:
+        if run_pipeline and country in ("nl", "es"):
+            # One browser for every pipeline stage, torn down once at the end
+            session = await BrowserSession().start()
+
         if country == "nl":
-            processor = MainProfileProcessor()
+            processor = MainProfileProcessor(fetch_mode=fetch_mode, parse_workers=parse_workers,
+                                             output_sink=output_sink)
             try:
                 if run_pipeline:
                     custom_logger(
@@ -34,23 +49,24 @@ async def main():
                                 run_pipeline} \n> Country: ({country})",
                         "info",
                     )
-                    paging_ready = await collect_regional_search_endpoints(enabled=True)
+                    paging_ready = await collect_regional_search_endpoints(enabled=True, session=session)
                     if paging_ready:
                         urls_available = await collect_profile_endpoints(
-                            enabled=True, depth=max_depth
+                            enabled=True, depth=max_depth, concurrency=listing_concurrency, session=session
                         )
                         if urls_available:
                             await processor.run_nl_worker(
-                                enabled=True, save_to_s3=True, save_to_local=False
+                                enabled=True, save_to_s3=True, save_to_local=False, shards=shards,
+                                session=session
                             )
                 else:
                     custom_logger(
                         f"> Detached mode enabled: \n> Country: ({country})", "warn"
                     )
                     await collect_regional_search_endpoints(enabled=False)
-                    await collect_profile_endpoints(enabled=False, depth=max_depth)
+                    await collect_profile_endpoints(enabled=False, depth=max_depth, concurrency=listing_concurrency)
                     await processor.run_nl_worker(
-                        enabled=False, save_to_s3=False, save_to_local=True
+                        enabled=False, save_to_s3=False, save_to_local=True, shards=shards
                     )
             except Exception as e:
                 custom_logger(
@@ -60,9 +76,12 @@ async def main():
                 )
             finally:
                 emulator(is_in_progress=False)
+                custom_logger(get_resource_policy().summary(), "info")
+                custom_logger(rate_control_summary(), "info")
 
         elif country == "es":
-            processor = EsMainProfileProcessor()
+            processor = EsMainProfileProcessor(fetch_mode=fetch_mode, parse_workers=parse_workers,
+                                               output_sink=output_sink)
             try:
                 if run_pipeline:
                     custom_logger(
@@ -70,23 +89,24 @@ async def main():
                                   run_pipeline} \n> Country: ({country})",
                         "info",
                     )
-                    es_paging_ready = await e_search_endpoints(enabled=True)
+                    es_paging_ready = await e_search_endpoints(enabled=True, session=session)
                     if es_paging_ready:
                         es_endpoints_ready = await es_collect_profile_endpoints(
-                            enabled=True, depth=max_depth
+                            enabled=True, depth=max_depth, concurrency=listing_concurrency, session=session
                         )
                         if es_endpoints_ready:
                             await processor.es_start(
-                                enabled=True, save_to_s3=True, save_to_local=False
+                                enabled=True, save_to_s3=True, save_to_local=False, shards=shards,
+                                session=session
                             )
                 else:
                     custom_logger(
                         f"> Detached mode enabled: \n> Country: ({country})", "warn"
                     )
                     await e_search_endpoints(enabled=False)
-                    await es_collect_profile_endpoints(enabled=False, depth=max_depth)
+                    await es_collect_profile_endpoints(enabled=False, depth=max_depth, concurrency=listing_concurrency)
                     await processor.es_start(
-                        enabled=False, save_to_s3=False, save_to_local=False
+                        enabled=False, save_to_s3=False, save_to_local=False, shards=shards
                     )
 
             except Exception as e:
@@ -97,6 +117,8 @@ async def main():
                 )
             finally:
                 emulator(is_in_progress=False)
+                custom_logger(get_resource_policy().summary(), "info")
+                custom_logger(rate_control_summary(), "info")
         else:
             custom_logger("Country not supported - opts: (nl|es)", log_type="warn")
             sys.exit(1)
@@ -107,6 +129,10 @@ async def main():
             log_type="error",
         )
         sys.exit(1)
+    finally:
+        await close_uploader()
+        if session:
+            await session.close()
 
 
 if __name__ == "__main__":
@@ -1,9 +1,13 @@
+import functools
 from src.utils.logger.logger import initialize_logging, custom_logger
 
 initialize_logging()
 
 
 def handle_exceptions(func):
+    # functools.wraps keeps the wrapped name so decorated module-level functions still pickle
+    # by reference (parse functions are shipped to worker processes)
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
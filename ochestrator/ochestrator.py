@@ -66,6 +66,53 @@ def load_configs():
             msg = "> Error: true\n> Source: Configuration\n> Message: 'depth' must be an integer or null"
             raise Exception(msg)
 
+        fetch_mode = configs.get('fetch_mode') or 'browser'
+        if fetch_mode not in ('browser', 'http'):
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'fetch_mode' must be 'browser' or 'http'"
+            raise Exception(msg)
+
+        shards = configs.get('shards', 1)
+        if isinstance(shards, str):
+            shards = int(shards) if shards.isdigit() else 1
+        if not isinstance(shards, int) or shards < 1:
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'shards' must be a positive integer"
+            raise Exception(msg)
+
+        listing_concurrency = configs.get('listing_concurrency', 4)
+        if not isinstance(listing_concurrency, int) or listing_concurrency < 1:
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'listing_concurrency' must be a positive integer"
+            raise Exception(msg)
+
+        parser_backend = configs.get('parser_backend') or 'html.parser'
+        if parser_backend not in ('lxml', 'html.parser'):
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'parser_backend' must be 'lxml' or 'html.parser'"
+            raise Exception(msg)
+
+        parse_workers = configs.get('parse_workers')
+        if parse_workers is not None and (not isinstance(parse_workers, int) or parse_workers < 0):
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'parse_workers' must be null or a non-negative integer"
+            raise Exception(msg)
+
+        listing_extraction = configs.get('listing_extraction') or 'browser'
+        if listing_extraction not in ('browser', 'html'):
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'listing_extraction' must be 'browser' or 'html'"
+            raise Exception(msg)
+
+        output_sink = configs.get('output_sink') or 'csv'
+        if output_sink not in ('csv', 'parquet', 'jsonl', 'sqlite'):
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'output_sink' must be 'csv', 'parquet', 'jsonl' or 'sqlite'"
+            raise Exception(msg)
+
+        # Sharded runs merge the per-shard CSV files; the other sinks have no merge step
+        if shards > 1 and output_sink != 'csv':
+            msg = "> Error: true\n> Source: Configuration\n> Message: 'shards' above 1 requires the 'csv' output_sink"
+            raise Exception(msg)
+
+        # Pipeline runs store profiles in S3; the SQLite database is a local file only
+        if run_pipeline and output_sink == 'sqlite':
+            msg = "> Error: true\n> Source: Configuration\n> Message: the 'sqlite' output_sink cannot be used with 'run_pipeline'"
+            raise Exception(msg)
+
         configs['depth'] = depth
         configs['run_pipeline'] = run_pipeline
 
@@ -74,7 +121,23 @@ def load_configs():
             'key_word_default': configs['key_word_default'],
             'run_pipeline': configs['run_pipeline'],
             'country': configs['country'],
-            'depth': configs['depth']
+            'depth': configs['depth'],
+            'fetch_mode': fetch_mode,
+            'resource_policy': configs.get('resource_policy') or {},
+            'shards': shards,
+            'listing_concurrency': listing_concurrency,
+            'rate_control': configs.get('rate_control') or {},
+            'navigation': configs.get('navigation') or {},
+            'parser_backend': parser_backend,
+            'parse_workers': parse_workers,
+            'listing_extraction': listing_extraction,
+            's3_sink': configs.get('s3_sink') or {},
+            'output_sink': output_sink,
+            'parquet_sink': configs.get('parquet_sink') or {},
+            'csv_sink': configs.get('csv_sink') or {},
+            'jsonl_sink': configs.get('jsonl_sink') or {},
+            'sqlite_sink': configs.get('sqlite_sink') or {},
+            'html_archive': configs.get('html_archive') or {}
         }
 
     except Exception as e:
@@ -9,9 +9,10 @@ from src.utils.task_utils.loader import emulator
 from ochestrator.ochestrator import load_configs
 from middlewares.errors.error_handler import handle_exceptions
 from src.utils.task_utils.handle_cookies import handle_cookies
-from playwright.async_api import async_playwright, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
 from src.utils.logger.logger import custom_logger, initialize_logging
-from src.utils.browser_launcher import browser_args, viewport
+from src.utils.navigation import BLOCKED, TIMEOUT, navigate
+from src.utils.browser_session import browser_context
 
 initialize_logging()
 
@@ -35,7 +36,7 @@ def clean_total_count(count_str):
 
 
 @handle_exceptions
-async def collect_regional_search_endpoints(enabled=False):
+async def collect_regional_search_endpoints(enabled=False, session=None):
     if not enabled:
         custom_logger("Base-url collection disabled!", log_type="info")
         return False
@@ -57,34 +58,24 @@ async def collect_regional_search_endpoints(enabled=False):
 
     while retries > 0:
         try:
-            async with async_playwright() as p:
-                # Launch browser with additional arguments
-                arguments = await browser_args()
-                view_port = await viewport()
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=arguments
-                )
-
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
-                               "Chrome/91.0.4472.124 Safari/537.36",
-                    viewport=view_port
-                )
-
+            # Extra headers go on the context so a shared session's page keeps the pinned user agent
+            project_headers_obj = Headers()
+            async with browser_context(
+                session,
+                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                           "Chrome/91.0.4472.124 Safari/537.36",
+                extra_http_headers=project_headers_obj.get_profile_headers()
+            ) as context:
                 page = await context.new_page()
                 # Enable stealth mode
                 await stealth_async(page)
 
-                # Set extra HTTP headers
-                project_headers_obj = Headers()
-                await page.set_extra_http_headers(project_headers_obj.get_profile_headers())
-
                 await handle_cookies(page)
 
                 custom_logger(f"Navigating to {base_url}", log_type="info")
-                await page.goto(base_url, timeout=60000)
-                await page.wait_for_selector('.result-info__count', state='visible', timeout=30000)
+                outcome = await navigate(page, base_url, "nl_search")
+                if outcome in (TIMEOUT, BLOCKED):
+                    raise PlaywrightError(f"Search page did not render ({outcome})")
 
                 content = await page.content()
                 soup = BeautifulSoup(content, 'html.parser')
@@ -140,7 +131,7 @@ async def collect_regional_search_endpoints(enabled=False):
             return False
         finally:
             try:
-                await browser.close()
+                await page.close()
             except Exception:
                 pass
             emulator(is_in_progress=False)
@@ -8,9 +8,10 @@ from playwright_stealth import stealth_async
 from src.utils.task_utils.loader import emulator
 from ochestrator.ochestrator import load_configs
 from middlewares.errors.error_handler import handle_exceptions
-from playwright.async_api import async_playwright, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
 from src.utils.logger.logger import custom_logger, initialize_logging
-from src.utils.browser_launcher import browser_args, viewport
+from src.utils.navigation import BLOCKED, TIMEOUT, navigate
+from src.utils.browser_session import browser_context
 
 initialize_logging()
 
@@ -35,7 +36,7 @@ def extract_total_count(count_str):
 
 
 @handle_exceptions
-async def e_search_endpoints(enabled=False):
+async def e_search_endpoints(enabled=False, session=None):
     if not enabled:
         custom_logger("endpoint collection mode: off.", log_type="info")
         return False
@@ -54,26 +55,16 @@ async def e_search_endpoints(enabled=False):
 
     while retries > 0:
         try:
-            async with async_playwright() as p:
-                # Launch browser with additional arguments
-                arguments = await browser_args()
-                view_port = await viewport()
-
-                browser = await p.chromium.launch(
-                    headless=True,
-                    args=arguments
-                )
-
-                context = await browser.new_context(viewport=view_port)
-
+            async with browser_context(session) as context:
                 page = await context.new_page()
                 await stealth_async(page)
                 es_url_headers_ = Headers()
                 await page.set_extra_http_headers(es_url_headers_.es_get_urls_headers())
 
                 custom_logger(f"Navigating to {base_url}", log_type="info")
-                await page.goto(base_url, timeout=60000)
-                await page.wait_for_selector('.first-content-listado', state='visible', timeout=30000)
+                outcome = await navigate(page, base_url, "es_search")
+                if outcome in (TIMEOUT, BLOCKED):
+                    raise PlaywrightError(f"Search page did not render ({outcome})")
 
                 content = await page.content()
                 soup = BeautifulSoup(content, 'html.parser')
@@ -131,7 +122,7 @@ async def e_search_endpoints(enabled=False):
             return False
         finally:
             try:
-                await browser.close()
+                await page.close()
             except Exception:
                 pass
             emulator(is_in_progress=False)
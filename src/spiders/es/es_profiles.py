@@ -1,36 +1,58 @@
 import asyncio
 import csv
+import functools
 import re
-import io
 from pathlib import Path
 import aiofiles
-from aiofiles import os as aiofiles_os
-from playwright_stealth import stealth_async
-from playwright.async_api import async_playwright, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
 from playwright._impl._errors import TargetClosedError
 from headers.headers import Headers
-from src.utils.storage.storage_hundler import save_stream_to_s3
+from src.utils.storage.sinks import CSV, create_profile_sink
+from src.utils.storage.records import ES_FIELDNAMES
 from middlewares.errors.error_handler import handle_exceptions
-from src.utils.task_utils.utilities import generate_uuid
 from src.utils.logger.logger import custom_logger, initialize_logging
+from src.utils.navigation import navigate
 from src.utils.parsers.es_parse_profile import es_extract_profile_data
 from src.utils.task_utils.loader import emulator
-from src.utils.browser_launcher import browser_args, viewport
+from src.utils.browser_session import browser_context
+from src.utils.page_pool import PagePool
+from src.utils.fetchers.fetchers import BrowserFetcher, HttpFetcher, fetch_and_parse
+from src.utils.task_utils.work_queue import run_worker_pool
+from src.utils.task_utils.sharding import run_sharded
+from src.utils.task_utils.checkpoint import ProgressJournal
+from src.utils.storage.html_archive import open_html_archive
+from src.utils.task_utils.dedupe import DedupeIndex, contact_key, sidecar_path
+from src.utils.parsers.parse_executor import ParseExecutor, default_parse_workers
 
 initialize_logging()
 
 DATA_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'data' / 'es_profile_data'
 if not DATA_DIR.exists():
     DATA_DIR.mkdir(parents=True)
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'data' / 'checkpoints'
 
 
 class EsMainProfileProcessor:
-    def __init__(self, save_to_s3=False, save_to_local=True):
+    def __init__(self, save_to_s3=False, save_to_local=True, fetch_mode="browser", parse_workers=None,
+                 output_sink=CSV):
         self.data_dir = DATA_DIR
         self.success_count = 0
         self.retries = []
         self.save_to_s3 = save_to_s3
         self.save_to_local = save_to_local
+        self.page_max_uses = 50
+        self.fetch_mode = fetch_mode
+        self.shard_suffix = ""
+        self.parse_workers = parse_workers
+        self.output_sink = output_sink
+        self.sinks = {}
+        self.dedupe_indexes = {}
+        self.journal = ProgressJournal(CHECKPOINT_DIR / "es_progress.jsonl")
+
+    def shard_init_kwargs(self, shards=1):
+        parse_workers = default_parse_workers(shards) if self.parse_workers is None else self.parse_workers
+        return {'save_to_s3': self.save_to_s3, 'save_to_local': self.save_to_local, 'fetch_mode': self.fetch_mode,
+                'parse_workers': parse_workers, 'output_sink': self.output_sink}
 
     @handle_exceptions
     async def es_load_profile_endpoints_csv_files(self, depth=None):
@@ -72,11 +94,7 @@ class EsMainProfileProcessor:
         try:
             emulator(message="Downloading page...", is_in_progress=True)
 
-            # Navigate to the URL with a random timeout
-            await page.goto(url, timeout=60000)
-
-            # Wait for the profile element to be available
-            await page.wait_for_selector('.data-contact', timeout=60000)
+            await navigate(page, url, "es_profile")
 
             # Extract profile data
             content = await page.content()
@@ -107,6 +125,8 @@ class EsMainProfileProcessor:
 
         if self.save_to_s3:
             await self.es_save_to_s3(filename, data)
+        elif self.save_to_local and self.output_sink != CSV:
+            await self.es_save_to_sink(filename, data, to_s3=False)
         elif self.save_to_local:
             await self.es_save_to_local(filename, data)
         else:
@@ -116,182 +136,213 @@ class EsMainProfileProcessor:
     @handle_exceptions
     async def initialize_profile_data_file(self, filename):
         filename = re.sub(r'(?<!^)es_', '', filename)
-        profile_data_file = self.data_dir / f"{filename}_profile_data.csv"
+        profile_data_file = self.data_dir / f"{filename}{self.shard_suffix}_profile_data.csv"
 
-        fieldnames = [
-            'uuid', 'business_id', 'profession', 'crawled_url', 'phone', 'address',
-            'business_url', 'email', 'description', 'business_images', 'miscellaneous_info',
-            'profile_title', 'latitude', 'longitude'
-        ]
+        # Keep rows saved by an interrupted run; the journal skips their endpoints on resume
+        if profile_data_file.exists() and profile_data_file.stat().st_size > 0:
+            return
 
-        # Rewrite the file with the headers
         async with aiofiles.open(profile_data_file, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=ES_FIELDNAMES)
             await writer.writeheader()
 
         custom_logger(f"Initialized profile data file for {filename}.", log_type="info")
 
     @handle_exceptions
-    async def es_save_to_local(self, filename, data):
+    async def es_save_to_local(self, filename, data, url=None):
+        source = filename
         filename = re.sub(r'(?<!^)es_', '', filename)
-        profile_data_file = self.data_dir / f"{filename}_profile_data.csv"
-
-        fieldnames = [
-            'uuid', 'business_id', 'profession', 'crawled_url', 'phone', 'address',
-            'business_url', 'email', 'description', 'business_images', 'miscellaneous_info',
-            'profile_title', 'latitude', 'longitude'
-        ]
-
-        # Dynamically update fieldnames with any new keys found in the data
-        for key in data.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
-
-        # Check if the file exists and if it is empty
-        file_exists = await aiofiles_os.path.exists(profile_data_file)
-        write_header = True
-        if file_exists:
-            async with aiofiles.open(profile_data_file, 'r', newline='', encoding='utf-8') as readfile:
-                existing_content = await readfile.read()
-                if existing_content:
-                    write_header = False
-
-        # Append new data to the CSV file
-        async with aiofiles.open(profile_data_file, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            # Write the header only if the file is new or empty
-            if write_header:
-                await writer.writeheader()
-
-            key = data.get('email') or data.get('phone') or data.get('business_name')
-
-            # Read existing data to check for duplicates
-            existing_data = {}
-            try:
-                async with aiofiles.open(profile_data_file, 'r', newline='', encoding='utf-8') as readfile:
-                    reader = csv.DictReader(await readfile.read())
-                    for row in reader:
-                        row_key = row.get('email') or row.get('phone') or row.get('business_name')
-                        if row_key:
-                            existing_data[row_key] = row
-            except FileNotFoundError:
-                custom_logger(f"File {profile_data_file} not found. It will be created.", log_type="info")
-
-            # Add new entry if it doesn't already exist
-            if key and key not in existing_data:
-                await writer.writerow(data)
-                self.success_count += 1
-                custom_logger(f"Appended profile data for {filename}. Count: {self.success_count}",
-                              log_type="info")
-            else:
-                custom_logger(f"Duplicate entry found for {filename}, not appending.", log_type="info")
+        profile_data_file = self.data_dir / f"{filename}{self.shard_suffix}_profile_data.csv"
+
+        # Duplicates are checked against an index of the keys already written, not by re-reading the file
+        index = self._dedupe_index(profile_data_file)
+        key = contact_key(data)
+        if not key or not index.reserve(key):
+            custom_logger(f"Duplicate entry found for {filename}, not appending.", log_type="info")
+            if url:
+                self.journal.mark_done(source, url)
+            return
+
+        sink = self.sinks.get(filename)
+        if sink is None:
+            # Rows are buffered and written in batches; keys and journal entries follow each batch
+            sink = self.sinks[filename] = create_profile_sink(
+                filename, "es", ES_FIELDNAMES, data_dir=self.data_dir, shard_suffix=self.shard_suffix,
+                on_written=functools.partial(self._mark_written_locally, index)
+            )
+        try:
+            await sink.write(data, key=(source, url, key))
+        except Exception:
+            index.release(key)
+            raise
+
+        self.success_count += 1
+        custom_logger(f"Appended profile data for {filename}. Count: {self.success_count}", log_type="info")
+
+    def _mark_written_locally(self, index, entries):
+        for source, url, key in entries:
+            index.add(key)
+            if url:
+                self.journal.mark_done(source, url)
+
+    def _dedupe_index(self, profile_data_file):
+        index = self.dedupe_indexes.get(profile_data_file)
+        if index is None:
+            index = self.dedupe_indexes[profile_data_file] = DedupeIndex(sidecar_path(profile_data_file),
+                                                                         source=profile_data_file)
+        return index
+
+    def close_dedupe_indexes(self):
+        for index in self.dedupe_indexes.values():
+            index.close()
+        self.dedupe_indexes.clear()
 
     @handle_exceptions
-    async def es_save_to_s3(self, filename, data):
+    async def es_save_to_sink(self, filename, data, url=None, to_s3=True):
+        # The journal keeps the endpoint's source name; only the output is named without it
+        key = (filename, url) if url else None
         filename = re.sub(r'(?<!^)es_', '', filename)
+        sink = self.sinks.get(filename)
+        if sink is None:
+            # Rows are buffered and stored as rolled part files rather than one object each
+            sink = self.sinks[filename] = create_profile_sink(
+                filename, "es", ES_FIELDNAMES, output_sink=self.output_sink, to_s3=to_s3, data_dir=self.data_dir,
+                shard_suffix=self.shard_suffix, on_written=self._mark_written
+            )
+        await sink.write(data, key=key)
 
-        uuid_str = generate_uuid()
-        fieldnames = [
-            'uuid', 'business_id', 'profession', 'crawled_url', 'phone', 'address',
-            'business_url', 'email', 'description', 'business_images', 'miscellaneous_info',
-            'profile_title', 'latitude', 'longitude'
-        ]
-
-        # Dynamically update fieldnames with any new keys found in the data
-        for key in data.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
+        self.success_count += 1
+        custom_logger(f"Saved profile data for {filename}. Total saved: {self.success_count}", log_type="info")
 
-        # Use StringIO to generate CSV content in memory
-        csv_content = io.StringIO()
-        writer = csv.DictWriter(csv_content, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerow(data)
+    async def es_save_to_s3(self, filename, data, url=None):
+        await self.es_save_to_sink(filename, data, url, to_s3=True)
 
-        # Convert CSV content to bytes and save to S3
-        data_stream = io.BytesIO(csv_content.getvalue().encode('utf-8'))
-        await save_stream_to_s3(data_stream, f"{filename}_{uuid_str}.csv", content_type='text/csv')
+    def _mark_written(self, keys):
+        for filename, url in keys:
+            self.journal.mark_done(filename, url)
 
-        self.success_count += 1
-        custom_logger(f"Saved profile data for {filename}. Total saved: {self.success_count}", log_type="info")
+    async def close_sinks(self):
+        for sink in self.sinks.values():
+            try:
+                await sink.close()
+            except Exception as e:
+                # Rows that could not be written stay pending in the journal and are fetched again
+                custom_logger(f"Could not close output sink: {e}", log_type="error")
+        self.sinks.clear()
 
     @handle_exceptions
-    async def es_process_product_endpoints(self, endpoints, save_to_s3=True, save_to_local=True, concurrency=3):
+    async def es_process_product_endpoints(self, endpoints, save_to_s3=True, save_to_local=True, concurrency=8,
+                                           task_timeout=120, session=None):
+        parse_executor = ParseExecutor(self.parse_workers).start()
+        # Fetched pages are kept for offline re-parsing when the archive stage is enabled
+        archive = open_html_archive("es")
         retries = 3
         while retries > 0:
             try:
-                async with async_playwright() as p:
-                    headers = Headers()
-                    extra_headers = headers.es_get_urls_headers()
-                    arguments = await browser_args()
-                    view_port = await viewport()
-
-                    browser = await p.chromium.launch(headless=True, args=arguments)
-                    context = await browser.new_context(extra_http_headers=extra_headers, viewport=view_port)
-
+                headers = Headers()
+                extra_headers = headers.es_get_urls_headers()
+                async with browser_context(session, extra_http_headers=extra_headers) as context:
                     # Initialize the profile data file
                     filename = endpoints[0][0] if endpoints else "default"
-                    await self.initialize_profile_data_file(filename)
-
-                    async def es_download_and_process_page(filename, url):
-                        try:
-                            page = await context.new_page()
-                            await stealth_async(page)
-                            await page.goto(url)
-                            page_content = await page.content()
-                            profile_data = es_extract_profile_data(page_content)
-                            emulator(message="Processing page...", is_in_progress=True)
-                            if "error" in profile_data:
+                    if self.output_sink == CSV:
+                        await self.initialize_profile_data_file(filename)
+
+                    pool = await PagePool(context, size=concurrency, max_uses=self.page_max_uses,
+                                          headers=extra_headers).start()
+                    browser_fetcher = BrowserFetcher(pool, page_type="es_profile")
+                    http_fetcher = None
+                    try:
+                        if self.fetch_mode == "http":
+                            http_fetcher = await HttpFetcher(headers=extra_headers, concurrency=concurrency).start()
+
+                        async def es_download_and_process_page(filename, url):
+                            try:
+                                profile_data = await fetch_and_parse(url, es_extract_profile_data, browser_fetcher,
+                                                                     http_fetcher, parse_executor, archive, filename)
+                                emulator(message="Processing page...", is_in_progress=True)
+                                if "error" in profile_data:
+                                    self.journal.mark_failed(filename, url)
+                                    emulator(is_in_progress=False)
+                                    return {"url": url, "error": profile_data["error"],
+                                            "message": profile_data["message"]}
+                                if profile_data:
+                                    if save_to_s3 or (save_to_local and self.output_sink != CSV):
+                                        # Journaled as done once the part file holding it is stored
+                                        await self.es_save_to_sink(filename, profile_data, url, to_s3=save_to_s3)
+                                    elif save_to_local:
+                                        await self.es_save_to_local(filename, profile_data, url)
                                 emulator(is_in_progress=False)
-                                return {"url": url, "error": profile_data["error"], "message": profile_data["message"]}
-                            if profile_data:
-                                if save_to_s3:
-                                    await self.es_save_to_s3(filename, profile_data)
-                                elif save_to_local:
-                                    await self.es_save_to_local(filename, profile_data)
-                            emulator(is_in_progress=False)
-                            return profile_data
-                        except TargetClosedError as e:
-                            custom_logger(f"TargetClosedError processing page {url}: {e}", log_type="error")
-                            self.retries.append((filename, url))
-                            return None
-                        except Exception as e:
-                            custom_logger(f"Failed to process page {url}: {e}", log_type="error")
-                            return None
-
-                    async def es_process_batch(batch):
-                        tasks = [es_download_and_process_page(filename, url) for filename, url in batch]
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-                        return results
-
-                    batch_size = concurrency
-                    for i in range(0, len(endpoints), batch_size):
-                        current_batch = endpoints[i:i + batch_size]
-                        await es_process_batch(current_batch)
-
-                    if self.retries:
-                        custom_logger(f"Retrying {len(self.retries)} failed endpoints.", log_type="info")
-                        await es_process_batch(self.retries)
-                        self.retries.clear()
-
-                    await context.close()
-                    await browser.close()
-
+                                return profile_data
+                            except TargetClosedError as e:
+                                custom_logger(f"TargetClosedError processing page {url}: {e}", log_type="error")
+                                self.retries.append((filename, url))
+                                return None
+                            except Exception as e:
+                                custom_logger(f"Failed to process page {url}: {e}", log_type="error")
+                                self.journal.mark_failed(filename, url)
+                                return None
+
+                        async def es_process_endpoints(batch):
+                            results = await run_worker_pool(
+                                batch, lambda endpoint: es_download_and_process_page(*endpoint),
+                                concurrency=concurrency, task_timeout=task_timeout
+                            )
+                            # Timed-out profiles get one more pass, like closed targets do
+                            for endpoint, result in zip(batch, results):
+                                if isinstance(result, asyncio.TimeoutError):
+                                    self.retries.append(endpoint)
+                            return results
+
+                        # Completed profiles from earlier attempts or runs are not fetched again
+                        pending = self.journal.pending(endpoints)
+                        if len(pending) < len(endpoints):
+                            custom_logger(f"Skipping {len(endpoints) - len(pending)} endpoints already in the journal.",
+                                          log_type="info")
+                        await es_process_endpoints(pending)
+
+                        if self.retries:
+                            custom_logger(f"Retrying {len(self.retries)} failed endpoints.", log_type="info")
+                            retry_endpoints = list(self.retries)
+                            self.retries.clear()
+                            await es_process_endpoints(retry_endpoints)
+                            self.retries.clear()
+                    finally:
+                        # Closed on failures too: the browser context is shared and outlives this call,
+                        # and every outer retry would otherwise leak pooled tabs and an aiohttp session
+                        if http_fetcher:
+                            await http_fetcher.close()
+                        await pool.close()
+
+                await self.close_sinks()
+                parse_executor.close()
+                if archive:
+                    archive.close()
+                self.close_dedupe_indexes()
+                self.journal.close()
                 custom_logger(f"Successfully processed {self.success_count} endpoints.")
                 return self.success_count > 0
             except Exception as e:
                 custom_logger(f"An error occurred: {e}", log_type="error")
                 retries -= 1
+                # Buffered rows are written (or dropped) before another attempt; left in the sinks
+                # their endpoints, still pending in the journal, would be fetched and saved twice
+                await self.close_sinks()
+                # Indexes reload from their sidecars, so keys reserved for dropped rows are free again
+                self.close_dedupe_indexes()
                 if retries == 0:
                     custom_logger("Max retries reached. Exiting.", log_type="error")
+                    parse_executor.close()
+                    if archive:
+                        archive.close()
+                    self.journal.close()
                     return False
                 else:
                     custom_logger(f"Retrying... {retries} attempts left.", log_type="warn")
                     await asyncio.sleep(5)  # Wait before retrying
 
     @handle_exceptions
-    async def es_start(self, enabled=True, depth=None, save_to_s3=False, save_to_local=True):
+    async def es_start(self, enabled=True, depth=None, save_to_s3=False, save_to_local=True, shards=1,
+                       session=None):
         if not enabled:
             custom_logger("Product processing is disabled.", log_type="info")
             return False
@@ -303,9 +354,20 @@ class EsMainProfileProcessor:
             custom_logger("No product endpoints to process.", log_type="info")
             return False
 
+        if shards and shards > 1:
+            # Each shard runs in its own process with its own browser and output file
+            self.success_count = await run_sharded(
+                EsMainProfileProcessor, 'es_process_product_endpoints', endpoints, shards, self.data_dir,
+                init_kwargs=self.shard_init_kwargs(shards),
+                run_kwargs={'save_to_s3': save_to_s3, 'save_to_local': save_to_local}, dedupe_key=contact_key
+            )
+            custom_logger(f"Sharded run saved {self.success_count} profiles.", log_type="info")
+            return self.success_count > 0
+
         # Process endpoints and save data based on parameters
         try:
-            await self.es_process_product_endpoints(endpoints, save_to_s3=save_to_s3, save_to_local=save_to_local)
+            await self.es_process_product_endpoints(endpoints, save_to_s3=save_to_s3, save_to_local=save_to_local,
+                                                    session=session)
         except TargetClosedError as e:
             custom_logger(f"Error: Browser context or page was closed unexpectedly: {e}", log_type="error")
         except Exception as e:
@@ -3,13 +3,14 @@ from pathlib import Path
 import re, random, csv
 from urllib.parse import quote
 from src.utils.task_utils.loader import emulator
-from playwright_stealth import stealth_async
+from src.utils.task_utils.pagination import collect_listing_pages
 from headers.headers import Headers
-from playwright.async_api import async_playwright, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
 from middlewares.errors.error_handler import handle_exceptions
 from src.utils.logger.logger import custom_logger, initialize_logging
-from src.utils.browser_launcher import browser_args, viewport
-from bs4 import BeautifulSoup
+from src.utils.navigation import EMPTY, OK, navigate
+from src.utils.parsers.parse_listing import ES_LISTING, extract_listing_from_page
+from src.utils.browser_session import browser_context
 
 initialize_logging()
 
@@ -44,19 +45,12 @@ async def es_process_url(page, url, retries=3):
     attempt = 0
     while attempt < retries:
         try:
-            await page.goto(url, timeout=60000)
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            container = soup.select_one('div.bloque-central .central div[itemscope]')
-            endpoints = []
-
-            if container:
-                for item in container.find_all('a', {'data-omniclick': 'name'}):
-                    data_href = item.get('href')
-                    if data_href:
-                        endpoints.append(data_href)
-
-            return endpoints
+            outcome = await navigate(page, url, "es_listing")
+            if outcome == EMPTY:
+                return []
+            if outcome != OK:
+                raise PlaywrightError(f"Listing page did not render ({outcome})")
+            return await extract_listing_from_page(page, ES_LISTING)
         except PlaywrightError as e:
             attempt += 1
             custom_logger(f"Error processing URL {url} (attempt {attempt}): {str(e)}", log_type="error")
@@ -71,7 +65,7 @@ def randomize_wait_time(min_time, max_time):
 
 
 @handle_exceptions
-async def es_collect_profile_endpoints(enabled=False, depth=None) -> bool:
+async def es_collect_profile_endpoints(enabled=False, depth=None, concurrency=4, session=None) -> bool:
     try:
 
         if not enabled:
@@ -83,20 +77,11 @@ async def es_collect_profile_endpoints(enabled=False, depth=None) -> bool:
             custom_logger("No endpoints found", log_type="info")
             return False
 
-        async with async_playwright() as p:
-            emulator(message="scraping profile urls...", is_in_progress=True)
-            headers = Headers()
-
-            arguments = await browser_args()
-            view_port = await viewport()
+        headers = Headers()
+        list_headers = headers.es_profile_list()
 
-            browser = await p.chromium.launch(
-                headless=True,
-                args=arguments
-            )
-            context = await browser.new_context(extra_http_headers=headers.es_profile_list(),viewport=view_port)
-            page = await context.new_page()
-            await stealth_async(page)
+        async with browser_context(session, extra_http_headers=list_headers) as context:
+            emulator(message="scraping profile urls...", is_in_progress=True)
 
             data_dir = Path(__file__).resolve().parent.parent.parent.parent / 'data' / 'es_profile_urls'
             data_dir.mkdir(parents=True, exist_ok=True)
@@ -104,12 +89,8 @@ async def es_collect_profile_endpoints(enabled=False, depth=None) -> bool:
             for file_name, urls in endpoints:
                 csv_file_path = data_dir / f"es_{file_name}.csv"
 
-                all_endpoints = []
-                for url in urls:
-                    custom_logger(f"Processing url: {url}", log_type="info")
-                    extracted_endpoints = await es_process_url(page, url)
-                    all_endpoints.extend(extracted_endpoints)
-                    await asyncio.sleep(randomize_wait_time(0.5, 1.5))
+                all_endpoints = await collect_listing_pages(context, urls, es_process_url, concurrency=concurrency,
+                                                            headers=list_headers)
 
                 if all_endpoints:
                     with csv_file_path.open('w', newline='', encoding='utf-8') as csvfile:
@@ -120,7 +101,6 @@ async def es_collect_profile_endpoints(enabled=False, depth=None) -> bool:
                     custom_logger(f"Profile data saved to {csv_file_path}", log_type="info")
                     emulator(message="", is_in_progress=False)
 
-        await browser.close()
         custom_logger("Profile endpoint collection completed.", log_type="info")
         return True
     except Exception as e:
@@ -4,14 +4,15 @@ import random
 from pathlib import Path
 from urllib.parse import quote
 
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Error as PlaywrightError
-from playwright_stealth import stealth_async
+from playwright.async_api import Error as PlaywrightError
 
 from middlewares.errors.error_handler import handle_exceptions
-from src.utils.browser_launcher import browser_args, viewport
+from src.utils.browser_session import browser_context
 from src.utils.logger.logger import custom_logger, initialize_logging
+from src.utils.navigation import EMPTY, OK, navigate
+from src.utils.parsers.parse_listing import NL_LISTING, extract_listing_from_page
 from src.utils.task_utils.loader import emulator
+from src.utils.task_utils.pagination import collect_listing_pages
 
 initialize_logging()
 
@@ -45,19 +46,12 @@ async def process_url(page, url, retries=3):
     attempt = 0
     while attempt < retries:
         try:
-            await page.goto(url, timeout=60000)
-            content = await page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            container = soup.select_one('div#results-box div.relative ol.result-items')
-            endpoints = []
-
-            if container:
-                for item in container.find_all('li', class_='result-item'):
-                    data_href = item.get('data-href')
-                    if data_href:
-                        endpoints.append(data_href)
-
-            return endpoints
+            outcome = await navigate(page, url, "nl_listing")
+            if outcome == EMPTY:
+                return []
+            if outcome != OK:
+                raise PlaywrightError(f"Listing page did not render ({outcome})")
+            return await extract_listing_from_page(page, NL_LISTING)
         except PlaywrightError as e:
             attempt += 1
             custom_logger(f"Error processing URL {url} (attempt {attempt}): {str(e)}", log_type="error")
@@ -72,7 +66,7 @@ def randomize_wait_time(min_time, max_time):
 
 
 @handle_exceptions
-async def collect_profile_endpoints(enabled=False, depth=None) -> bool:
+async def collect_profile_endpoints(enabled=False, depth=None, concurrency=4, session=None) -> bool:
     if not enabled:
         custom_logger("Profile endpoint collection disabled!.", log_type="info")
         return False
@@ -86,34 +80,20 @@ async def collect_profile_endpoints(enabled=False, depth=None) -> bool:
     if depth is not None and depth > 0:
         endpoints = [(name, urls[:depth]) for name, urls in endpoints]
 
-    async with async_playwright() as p:
+    async with browser_context(
+        session,
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                   "Chrome/91.0.4472.124 Safari/537.36"
+    ) as context:
         emulator(message="scraping profile urls...", is_in_progress=True)
 
-        arguments = await browser_args()
-        view_port = await viewport()
-
-        browser = await p.chromium.launch(headless=True,args=arguments)
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
-                       "Chrome/91.0.4472.124 Safari/537.36",
-            viewport=view_port
-        )
-
-        page = await context.new_page()
-        await stealth_async(page)
-
         data_dir = Path(__file__).resolve().parent.parent.parent / 'data/profile_endpoints'
         data_dir.mkdir(parents=True, exist_ok=True)
 
         for file_name, urls in endpoints:
             csv_file_path = data_dir / f"{file_name}.csv"
 
-            all_endpoints = []
-            for url in urls:
-                custom_logger(f"Processing URL: {url}", log_type="info")
-                extracted_endpoints = await process_url(page, url)
-                all_endpoints.extend(extracted_endpoints)
-                await asyncio.sleep(randomize_wait_time(0.5, 1.5))
+            all_endpoints = await collect_listing_pages(context, urls, process_url, concurrency=concurrency)
 
             if all_endpoints:
                 with csv_file_path.open('w', newline='', encoding='utf-8') as csvfile:
@@ -125,6 +105,5 @@ async def collect_profile_endpoints(enabled=False, depth=None) -> bool:
                 custom_logger(f"Profile data saved to {csv_file_path}", log_type="info")
                 emulator(message="", is_in_progress=False)
 
-    await browser.close()
     custom_logger("Profile endpoint collection completed.", log_type="info")
     return True
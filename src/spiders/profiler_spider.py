@@ -1,36 +1,55 @@
 import asyncio
 import csv
-import io
 from pathlib import Path
-import aiofiles
-from playwright.async_api import async_playwright, Error as PlaywrightError
+from playwright.async_api import Error as PlaywrightError
 from playwright._impl._errors import TargetClosedError
 from headers.headers import Headers
-from playwright_stealth import stealth_async
-from src.utils.storage.storage_hundler import save_stream_to_s3
+from src.utils.storage.sinks import CSV, create_profile_sink
+from src.utils.storage.records import NL_FIELDNAMES
 from middlewares.errors.error_handler import handle_exceptions
-from src.utils.task_utils.utilities import generate_uuid
 from src.utils.logger.logger import custom_logger, initialize_logging
+from src.utils.navigation import navigate
 from src.utils.parsers.parse_profile import extract_profile_data
 from src.utils.task_utils.handle_cookies import handle_cookies
 from src.utils.task_utils.loader import emulator
-from src.utils.browser_launcher import browser_args, viewport
+from src.utils.browser_session import browser_context
+from src.utils.page_pool import PagePool
+from src.utils.fetchers.fetchers import BrowserFetcher, HttpFetcher, fetch_and_parse
+from src.utils.task_utils.work_queue import run_worker_pool
+from src.utils.task_utils.sharding import run_sharded
+from src.utils.task_utils.checkpoint import ProgressJournal
+from src.utils.storage.html_archive import open_html_archive
+from src.utils.parsers.parse_executor import ParseExecutor, default_parse_workers
 
 
 initialize_logging()
 
 DATA_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'profile_data'
 if not DATA_DIR.exists():
-    DATA_DIR.mkdir()
+    DATA_DIR.mkdir(parents=True)
+CHECKPOINT_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'checkpoints'
 
 
 class MainProfileProcessor:
-    def __init__(self, save_to_s3=False, save_to_local=True):
+    def __init__(self, save_to_s3=False, save_to_local=True, fetch_mode="browser", parse_workers=None,
+                 output_sink=CSV):
         self.data_dir = DATA_DIR
         self.success_count = 0
         self.retries = []
         self.save_to_s3 = save_to_s3
         self.save_to_local = save_to_local
+        self.page_max_uses = 50
+        self.fetch_mode = fetch_mode
+        self.shard_suffix = ""
+        self.parse_workers = parse_workers
+        self.output_sink = output_sink
+        self.sinks = {}
+        self.journal = ProgressJournal(CHECKPOINT_DIR / "nl_progress.jsonl")
+
+    def shard_init_kwargs(self, shards=1):
+        parse_workers = default_parse_workers(shards) if self.parse_workers is None else self.parse_workers
+        return {'save_to_s3': self.save_to_s3, 'save_to_local': self.save_to_local, 'fetch_mode': self.fetch_mode,
+                'parse_workers': parse_workers, 'output_sink': self.output_sink}
 
     @handle_exceptions
     async def load_profile_endpoints_csv_files(self):
@@ -65,17 +84,13 @@ class MainProfileProcessor:
     async def download_and_process_page(self, page, url):
         try:
             emulator(message="Downloading page...", is_in_progress=True)
-            # Navigate to the URL with a random timeout
-            await page.goto(url, timeout=60000)
+            await navigate(page, url, "nl_profile")
             cookie_handled = await handle_cookies(page)
             if cookie_handled:
                 custom_logger("Cookie consent handled successfully.", log_type="info")
             else:
                 custom_logger("consent handled.", log_type="info")
 
-            # Wait for the profile element to be available
-            await page.wait_for_selector('#profile', timeout=60000)
-
             # Extract profile data
             content = await page.content()
             profile_data = extract_profile_data(content)
@@ -110,126 +125,142 @@ class MainProfileProcessor:
             custom_logger("Both save_to_s3 and save_to_local are False. No action taken.", log_type="warn")
             return
 
-    @handle_exceptions
-    async def _save_to_local(self, filename, data):
-        profile_data_file = self.data_dir / f"{filename}_profile_data.csv"
-
-        fieldnames = ['uuid', 'business_id', 'business_name', 'crawled_url', 'phone', 'address',
-                      'business_url', 'email', 'description', 'business_images', 'miscellaneous_info',
-                      'competitors']
-
-        # Dynamically update fieldnames with any new keys found in the data
-        for key in data.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
+    async def _save_to_local(self, filename, data, url=None):
+        await self._save_to_sink(filename, data, url, to_s3=False)
 
-        # Save data to local CSV file
-        async with aiofiles.open(profile_data_file, 'a', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            if profile_data_file.stat().st_size == 0:  # Write header if file is empty
-                await writer.writeheader()
-            await writer.writerow(data)
+    @handle_exceptions
+    async def _save_to_sink(self, filename, data, url=None, to_s3=True):
+        sink = self.sinks.get(filename)
+        if sink is None:
+            # Rows are buffered and written in batches rather than one file operation each
+            sink = self.sinks[filename] = create_profile_sink(
+                filename, "nl", NL_FIELDNAMES, output_sink=self.output_sink, to_s3=to_s3, data_dir=self.data_dir,
+                shard_suffix=self.shard_suffix, on_written=self._mark_written
+            )
+        await sink.write(data, key=(filename, url) if url else None)
 
         self.success_count += 1
         custom_logger(f"Saved profile data for {filename}. Total saved: {self.success_count}", log_type="info")
 
-    @handle_exceptions
-    async def _save_to_s3(self, filename, data):
-        uuid_str = generate_uuid()
-        fieldnames = ['uuid', 'business_id', 'business_name', 'crawled_url', 'phone', 'address',
-                      'business_url', 'email', 'description', 'business_images', 'miscellaneous_info',
-                      'competitors']
-
-        # Dynamically update fieldnames with any new keys found in the data
-        for key in data.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
-
-        # Use StringIO to generate CSV content in memory
-        csv_content = io.StringIO()
-        writer = csv.DictWriter(csv_content, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerow(data)
-
-        # Convert CSV content to bytes and save to S3
-        data_stream = io.BytesIO(csv_content.getvalue().encode('utf-8'))
-        await save_stream_to_s3(data_stream, f"{filename}_{uuid_str}.csv", content_type='text/csv')
+    async def _save_to_s3(self, filename, data, url=None):
+        await self._save_to_sink(filename, data, url, to_s3=True)
 
-        self.success_count += 1
-        custom_logger(f"Saved profile data for {filename}. Total saved: {self.success_count}", log_type="info")
+    def _mark_written(self, keys):
+        for filename, url in keys:
+            self.journal.mark_done(filename, url)
+
+    async def close_sinks(self):
+        for sink in self.sinks.values():
+            try:
+                await sink.close()
+            except Exception as e:
+                # Rows that could not be written stay pending in the journal and are fetched again
+                custom_logger(f"Could not close output sink: {e}", log_type="error")
+        self.sinks.clear()
 
     @handle_exceptions
-    async def process_product_endpoints(self, endpoints, save_to_s3=True, save_to_local=True, concurrency=4):
+    async def process_product_endpoints(self, endpoints, save_to_s3=True, save_to_local=True, concurrency=8,
+                                        task_timeout=120, session=None):
+        parse_executor = ParseExecutor(self.parse_workers).start()
+        # Fetched pages are kept for offline re-parsing when the archive stage is enabled
+        archive = open_html_archive("nl")
         retries = 3
         while retries > 0:
             try:
-                async with async_playwright() as p:
-                    headers = Headers()
-                    arguments = await browser_args()
-                    view_port = await viewport()
-
-                    browser = await p.chromium.launch(headless=True, args=arguments)
-                    context = await browser.new_context(extra_http_headers=headers.get_profile_headers(), viewport=view_port)
-
-                    async def download_and_process_page(filename, url):
-                        try:
-                            page = await context.new_page()
-                            custom_logger(f"Downloading in progress...", log_type="info")
-                            await stealth_async(page)
-                            await page.goto(url)
-                            page_content = await page.content()
-                            profile_data = extract_profile_data(page_content)
-                            emulator(message="Processing page...", is_in_progress=True)
-                            if "error" in profile_data:
+                headers = Headers()
+                extra_headers = headers.get_profile_headers()
+                async with browser_context(session, extra_http_headers=extra_headers) as context:
+                    pool = await PagePool(context, size=concurrency, max_uses=self.page_max_uses,
+                                          headers=extra_headers).start()
+                    browser_fetcher = BrowserFetcher(pool, page_type="nl_profile")
+                    http_fetcher = None
+                    try:
+                        if self.fetch_mode == "http":
+                            http_fetcher = await HttpFetcher(headers=extra_headers, concurrency=concurrency).start()
+
+                        async def download_and_process_page(filename, url):
+                            try:
+                                custom_logger(f"Downloading in progress...", log_type="info")
+                                profile_data = await fetch_and_parse(url, extract_profile_data, browser_fetcher,
+                                                                     http_fetcher, parse_executor, archive, filename)
+                                emulator(message="Processing page...", is_in_progress=True)
+                                if "error" in profile_data:
+                                    self.journal.mark_failed(filename, url)
+                                    emulator(is_in_progress=False)
+                                    return {"url": url, "error": profile_data["error"],
+                                            "message": profile_data["message"]}
+                                if profile_data:
+                                    if save_to_s3 or save_to_local:
+                                        # Journaled as done once the batch holding it is written
+                                        await self._save_to_sink(filename, profile_data, url, to_s3=save_to_s3)
                                 emulator(is_in_progress=False)
-                                return {"url": url, "error": profile_data["error"], "message": profile_data["message"]}
-                            if profile_data:
-                                if save_to_s3:
-                                    await self._save_to_s3(filename, profile_data)
-                                elif save_to_local:
-                                    await self._save_to_local(filename, profile_data)
-                            emulator(is_in_progress=False)
-                            return profile_data
-                        except TargetClosedError as e:
-                            custom_logger(f"TargetClosedError processing page {url}: {e}", log_type="error")
-                            self.retries.append((filename, url))
-                            return None
-                        except Exception as e:
-                            custom_logger(f"Failed to process page {url}: {e}", log_type="error")
-                            return None
-
-                    async def process_batch(batch):
-                        tasks = [download_and_process_page(filename, url) for filename, url in batch]
-                        results = await asyncio.gather(*tasks, return_exceptions=True)
-                        return results
-
-                    batch_size = concurrency
-                    for i in range(0, len(endpoints), batch_size):
-                        current_batch = endpoints[i:i + batch_size]
-                        await process_batch(current_batch)
-
-                    if self.retries:
-                        custom_logger(f"Retrying {len(self.retries)} failed endpoints.", log_type="info")
-                        await process_batch(self.retries)
-                        self.retries.clear()
-
-                    await context.close()
-                    await browser.close()
-
+                                return profile_data
+                            except TargetClosedError as e:
+                                custom_logger(f"TargetClosedError processing page {url}: {e}", log_type="error")
+                                self.retries.append((filename, url))
+                                return None
+                            except Exception as e:
+                                custom_logger(f"Failed to process page {url}: {e}", log_type="error")
+                                self.journal.mark_failed(filename, url)
+                                return None
+
+                        async def process_endpoints(batch):
+                            results = await run_worker_pool(
+                                batch, lambda endpoint: download_and_process_page(*endpoint),
+                                concurrency=concurrency, task_timeout=task_timeout
+                            )
+                            # Timed-out profiles get one more pass, like closed targets do
+                            for endpoint, result in zip(batch, results):
+                                if isinstance(result, asyncio.TimeoutError):
+                                    self.retries.append(endpoint)
+                            return results
+
+                        # Completed profiles from earlier attempts or runs are not fetched again
+                        pending = self.journal.pending(endpoints)
+                        if len(pending) < len(endpoints):
+                            custom_logger(f"Skipping {len(endpoints) - len(pending)} endpoints already in the journal.",
+                                          log_type="info")
+                        await process_endpoints(pending)
+
+                        if self.retries:
+                            custom_logger(f"Retrying {len(self.retries)} failed endpoints.", log_type="info")
+                            retry_endpoints = list(self.retries)
+                            self.retries.clear()
+                            await process_endpoints(retry_endpoints)
+                            self.retries.clear()
+                    finally:
+                        # Closed on failures too: the browser context is shared and outlives this call,
+                        # and every outer retry would otherwise leak pooled tabs and an aiohttp session
+                        if http_fetcher:
+                            await http_fetcher.close()
+                        await pool.close()
+
+                await self.close_sinks()
+                parse_executor.close()
+                if archive:
+                    archive.close()
+                self.journal.close()
                 custom_logger(f"Successfully processed {self.success_count} endpoints.")
                 return self.success_count > 0
             except Exception as e:
                 custom_logger(f"An error occurred: {e}", log_type="error")
                 retries -= 1
+                # Buffered rows are written (or dropped) before another attempt; left in the sinks
+                # their endpoints, still pending in the journal, would be fetched and saved twice
+                await self.close_sinks()
                 if retries == 0:
                     custom_logger("Max retries reached. Exiting.", log_type="error")
+                    parse_executor.close()
+                    if archive:
+                        archive.close()
+                    self.journal.close()
                     return False
                 else:
                     custom_logger(f"Retrying... {retries} attempts left.", log_type="warn")
                     await asyncio.sleep(5)  # Wait before retrying
 
     @handle_exceptions
-    async def run_nl_worker(self, enabled=True, save_to_s3=False, save_to_local=False):
+    async def run_nl_worker(self, enabled=True, save_to_s3=False, save_to_local=False, shards=1, session=None):
         if not enabled:
             custom_logger("Profile data collection disabled!", log_type="info")
             return False
@@ -238,5 +269,17 @@ class MainProfileProcessor:
         if not endpoints:
             custom_logger("No profile endpoints to process.", log_type="info")
             return False
+
+        if shards and shards > 1:
+            # Each shard runs in its own process with its own browser and output file
+            self.success_count = await run_sharded(
+                MainProfileProcessor, 'process_product_endpoints', endpoints, shards, self.data_dir,
+                init_kwargs=self.shard_init_kwargs(shards),
+                run_kwargs={'save_to_s3': save_to_s3, 'save_to_local': save_to_local}
+            )
+            custom_logger(f"Sharded run saved {self.success_count} profiles.", log_type="info")
+            return self.success_count > 0
+
         # Process endpoints and save data based on parameters
-        await self.process_product_endpoints(endpoints, save_to_s3=save_to_s3, save_to_local=save_to_local)
+        await self.process_product_endpoints(endpoints, save_to_s3=save_to_s3, save_to_local=save_to_local,
+                                             session=session)
@@ -0,0 +1,91 @@
+import random
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+from headers.headers import user_agents
+from src.utils.browser_launcher import browser_args, viewport
+from src.utils.resource_policy import get_resource_policy
+from src.utils.logger.logger import custom_logger
+
+
+class BrowserSession:
+    # One Chromium and one context for the whole pipeline, so the launch cost is paid once
+    # and cookies/cache warmed up by one stage carry over to the next.
+    def __init__(self, headless=True):
+        self.headless = headless
+        self.playwright = None
+        self.browser = None
+        self.context = None
+
+    async def start(self):
+        self.playwright = await async_playwright().start()
+        await self._launch()
+        return self
+
+    async def _launch(self):
+        self.browser = await self.playwright.chromium.launch(headless=self.headless, args=await browser_args())
+        self.context = await self.browser.new_context(
+            user_agent=random.choice(user_agents),
+            viewport=await viewport()
+        )
+        await get_resource_policy().apply(self.context)
+        custom_logger("Shared browser session started.", log_type="info")
+
+    async def ensure_started(self):
+        # Stages call this from their retry loops; only a dead browser is relaunched
+        if self.browser is None or not self.browser.is_connected():
+            custom_logger("Shared browser is gone, relaunching...", log_type="warn")
+            await self._launch()
+
+    async def close(self):
+        try:
+            if self.browser and self.browser.is_connected():
+                await self.browser.close()
+        finally:
+            if self.playwright:
+                await self.playwright.stop()
+            self.browser = self.context = self.playwright = None
+        custom_logger("Shared browser session closed.", log_type="info")
+
+
+class StageContext:
+    # A stage's view of the shared context: a long-lived context cannot take the stage's user
+    # agent or extra headers, so every page it opens gets them as page headers instead.
+    def __init__(self, context, user_agent=None, extra_http_headers=None):
+        self.context = context
+        # As on a private context, a user-agent among the extra headers wins over `user_agent`
+        self.headers = {'user-agent': user_agent} if user_agent else {}
+        self.headers.update(extra_http_headers or {})
+
+    async def new_page(self):
+        page = await self.context.new_page()
+        await page.set_extra_http_headers(self.headers)
+        return page
+
+    def __getattr__(self, name):
+        return getattr(self.context, name)
+
+
+# Context options a shared session can still honour per page
+PAGE_LEVEL_OPTIONS = ('user_agent', 'extra_http_headers')
+
+
+@asynccontextmanager
+async def browser_context(session=None, **context_kwargs):
+    # With a shared session the stage borrows its long-lived context, its user agent and
+    # headers applied per page. Without one the stage launches (and closes) its own browser.
+    if session:
+        unsupported = sorted(set(context_kwargs) - set(PAGE_LEVEL_OPTIONS))
+        if unsupported:
+            raise TypeError(f"A shared browser session cannot apply context options {unsupported}")
+        await session.ensure_started()
+        yield StageContext(session.context, **context_kwargs) if context_kwargs else session.context
+        return
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=await browser_args())
+        try:
+            context = await browser.new_context(viewport=await viewport(), **context_kwargs)
+            await get_resource_policy().apply(context)
+            yield context
+        finally:
+            await browser.close()
@@ -0,0 +1,102 @@
+import asyncio
+import aiohttp
+from playwright.async_api import Error as PlaywrightError
+from src.utils.logger.logger import custom_logger, initialize_logging
+from src.utils.task_utils.rate_controller import get_rate_controller, looks_blocked
+from src.utils.navigation import OK, navigate
+from src.utils.parsers.parse_executor import run_parse
+
+initialize_logging()
+
+# Parsers report these when the static document lacks the rendered profile markup
+MISSING_CONTAINER_MARKER = "container not found"
+
+
+class HttpFetcher:
+    # Plain async HTTP backend: one pooled session per run, the project header sets and a
+    # cookie jar that keeps whatever the site hands out across requests.
+    def __init__(self, headers=None, concurrency=8, timeout=30):
+        self.headers = {k: v for k, v in (headers or {}).items() if k.lower() != 'accept-encoding'}
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.session = None
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            cookie_jar=aiohttp.CookieJar(),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+        return self
+
+    async def fetch(self, url):
+        try:
+            async with get_rate_controller(url).request() as outcome:
+                async with self.session.get(url) as response:
+                    outcome.status = response.status
+                    if response.status != 200:
+                        custom_logger(f"HTTP fetch of {url} returned status {response.status}", log_type="warn")
+                        return None
+                    page_content = await response.text()
+                    outcome.blocked = looks_blocked(page_content)
+                    return None if outcome.blocked else page_content
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            custom_logger(f"HTTP fetch of {url} failed: {e}", log_type="warn")
+            return None
+
+    async def close(self):
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+
+class BrowserFetcher:
+    # Playwright backend on top of a PagePool; `page_type` picks the navigation policy
+    def __init__(self, pool, page_type=None):
+        self.pool = pool
+        self.page_type = page_type
+
+    async def fetch(self, url):
+        async with self.pool.lease() as page:
+            outcome = await navigate(page, url, self.page_type)
+            # A block page or a page that never rendered is not parsed as a profile
+            if outcome != OK:
+                raise PlaywrightError(f"Page did not render ({outcome})")
+            return await page.content()
+
+
+def needs_browser(profile_data):
+    if not profile_data:
+        return True
+    return "error" in profile_data and MISSING_CONTAINER_MARKER in str(profile_data.get("message", "")).lower()
+
+
+async def archive_page(archive, url, page_content, source):
+    # Archiving is best effort; a failed write never costs the profile
+    if archive is None or not page_content:
+        return
+    try:
+        await archive.store(url, page_content, source)
+    except Exception as e:
+        custom_logger(f"Could not archive {url}: {e}", log_type="warn")
+
+
+async def fetch_and_parse(url, parse, browser_fetcher, http_fetcher=None, parse_executor=None, archive=None,
+                          source=None):
+    # Try the static document first and only pay for a browser render when the parser
+    # could not find the profile markup in it. The document that was parsed is archived.
+    if http_fetcher:
+        page_content = await http_fetcher.fetch(url)
+        if page_content:
+            profile_data = await run_parse(parse, page_content, parse_executor)
+            if not needs_browser(profile_data):
+                await archive_page(archive, url, page_content, source)
+                return profile_data
+        custom_logger(f"Falling back to browser for {url}", log_type="info")
+
+    page_content = await browser_fetcher.fetch(url)
+    profile_data = await run_parse(parse, page_content, parse_executor)
+    await archive_page(archive, url, page_content, source)
+    return profile_data
@@ -0,0 +1,101 @@
+import asyncio
+from ochestrator.ochestrator import load_configs
+from src.utils.task_utils.rate_controller import controlled_goto, get_rate_controller
+from src.utils.logger.logger import custom_logger
+
+OK = "ok"
+BLOCKED = "blocked"
+EMPTY = "empty"
+TIMEOUT = "timeout"
+
+BLOCK_SELECTORS = [
+    'iframe[src*="_Incapsula_Resource"]',
+    'iframe[src*="captcha"]',
+    '#challenge-form',
+    '.g-recaptcha[data-sitekey]'
+]
+
+
+class NavigationPolicy:
+    # Navigate only until the DOM is parsed, then race the selector that proves the data is
+    # there against the ones that prove it never will be (block page, empty result).
+    def __init__(self, success_selectors=None, empty_selectors=None, block_selectors=None,
+                 wait_until="domcontentloaded", timeout=30000, selector_timeout=15000):
+        self.success_selectors = list(success_selectors or [])
+        self.empty_selectors = list(empty_selectors or [])
+        self.block_selectors = list(BLOCK_SELECTORS if block_selectors is None else block_selectors)
+        self.wait_until = wait_until
+        self.timeout = timeout
+        self.selector_timeout = selector_timeout
+
+
+# Result pages are server-rendered, so a results container without any result in it once the
+# DOM is parsed means the page is empty (typically the page past the last one), as does the
+# site's own no-results notice
+NL_EMPTY_SELECTORS = [
+    'div#results-box ol.result-items:not(:has(li.result-item))',
+    'div#results-box:has-text("geen resultaten")',
+    'main:has-text("Geen resultaten gevonden")'
+]
+ES_EMPTY_SELECTORS = [
+    'div.bloque-central .central:not(:has(div[itemscope]))',
+    'div.bloque-central:has-text("No hemos encontrado resultados")',
+    'main:has-text("No se han encontrado resultados")'
+]
+
+NAVIGATION_POLICIES = {
+    "nl_search": dict(success_selectors=['.result-info__count span.count'], empty_selectors=NL_EMPTY_SELECTORS),
+    "nl_listing": dict(success_selectors=['div#results-box div.relative ol.result-items li.result-item'],
+                       empty_selectors=NL_EMPTY_SELECTORS),
+    "nl_profile": dict(success_selectors=['#profile']),
+    "es_search": dict(success_selectors=['.first-content-listado'], empty_selectors=ES_EMPTY_SELECTORS),
+    "es_listing": dict(success_selectors=['div.bloque-central .central div[itemscope]'],
+                       empty_selectors=ES_EMPTY_SELECTORS),
+    "es_profile": dict(success_selectors=['.data-contact'])
+}
+
+_policies = {}
+
+
+def get_navigation_policy(page_type):
+    if page_type not in _policies:
+        settings = dict(NAVIGATION_POLICIES.get(page_type, {}))
+        configs = load_configs() or {}
+        settings.update((configs.get('navigation') or {}).get(page_type) or {})
+        _policies[page_type] = NavigationPolicy(**settings)
+    return _policies[page_type]
+
+
+async def wait_for_outcome(page, policy):
+    groups = [(OK, policy.success_selectors), (BLOCKED, policy.block_selectors), (EMPTY, policy.empty_selectors)]
+    tasks = {
+        asyncio.create_task(page.wait_for_selector(", ".join(selectors), state="attached",
+                                                   timeout=policy.selector_timeout)): outcome
+        for outcome, selectors in groups if selectors
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return tasks[task]
+        return TIMEOUT
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def navigate(page, url, page_type):
+    policy = get_navigation_policy(page_type)
+    await controlled_goto(page, url, wait_until=policy.wait_until, timeout=policy.timeout)
+    if not policy.success_selectors:
+        return OK
+
+    outcome = await wait_for_outcome(page, policy)
+    if outcome == BLOCKED:
+        get_rate_controller(url).on_throttle("captcha")
+    if outcome != OK:
+        custom_logger(f"Navigation to {url} ended as '{outcome}'", log_type="warn")
+    return outcome
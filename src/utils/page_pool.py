@@ -0,0 +1,80 @@
+import asyncio
+from contextlib import asynccontextmanager
+from playwright_stealth import stealth_async
+from src.utils.logger.logger import custom_logger
+
+
+class PagePool:
+    # Fixed set of pre-stealthed pages leased out per URL. A page is recycled (closed and
+    # replaced) after `max_uses` navigations or whenever the lease ended in an error, so
+    # the number of live tabs stays at `size` for the whole run.
+    def __init__(self, context, size=4, max_uses=50, headers=None):
+        self.context = context
+        self.size = size
+        self.max_uses = max_uses
+        self.headers = headers
+        self.recycled = 0
+        self._idle = asyncio.Queue()
+        self._uses = {}
+
+    async def start(self):
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._new_page())
+        return self
+
+    async def _new_page(self):
+        page = await self.context.new_page()
+        await stealth_async(page)
+        if self.headers:
+            await page.set_extra_http_headers(self.headers)
+        self._uses[page] = 0
+        return page
+
+    async def _close_page(self, page):
+        self._uses.pop(page, None)
+        try:
+            await page.close()
+        except Exception as e:
+            custom_logger(f"Error closing pooled page: {e}", log_type="warn")
+
+    async def acquire(self):
+        page = await self._idle.get()
+        if page is None:
+            # A previous recycle failed; rebuild the slot lazily
+            try:
+                page = await self._new_page()
+            except Exception:
+                self._idle.put_nowait(None)
+                raise
+        return page
+
+    async def release(self, page, failed=False):
+        self._uses[page] = self._uses.get(page, 0) + 1
+        if failed or self._uses[page] >= self.max_uses or page.is_closed():
+            await self._close_page(page)
+            self.recycled += 1
+            try:
+                page = await self._new_page()
+            except Exception as e:
+                custom_logger(f"Failed to recycle pooled page: {e}", log_type="warn")
+                page = None
+        self._idle.put_nowait(page)
+
+    @asynccontextmanager
+    async def lease(self):
+        page = await self.acquire()
+        failed = False
+        try:
+            yield page
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            await self.release(page, failed=failed)
+
+    async def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for page in list(self._uses):
+            await self._close_page(page)
+        custom_logger(f"Page pool closed. Pages recycled: {self.recycled}", log_type="info")
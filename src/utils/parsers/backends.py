@@ -0,0 +1,30 @@
+from bs4 import BeautifulSoup, FeatureNotFound
+from ochestrator.ochestrator import load_configs
+from src.utils.logger.logger import custom_logger
+
+HTML_PARSER = "html.parser"
+LXML = "lxml"
+PARSER_BACKENDS = (HTML_PARSER, LXML)
+
+_backend = None
+
+
+def get_parser_backend():
+    # html.parser stays the default until the recorded corpus covers enough malformed markup
+    # to show lxml repairs it the same way; lxml is opt-in and falls back when not installed
+    global _backend
+    if _backend is None:
+        configs = load_configs() or {}
+        backend = configs.get('parser_backend') or HTML_PARSER
+        if backend == LXML:
+            try:
+                BeautifulSoup("", LXML)
+            except FeatureNotFound:
+                custom_logger("lxml is not installed, falling back to html.parser", log_type="warn")
+                backend = HTML_PARSER
+        _backend = backend
+    return _backend
+
+
+def make_soup(page_content, backend=None):
+    return BeautifulSoup(page_content, backend or get_parser_backend())
@@ -1,148 +1,166 @@
+import json
+import json.scanner
 import re
-from bs4 import BeautifulSoup
 from middlewares.errors.error_handler import handle_exceptions
 from src.utils.task_utils.utilities import generate_uuid
+from src.utils.parsers.backends import make_soup
+from src.utils.parsers.extraction import ExtractionSpec, FieldSpec
 from src.utils.logger.logger import custom_logger, initialize_logging
 
 initialize_logging()
 
+BUSINESS_ID_PATTERN = re.compile(r'_(\d+_\d+)\.html')
+BR_PATTERN = re.compile(r'<br\s*/?>')
+BOLD_PATTERN = re.compile(r'<b>(.*?)</b>')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Fields the page only carries in its embedded tracking data
+EMBEDDED_KEYS = ('businessAddress', 'customerMail', 'phone', 'latitude', 'longitude', 'activity',
+                 'adWebEstablecimiento')
+EMBEDDED_FIELD_PATTERN = re.compile(r'"(' + '|'.join(EMBEDDED_KEYS) + r')":"([^"]+)"')
+
+
+def _raw_string(text, end, strict=True):
+    # Strings keep their escapes as written (`\/`, `\u00f1`), the same values the regex scan returns
+    _, string_end = json.decoder.scanstring(text, end, strict)
+    return text[end:string_end - 1], string_end
+
+
+class _RawStringDecoder(json.JSONDecoder):
+    def __init__(self):
+        super().__init__()
+        self.parse_string = _raw_string
+        self.scan_once = json.scanner.py_make_scanner(self)
+
+
+_json_decoder = _RawStringDecoder()
+
+
+def _collect_embedded(value, found):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key in EMBEDDED_KEYS and isinstance(item, str) and item:
+                found.setdefault(key, item)
+            elif isinstance(item, (dict, list)):
+                _collect_embedded(item, found)
+    elif isinstance(value, list):
+        for item in value:
+            _collect_embedded(item, found)
+
+
+def extract_embedded_fields(soup, page_content):
+    # Decode the first data script once as JSON; anything it does not cover comes from a
+    # single scan of the raw document with one combined pattern (first occurrence wins).
+    # Values from either path are the raw JSON string contents, escapes left undecoded.
+    found = {}
+    for script in soup.find_all('script'):
+        text = script.string
+        if not text or not any(f'"{key}"' in text for key in EMBEDDED_KEYS):
+            continue
+        try:
+            data, _ = _json_decoder.raw_decode(text, text.index('{'))
+            _collect_embedded(data, found)
+        except ValueError:
+            pass
+        break
+    if len(found) == len(EMBEDDED_KEYS):
+        return found
+
+    for match in EMBEDDED_FIELD_PATTERN.finditer(page_content):
+        found.setdefault(match.group(1), match.group(2))
+        if len(found) == len(EMBEDDED_KEYS):
+            break
+    return found
+
+
+def additional_info(additionals):
+    # Combine the text of each list item into a single string
+    return " | ".join(li.get_text(strip=True) for li in additionals.find_all('li'))
+
+
+ES_PROFILE_SPEC = ExtractionSpec([
+    FieldSpec('left_container', 'section.data-contact', element=True, required="Left container"),
+    FieldSpec('right_container', 'section.data-info', element=True, required="Right container"),
+    FieldSpec('crawled_url', 'link[rel="canonical"]', attr='href', required="Canonical link"),
+    FieldSpec('business_id', 'link[rel="canonical"]', attr='href', regex=BUSINESS_ID_PATTERN),
+    FieldSpec('title', 'div.text-center h1[itemprop="name"]', within='left_container'),
+    FieldSpec('locality', 'div.text-center h1[itemprop="name"] span.localidad', within='left_container'),
+    FieldSpec('phone', 'div.detalles-contacto div .content span.telephone b', within='left_container'),
+    FieldSpec('address', 'span.address[itemprop="address"]', element=True, within='left_container'),
+    FieldSpec('address_street', 'span[itemprop="streetAddress"]', within='address'),
+    FieldSpec('postcode', 'span[itemprop="postalCode"]', within='address'),
+    FieldSpec('city', 'span[itemprop="addressLocality"]', within='address'),
+    FieldSpec('local_website', 'a.sitio-web[rel="noopener nofollow"][itemprop="url"]', attr='href',
+              within='left_container'),
+    FieldSpec('description_html', 'p[data-yext="desc"]', element=True, post=lambda p: p.decode_contents(),
+              within='right_container'),
+    FieldSpec('images', 'div[id="videos_y_fotos"] div.col-12 div.container img.galeria-imagenes', attr='src',
+              many=True),
+    FieldSpec('miscellaneous_info', 'div.info-adicional', element=True, post=additional_info),
+])
+
 
 @handle_exceptions
-def es_extract_profile_data(page_content):
+def es_extract_profile_data(page_content, backend=None):
     if not page_content:
         raise ValueError("Page content is empty! Nothing to process.")
     try:
-        soup = BeautifulSoup(page_content, 'html.parser')
-        html_content = soup.prettify()
-
-        left_container = soup.select_one('section.data-contact')
-        if not left_container:
-            custom_logger("Left container not found", 'warn')
+        soup = make_soup(page_content, backend)
+        embedded = extract_embedded_fields(soup, page_content)
+        fields = ES_PROFILE_SPEC.extract(soup)
 
-        right_container = soup.select_one('section.data-info')
-        if not right_container:
-            custom_logger("Right container not found", 'warn')
-
-        # =======================================
-        # ========= business_id =================
-        # =======================================
-        canonical_ele = soup.select_one('link[rel="canonical"]')
-        pattern = re.compile(r'_(\d+_\d+)\.html')
-        if canonical_ele:
-            url_value = canonical_ele.get('href')
-            match = pattern.search(url_value)
-            extracted_id = match.group(1) if match else None
-        else:
-            extracted_id = None
-        # =======================================
-        # ========= Business name ===============
-        # =======================================
-        title_element = left_container.select_one('div.text-center h1[itemprop="name"]')
-        sub_title_element = left_container.select_one('div.text-center h1[itemprop="name"] span.localidad')
+        url_value = fields['crawled_url']
+        extracted_id = fields['business_id']
+        profile_title = f"{fields['title']}, {fields['locality']}"
+        phone = fields['phone']
 
-        sub_title1 = title_element.text.strip() if title_element else None
-        sub_title2 = sub_title_element.text.strip() if sub_title_element else None
-        profile_title = f"{sub_title1}, {sub_title2}"
-        # =======================================
-        # ========= Phone ===============
-        # =======================================
-        phone_element = left_container.select_one('div.detalles-contacto div .content span.telephone b')
-        phone = phone_element.text.strip() if phone_element else None
-        # =======================================
-        # ========= Address ===============
-        # =======================================
         full_address = ''
-        address_element = left_container.select_one('span.address[itemprop="address"]')
-        if address_element:
-            address_street = address_element.select_one('span[itemprop="streetAddress"]')
-            postcode = address_element.select_one('span[itemprop="postalCode"]')
-            city = address_element.select_one('span[itemprop="addressLocality"]')
-
-            address_street = address_street.text.strip() if address_street else ''
-            postcode = postcode.text.strip() if postcode else ''
-            city = city.text.strip() if city else ''
-
+        if fields['address'] is not None:
+            address_street = fields['address_street'] or ''
+            postcode = fields['postcode'] or ''
+            city = fields['city'] or ''
             full_address = f"{address_street} {postcode} {city}".strip()
+
         # =======================================
         # ==== Alternative business address  ====
         # =======================================
-        alt_bus_add_regexp = r'"businessAddress":"([^"]+)"'
-        alt_bus_add_match = re.search(alt_bus_add_regexp, html_content)
-        alt_buss_address = alt_bus_add_match.group(1) if alt_bus_add_match else "unavailable"
+        alt_buss_address = embedded.get('businessAddress', "unavailable")
 
         # =======================================
         # ========= description =========
         # =======================================
-        description_para = right_container.find('p', {'data-yext': 'desc'})
-        description_html = description_para.decode_contents() if description_para else "unavailable"
+        description_html = fields['description_html'] or "unavailable"
         # Extract text from the description paragraph, preserving line breaks and bold text
-        description_text = re.sub(r'<br\s*/?>', '\n', description_html)
-        description = re.sub(r'<b>(.*?)</b>', r'**\1**', description_text)
+        description_text = BR_PATTERN.sub('\n', description_html)
+        description = BOLD_PATTERN.sub(r'**\1**', description_text)
         if description:
-            description = re.sub(r'\s+', ' ', description).strip()
+            description = WHITESPACE_PATTERN.sub(' ', description).strip()
 
-        # =======================================
-        # ========= Extract images =============
-        # =======================================
-        # Extract images
-        all_image_elements = soup.select('div[id="videos_y_fotos"] div.col-12 div.container img.galeria-imagenes')
-        images = [img.get('src') for img in all_image_elements if img.get('src')]
+        images = fields['images']
         business_images = ', '.join(images) if images else None
-
-        # =======================================
-        # ========= miscellaneous_info =============
-        # =======================================
-        additionals = soup.select_one('div.info-adicional')
-        if additionals:
-            # Extract the text from each list item within the element
-            list_items = additionals.find_all('li')
-            additional_info_list = [li.get_text(strip=True) for li in list_items]
-            # Combine the extracted information into a single string
-            miscellaneous_info = " | ".join(additional_info_list)
-        else:
-            miscellaneous_info = ""
-
-        # =======================================
-        # ========= local business url =========
-        # =======================================
-        local_website_element = left_container.select_one('a.sitio-web[rel="noopener nofollow"][itemprop="url"]')
-        local_website = local_website_element.get('href') if local_website_element else None
+        miscellaneous_info = fields['miscellaneous_info'] or ""
+        local_website = fields['local_website']
 
         # =======================================
         # ========= email address ===============
         # =======================================
-        email_pattern = r'"customerMail":"([^"]+)"'
-        email_match = re.search(email_pattern, html_content)
-        email = email_match.group(1) if email_match else None
-
-        phone_pattern_alt = r'"phone":"([^"]+)"'
-        phone_match_alt = re.search(phone_pattern_alt, html_content)
-        phone_alt = phone_match_alt.group(1) if phone_match_alt else "unavailable"
+        email = embedded.get('customerMail')
+        phone_alt = embedded.get('phone', "unavailable")
 
         # =======================================
         # ========= latitude | longitude =======
         # =======================================
-        latitude_regexp = r'"latitude":"([^"]+)"'
-        longitude_regexp = r'"longitude":"([^"]+)"'
-
-        latitude_match = re.search(latitude_regexp, html_content)
-        longitude_match = re.search(longitude_regexp, html_content)
-
-        latitude = latitude_match.group(1) if latitude_match else "unavailable"
-        longitude = longitude_match.group(1) if longitude_match else "unavailable"
+        latitude = embedded.get('latitude', "unavailable")
+        longitude = embedded.get('longitude', "unavailable")
         # =======================================
         # ========= profession  =======
         # =======================================
-        profession_regexp = r'"activity":"([^"]+)"'
-        profession_match = re.search(profession_regexp, html_content)
-        profession = profession_match.group(1) if profession_match else "unavailable"
+        profession = embedded.get('activity', "unavailable")
 
         # =======================================
         # ========= business_url_alt  =======
         # =======================================
-        busis_url_alt_regexp = r'"adWebEstablecimiento":"([^"]+)"'
-        busis_url_alt_match = re.search(busis_url_alt_regexp, html_content)
-        busis_url_alt = busis_url_alt_match.group(1) if busis_url_alt_match else "unavailable"
+        busis_url_alt = embedded.get('adWebEstablecimiento', "unavailable")
 
         product_data = {}
 
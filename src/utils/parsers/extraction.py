@@ -0,0 +1,161 @@
+import re
+import soupsieve
+from bs4 import Tag
+
+_ATTRIBUTE_BLOCK = re.compile(r'\[[^\]]*\]|\([^)]*\)')
+_TAG_NAME = re.compile(r'^[a-zA-Z][\w-]*')
+_ID = re.compile(r'#((?:\\.|[\w-])+)')
+_CLASS = re.compile(r'\.((?:\\.|[\w-])+)')
+_ESCAPE = re.compile(r'\\(.)')
+
+
+def _present(value):
+    # Elements count as present even when empty (a bs4 Tag is falsy without children)
+    return value is not None and not (isinstance(value, str) and not value)
+
+
+def _split_top_level(selector, separators):
+    parts, depth, current, i = [], 0, [], 0
+    while i < len(selector):
+        char = selector[i]
+        if char == '\\' and i + 1 < len(selector):
+            current.append(selector[i:i + 2])
+            i += 2
+            continue
+        if char in '[(':
+            depth += 1
+        elif char in '])':
+            depth -= 1
+        if depth == 0 and char in separators:
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    parts.append(''.join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def selector_hints(selector):
+    # Cheap pre-checks read off the last compound of each alternative: the tag name, id and
+    # classes an element must have before the full (much slower) soupsieve match is tried.
+    hints = []
+    for alternative in _split_top_level(selector, ','):
+        compound = _split_top_level(alternative, ' >+~')[-1]
+        plain = _ATTRIBUTE_BLOCK.sub('', compound)
+        tag = _TAG_NAME.match(plain)
+        element_id = _ID.search(plain)
+        hints.append((
+            tag.group(0).lower() if tag else None,
+            _ESCAPE.sub(r'\1', element_id.group(1)) if element_id else None,
+            frozenset(_ESCAPE.sub(r'\1', name) for name in _CLASS.findall(plain))
+        ))
+    return hints
+
+
+class FieldSpec:
+    # One output field: a CSS selector (compiled once, here), what to read from the match
+    # (text, an attribute or the element itself), an optional regex and post-processor, the
+    # field whose element must contain the match, and fields to fall back to when empty.
+    def __init__(self, name, selector, attr=None, element=False, regex=None, post=None, many=False,
+                 within=None, fallback=(), required=None):
+        self.name = name
+        self.selector = selector
+        self.matcher = soupsieve.compile(selector)
+        self.hints = selector_hints(selector)
+        self.attr = attr
+        self.element = element
+        self.regex = re.compile(regex) if isinstance(regex, str) else regex
+        self.post = post
+        self.many = many
+        self.within = within
+        self.fallback = tuple(fallback)
+        self.required = required
+
+    def prefilter(self, element):
+        classes = element.get('class') or ()
+        for tag, element_id, class_names in self.hints:
+            if tag and tag != element.name:
+                continue
+            if element_id and element.get('id') != element_id:
+                continue
+            if class_names and not class_names.issubset(classes):
+                continue
+            return True
+        return False
+
+    def value(self, element):
+        if self.element:
+            value = element
+        elif self.attr:
+            value = element.get(self.attr)
+        else:
+            value = element.text.strip()
+        if self.regex is not None and value is not None:
+            match = self.regex.search(value)
+            value = match.group(1) if match else None
+        if self.post is not None and value is not None:
+            value = self.post(value)
+        return value
+
+
+class ExtractionSpec:
+    # Evaluates every field in one walk over the document. Matches arrive in document order,
+    # so a single-valued field takes the same element select_one would, and a container is
+    # always seen before anything inside it.
+    def __init__(self, fields):
+        self.fields = list(fields)
+        self._by_tag = {}
+        self._untagged = []
+        for field in self.fields:
+            tags = {tag for tag, _, _ in field.hints}
+            if None in tags:
+                self._untagged.append(field)
+            else:
+                for tag in tags:
+                    self._by_tag.setdefault(tag, []).append(field)
+
+    def _contained(self, element, container):
+        return any(parent is container for parent in element.parents)
+
+    def match_elements(self, soup):
+        matches = {field.name: [] for field in self.fields}
+        pending_single = {field.name for field in self.fields if not field.many}
+        has_many = any(field.many for field in self.fields)
+
+        for element in soup.descendants:
+            if not isinstance(element, Tag):
+                continue
+            for field in self._by_tag.get(element.name, []) + self._untagged:
+                if not field.many and matches[field.name]:
+                    continue
+                if not field.prefilter(element) or not field.matcher.match(element):
+                    continue
+                if field.within:
+                    containers = matches[field.within]
+                    if not containers or not self._contained(element, containers[0]):
+                        continue
+                matches[field.name].append(element)
+                pending_single.discard(field.name)
+            if not pending_single and not has_many:
+                break
+        return matches
+
+    def extract(self, soup):
+        matches = self.match_elements(soup)
+        values = {}
+        for field in self.fields:
+            if field.required and not matches[field.name]:
+                raise ValueError(f"{field.required} not found")
+            if field.many:
+                values[field.name] = [value for value in map(field.value, matches[field.name]) if _present(value)]
+            else:
+                values[field.name] = field.value(matches[field.name][0]) if matches[field.name] else None
+
+        for field in self.fields:
+            if not _present(values[field.name]):
+                for name in field.fallback:
+                    if _present(values.get(name)):
+                        values[field.name] = values[name]
+                        break
+        return values
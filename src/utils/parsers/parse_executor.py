@@ -0,0 +1,54 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from src.utils.logger.logger import custom_logger
+
+
+def default_parse_workers(shards=1):
+    # Shards already run one process each; split the cores between them
+    return max(1, (os.cpu_count() or 1) // max(1, shards))
+
+
+class ParseExecutor:
+    # Runs parse functions on raw HTML in worker processes so a large page never stalls the
+    # event loop that drives the browser and the uploads. `workers=0` parses inline.
+    def __init__(self, workers=None):
+        self.workers = default_parse_workers() if workers is None else workers
+        self._executor = None
+
+    def start(self):
+        if self.workers > 0:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+        return self
+
+    async def parse(self, parse, page_content):
+        if self._executor is None:
+            return parse(page_content)
+        loop = asyncio.get_running_loop()
+        executor = self._executor
+        try:
+            return await loop.run_in_executor(executor, parse, page_content)
+        except BrokenProcessPool:
+            if self._executor is not executor:
+                # Another parse already replaced the broken pool; shutting down the new one would
+                # cancel the pages in flight on it
+                return await self.parse(parse, page_content)
+            # A worker died (OOM, segfault in a C parser); replace the pool, parse this page here
+            custom_logger("Parse worker pool broke, restarting it.", log_type="warn")
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.start()
+            return parse(page_content)
+
+    def close(self):
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+async def run_parse(parse, page_content, parse_executor=None):
+    if parse_executor is None:
+        return parse(page_content)
+    return await parse_executor.parse(parse, page_content)
@@ -0,0 +1,49 @@
+from ochestrator.ochestrator import load_configs
+from src.utils.parsers.backends import make_soup
+
+HTML = "html"
+BROWSER = "browser"
+
+# (results container, result link element, attribute holding the profile URL)
+NL_LISTING = ('div#results-box div.relative ol.result-items', 'li.result-item', 'data-href')
+ES_LISTING = ('div.bloque-central .central div[itemscope]', 'a[data-omniclick="name"]', 'href')
+
+# Same walk as the soup path, run inside the page: first container only, raw attribute values
+IN_PAGE_EXTRACT = """([container, item, attr]) => {
+    const root = document.querySelector(container);
+    if (!root) return [];
+    return Array.from(root.querySelectorAll(item), el => el.getAttribute(attr)).filter(Boolean);
+}"""
+
+_mode = None
+
+
+def get_listing_extraction_mode():
+    global _mode
+    if _mode is None:
+        configs = load_configs() or {}
+        _mode = configs.get('listing_extraction') or BROWSER
+    return _mode
+
+
+def extract_listing_urls(page_content, listing, backend=None):
+    container_selector, item_selector, attr = listing
+    container = make_soup(page_content, backend).select_one(container_selector)
+    if not container:
+        return []
+    return [url for url in (item.get(attr) for item in container.select(item_selector)) if url]
+
+
+def extract_listing_endpoints(page_content, backend=None):
+    return extract_listing_urls(page_content, NL_LISTING, backend)
+
+
+def es_extract_listing_endpoints(page_content, backend=None):
+    return extract_listing_urls(page_content, ES_LISTING, backend)
+
+
+async def extract_listing_from_page(page, listing, mode=None):
+    # In browser mode only the URL list crosses over from Chromium, not the whole document
+    if (mode or get_listing_extraction_mode()) == BROWSER:
+        return await page.evaluate(IN_PAGE_EXTRACT, list(listing))
+    return extract_listing_urls(await page.content(), listing)
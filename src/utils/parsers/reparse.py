@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from ochestrator.ochestrator import load_configs
+from src.utils.parsers.parse_profile import extract_profile_data
+from src.utils.parsers.es_parse_profile import es_extract_profile_data
+from src.utils.parsers.parse_executor import ParseExecutor
+from src.utils.storage.html_archive import ARCHIVE_DIR, HtmlArchive, read_page
+from src.utils.storage.records import NL_FIELDNAMES, ES_FIELDNAMES
+from src.utils.storage.sinks import OUTPUT_SINKS, create_profile_sink
+from src.utils.task_utils.work_queue import run_worker_pool
+from src.utils.logger.logger import custom_logger
+
+REPARSED_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'data' / 'reparsed'
+
+# country -> (profile parser, output columns)
+PARSERS = {
+    "nl": (extract_profile_data, NL_FIELDNAMES),
+    "es": (es_extract_profile_data, ES_FIELDNAMES),
+}
+
+
+async def reparse_archive(country, output_sink, data_dir, archive_dir=ARCHIVE_DIR, sources=None, workers=None):
+    # Replays every archived page through the current parser on a process pool and writes the
+    # records through the chosen output sink, one sink per source keyword. Nothing is fetched.
+    parse, fieldnames = PARSERS[country]
+    root = Path(archive_dir) / country
+    archive = HtmlArchive(root)
+    entries = [entry for entry in archive.entries.values() if not sources or entry['source'] in sources]
+    archive.close()
+
+    stats = {"pages": len(entries), "parsed": 0, "failed": 0}
+    sinks = {}
+    parse_executor = ParseExecutor(workers).start()
+
+    async def reparse_entry(entry):
+        html = await asyncio.to_thread(read_page, root, entry)
+        record = await parse_executor.parse(parse, html)
+        if not record or "error" in record:
+            stats["failed"] += 1
+            return
+        source = entry['source'] or country
+        sink = sinks.get(source)
+        if sink is None:
+            sink = sinks[source] = create_profile_sink(source, country, fieldnames, output_sink=output_sink,
+                                                       data_dir=data_dir)
+        await sink.write(record)
+        stats["parsed"] += 1
+
+    started = time.perf_counter()
+    try:
+        # Enough pages in flight to keep every parse worker busy while segments are read
+        results = await run_worker_pool(entries, reparse_entry, concurrency=max(1, parse_executor.workers) * 2)
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                stats["failed"] += 1
+                custom_logger(f"Could not re-parse {entry['url']}: {result}", log_type="error")
+    finally:
+        for sink in sinks.values():
+            await sink.close()
+        parse_executor.close()
+    stats["seconds"] = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def main(argv=None):
+    configs = load_configs() or {}
+    parser = argparse.ArgumentParser(description="Re-parse archived profile pages with the current parsers.")
+    parser.add_argument("--country", choices=sorted(PARSERS), default=configs.get('country') or "nl")
+    parser.add_argument("--sources", nargs="+", default=None, help="only pages archived for these keyword files")
+    parser.add_argument("--output-sink", choices=OUTPUT_SINKS, default=configs.get('output_sink') or "csv")
+    parser.add_argument("--data-dir", type=Path, default=None, help="where to write (defaults to data/reparsed/<country>)")
+    parser.add_argument("--archive-dir", type=Path, default=ARCHIVE_DIR)
+    parser.add_argument("--workers", type=int, default=configs.get('parse_workers'))
+    args = parser.parse_args(argv)
+
+    stats = asyncio.run(reparse_archive(args.country, args.output_sink, args.data_dir or REPARSED_DIR / args.country,
+                                        args.archive_dir, args.sources, args.workers))
+    custom_logger(f"Re-parsed {stats['parsed']} of {stats['pages']} archived pages "
+                  f"({stats['failed']} failed) in {stats['seconds']}s", log_type="info")
+    return 0 if not stats["failed"] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
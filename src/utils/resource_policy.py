@@ -0,0 +1,80 @@
+from urllib.parse import urlparse
+from ochestrator.ochestrator import load_configs
+from src.utils.logger.logger import custom_logger
+
+DEFAULT_BLOCKED_TYPES = ["image", "font", "media"]
+DEFAULT_DENY_DOMAINS = [
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "facebook.net", "connect.facebook.com", "hotjar.com", "criteo.com", "criteo.net", "adnxs.com",
+    "scorecardresearch.com", "bat.bing.com", "taboola.com", "outbrain.com"
+]
+
+# Aborted requests never report a size, so savings are estimated per resource type
+ESTIMATED_BYTES = {"image": 60000, "media": 500000, "font": 40000, "script": 30000, "stylesheet": 20000}
+DEFAULT_ESTIMATED_BYTES = 10000
+
+
+def domain_matches(host, domains):
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+class ResourcePolicy:
+    def __init__(self, enabled=True, blocked_types=None, allow_domains=None, deny_domains=None):
+        self.enabled = enabled
+        self.blocked_types = set(DEFAULT_BLOCKED_TYPES if blocked_types is None else blocked_types)
+        self.allow_domains = list(allow_domains or [])
+        self.deny_domains = list(DEFAULT_DENY_DOMAINS if deny_domains is None else deny_domains)
+        self.blocked_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_type = {}
+
+    def should_block(self, url, resource_type):
+        host = urlparse(url).hostname or ""
+        if resource_type in self.blocked_types:
+            return True
+        if domain_matches(host, self.deny_domains):
+            return True
+        # A non-empty allow list turns every other domain into blocked third-party traffic
+        if self.allow_domains and not domain_matches(host, self.allow_domains):
+            return True
+        return False
+
+    def record_blocked(self, resource_type):
+        self.blocked_requests += 1
+        self.bytes_saved += ESTIMATED_BYTES.get(resource_type, DEFAULT_ESTIMATED_BYTES)
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    async def handle_route(self, route):
+        request = route.request
+        if self.should_block(request.url, request.resource_type):
+            self.record_blocked(request.resource_type)
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def apply(self, context):
+        if self.enabled:
+            await context.route("**/*", self.handle_route)
+        return context
+
+    def summary(self):
+        return (f"Resource policy: blocked {self.blocked_requests} requests "
+                f"(~{self.bytes_saved / 1024 / 1024:.1f} MB saved) {self.blocked_by_type}")
+
+
+_resource_policy = None
+
+
+def get_resource_policy():
+    # One policy per run so the counters cover every stage
+    global _resource_policy
+    if _resource_policy is None:
+        configs = load_configs() or {}
+        settings = configs.get('resource_policy') or {}
+        _resource_policy = ResourcePolicy(
+            enabled=settings.get('enabled', True),
+            blocked_types=settings.get('blocked_types'),
+            allow_domains=settings.get('allow_domains'),
+            deny_domains=settings.get('deny_domains')
+        )
+    return _resource_policy
@@ -0,0 +1,111 @@
+import asyncio
+import csv
+import io
+from pathlib import Path
+from src.utils.storage.sink_base import sink_settings
+from src.utils.logger.logger import custom_logger
+
+DEFAULT_SETTINGS = {
+    "flush_rows": 100,
+    "flush_interval": 5.0
+}
+
+def csv_sink_settings():
+    return sink_settings('csv_sink', DEFAULT_SETTINGS)
+
+
+class CsvSink:
+    # Keeps one handle open on a local CSV file for the whole run. The header is fixed when the
+    # file is opened (an existing file keeps its own), rows are buffered and written every
+    # `flush_rows` rows or `flush_interval` seconds, and close() writes the rest. Fields outside
+    # the header are dropped rather than shifting the row. Keys passed with records go to
+    # `on_written` once their rows are on disk.
+    def __init__(self, path, fieldnames, flush_rows=None, flush_interval=None, on_written=None):
+        settings = csv_sink_settings()
+        self.path = Path(path)
+        self.fieldnames = list(fieldnames)
+        self.flush_rows = flush_rows or settings["flush_rows"]
+        self.flush_interval = flush_interval or settings["flush_interval"]
+        self.on_written = on_written
+        self.records = 0
+        self._file = None
+        self._buffer = io.StringIO()
+        self._writer = None
+        self._pending = 0
+        self._keys = []
+        self._dropped = set()
+        self._lock = asyncio.Lock()
+        self._interval_task = None
+
+    def _open(self):
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with self.path.open('r', newline='', encoding='utf-8') as existing:
+                self.fieldnames = next(csv.reader(existing), self.fieldnames)
+            header = False
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            header = True
+        self._file = self.path.open('a', newline='', encoding='utf-8')
+        self._writer = csv.DictWriter(self._buffer, fieldnames=self.fieldnames, extrasaction='ignore')
+        if header:
+            self._writer.writeheader()
+
+    async def write(self, record, key=None):
+        async with self._lock:
+            if self._file is None:
+                await asyncio.to_thread(self._open)
+            extra = [field for field in record if field not in self.fieldnames and field not in self._dropped]
+            if extra:
+                self._dropped.update(extra)
+                custom_logger(f"{self.path.name}: dropping fields outside the header: {extra}", log_type="warn")
+            self._writer.writerow(record)
+            if key is not None:
+                self._keys.append(key)
+            self._pending += 1
+            self.records += 1
+            if self._pending >= self.flush_rows:
+                await self._flush()
+        if self._interval_task is None:
+            self._interval_task = asyncio.create_task(self._flush_on_interval())
+
+    async def _flush_on_interval(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def _write_out(self, data):
+        self._file.write(data)
+        self._file.flush()
+
+    async def _flush(self):
+        data = self._buffer.getvalue()
+        if not data:
+            return
+        try:
+            await asyncio.to_thread(self._write_out, data)
+        except Exception as e:
+            # Keep the rows buffered; the next flush tries them again
+            custom_logger(f"Write to {self.path.name} failed, keeping rows buffered: {e}", log_type="error")
+            return
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        self._pending = 0
+        keys, self._keys = self._keys, []
+        if self.on_written and keys:
+            self.on_written(keys)
+
+    async def flush(self):
+        async with self._lock:
+            await self._flush()
+
+    async def close(self):
+        if self._interval_task:
+            self._interval_task.cancel()
+            await asyncio.gather(self._interval_task, return_exceptions=True)
+            self._interval_task = None
+        await self.flush()
+        if self._file is not None:
+            if self._buffer.getvalue():
+                custom_logger(f"{self.path.name}: last rows could not be written", log_type="error")
+            self._file.close()
+            self._file = None
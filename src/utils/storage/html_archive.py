@@ -0,0 +1,110 @@
+import asyncio
+import hashlib
+import time
+import zlib
+from pathlib import Path
+from src.utils.storage.sink_base import sink_settings, new_run_id
+from src.utils.task_utils.append_log import JsonlAppendLog
+from src.utils.logger.logger import custom_logger
+
+ARCHIVE_DIR = Path(__file__).resolve().parent.parent.parent.parent / 'data' / 'html_archive'
+INDEX_NAME = "index.jsonl"
+
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "max_segment_bytes": 64 * 1024 * 1024,
+    "level": 6
+}
+
+def html_archive_settings():
+    return sink_settings('html_archive', DEFAULT_SETTINGS)
+
+
+def open_html_archive(name):
+    # The archive stage is optional; processors get None when it is switched off
+    return HtmlArchive(ARCHIVE_DIR / name) if html_archive_settings()["enabled"] else None
+
+
+def read_page(root, entry):
+    with (Path(root) / entry['segment']).open('rb') as segment:
+        segment.seek(entry['offset'])
+        return zlib.decompress(segment.read(entry['length'])).decode('utf-8')
+
+
+class HtmlArchive:
+    # Content-addressed store of fetched pages. Each distinct page (by sha256 of its HTML) is
+    # zlib-compressed once into an append-only segment file; index.jsonl maps every archived
+    # URL to the segment, offset and length of its page, the last line per URL winning. Each
+    # run writes its own segments, so shard processes can share one archive directory.
+    def __init__(self, root, max_segment_bytes=None, level=None, run_id=None):
+        settings = html_archive_settings()
+        self.root = Path(root)
+        self.max_segment_bytes = max_segment_bytes or settings["max_segment_bytes"]
+        self.level = level or settings["level"]
+        self.run_id = run_id or new_run_id()
+        self.entries = {}
+        self.pages = {}
+        self.stored = 0
+        self.stored_bytes = 0
+        self._segments = 0
+        self._segment = None
+        self._index = JsonlAppendLog(self.root / INDEX_NAME)
+        self._lock = asyncio.Lock()
+        self._load()
+
+    def _load(self):
+        if not self._index.exists():
+            return
+        for entry in self._index.read():
+            self.entries[entry['url']] = entry
+            self.pages.setdefault(entry['digest'], entry)
+        custom_logger(f"Loaded {len(self.entries)} archived pages from {self.root}", log_type="info")
+
+    def _append_index(self, entry):
+        self._index.append(entry)
+        self.entries[entry['url']] = entry
+
+    def _write_page(self, data):
+        blob = zlib.compress(data, self.level)
+        if self._segment is None or self._segment.tell() + len(blob) > self.max_segment_bytes:
+            if self._segment is not None:
+                self._segment.close()
+            name = f"segment-{self.run_id}-{self._segments:05d}.z"
+            self._segment = (self.root / name).open('ab')
+            self._segments += 1
+        offset = self._segment.tell()
+        self._segment.write(blob)
+        # The page is on disk before any index line points at it
+        self._segment.flush()
+        self.stored += 1
+        self.stored_bytes += len(blob)
+        return {'segment': Path(self._segment.name).name, 'offset': offset, 'length': len(blob)}
+
+    def _store(self, url, html, source):
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        page = self.pages.get(digest)
+        if page is None:
+            location = self._write_page(data)
+        else:
+            location = {'segment': page['segment'], 'offset': page['offset'], 'length': page['length']}
+        entry = {'url': url, 'source': source, 'digest': digest, **location, 'fetched_at': time.time()}
+        self._append_index(entry)
+        self.pages.setdefault(digest, entry)
+
+    async def store(self, url, html, source=None):
+        async with self._lock:
+            # Hashing, compression and the file writes stay off the event loop
+            await asyncio.to_thread(self._store, url, html, source)
+
+    def read(self, url):
+        return read_page(self.root, self.entries[url])
+
+    def close(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._index.close()
+        if self.stored:
+            custom_logger(f"Archived {self.stored} pages ({self.stored_bytes} bytes) in {self.root}", log_type="info")
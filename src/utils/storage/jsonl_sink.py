@@ -0,0 +1,85 @@
+import io
+import json
+import zlib
+from src.utils.storage.sink_base import PartSink, sink_settings
+from src.utils.logger.logger import custom_logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+NONE = "none"
+
+# (file extension, content type, default level)
+COMPRESSIONS = {
+    GZIP: (".jsonl.gz", "application/gzip", 6),
+    ZSTD: (".jsonl.zst", "application/zstd", 3),
+    NONE: (".jsonl", "application/x-ndjson", None),
+}
+
+DEFAULT_SETTINGS = {
+    "compression": ZSTD,
+    "level": None,
+    "max_bytes": 16 * 1024 * 1024,
+    "max_age": 60.0
+}
+
+def jsonl_sink_settings():
+    return sink_settings('jsonl_sink', DEFAULT_SETTINGS)
+
+
+def resolve_compression(compression):
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"Unknown JSONL compression '{compression}'")
+    if compression == ZSTD and zstandard is None:
+        custom_logger("zstandard is not installed, compressing JSONL output with gzip", log_type="warn")
+        return GZIP
+    return compression
+
+
+def make_compressor(compression, level):
+    # Both compressors take compress(data) for each chunk and flush() to end the stream
+    if compression == GZIP:
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+    if compression == ZSTD:
+        return zstandard.ZstdCompressor(level=level).compressobj()
+    return None
+
+
+class JsonlSink(PartSink):
+    # Streams records as JSON lines through a gzip/zstd compressor into rolled part files under
+    # `{prefix}/{run_id}/part-00000.jsonl.zst`. Only compressed bytes are held, and a part is
+    # closed once it reaches `max_bytes` or is `max_age` seconds old. Nested fields stay JSON.
+    # Keys passed with records go to `on_written` once the part holding them is stored.
+    def __init__(self, prefix, upload, compression=None, level=None, max_bytes=None, max_age=None, run_id=None,
+                 on_written=None):
+        settings = jsonl_sink_settings()
+        super().__init__(prefix, upload, max_age or settings["max_age"], run_id=run_id, on_written=on_written)
+        self.compression = resolve_compression(compression or settings["compression"])
+        self.extension, self.content_type, default_level = COMPRESSIONS[self.compression]
+        self.level = level or settings["level"] or default_level
+        self.max_bytes = max_bytes or settings["max_bytes"]
+        self._buffer = None
+        self._compressor = None
+
+    async def _add(self, record):
+        line = (json.dumps(record, ensure_ascii=False, default=str) + "\n").encode('utf-8')
+        if self._buffer is None:
+            self._buffer = io.BytesIO()
+            self._compressor = make_compressor(self.compression, self.level)
+        self._buffer.write(self._compressor.compress(line) if self._compressor else line)
+
+    def _part_full(self):
+        return self._buffer.tell() >= self.max_bytes
+
+    async def _finish_part(self):
+        if self._buffer is None:
+            return None
+        if self._compressor:
+            self._buffer.write(self._compressor.flush())
+        data = self._buffer.getvalue()
+        self._buffer = self._compressor = None
+        return data
@@ -0,0 +1,125 @@
+import asyncio
+import io
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.utils.storage.records import NL_CITY, ES_CITY, COMPETITOR_FIELDS, text, number, split_on, city_from, \
+    misc_entries, competitors
+from src.utils.storage.sink_base import PartSink, sink_settings
+
+DEFAULT_SETTINGS = {
+    "row_group_size": 2000,
+    "part_rows": 20000,
+    "compression": "zstd",
+    "max_age": 60.0
+}
+
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+COMPETITOR = pa.struct([(name, pa.string()) for name in COMPETITOR_FIELDS])
+MISC_ENTRY = pa.struct([
+    ("section", pa.string()),
+    ("key", pa.string()),
+    ("values", pa.list_(pa.string()))
+])
+
+def parquet_sink_settings():
+    return sink_settings('parquet_sink', DEFAULT_SETTINGS)
+
+
+# (column, arrow type, converter, record field it is read from when not the column itself)
+NL_PROFILE_COLUMNS = [
+    ("uuid", pa.string(), text, None),
+    ("business_id", pa.string(), text, None),
+    ("business_name", pa.string(), text, None),
+    ("crawled_url", pa.string(), text, None),
+    ("phone", pa.string(), text, None),
+    ("address", pa.string(), text, None),
+    ("city", CATEGORY, city_from(NL_CITY), "address"),
+    ("business_url", pa.string(), text, None),
+    ("email", pa.string(), text, None),
+    ("description", pa.string(), text, None),
+    ("business_images", pa.list_(pa.string()), split_on(","), None),
+    ("miscellaneous_info", pa.list_(MISC_ENTRY), misc_entries, None),
+    ("competitors", pa.list_(COMPETITOR), competitors, None),
+]
+
+ES_PROFILE_COLUMNS = [
+    ("uuid", pa.string(), text, None),
+    ("business_id", pa.string(), text, None),
+    ("profession", CATEGORY, text, None),
+    ("crawled_url", pa.string(), text, None),
+    ("phone", pa.string(), text, None),
+    ("address", pa.string(), text, None),
+    ("city", CATEGORY, city_from(ES_CITY), "address"),
+    ("business_url", pa.string(), text, None),
+    ("email", pa.string(), text, None),
+    ("description", pa.string(), text, None),
+    ("business_images", pa.list_(pa.string()), split_on(","), None),
+    ("miscellaneous_info", pa.list_(pa.string()), split_on("|"), None),
+    ("profile_title", pa.string(), text, None),
+    ("latitude", pa.float64(), number, None),
+    ("longitude", pa.float64(), number, None),
+]
+
+PROFILE_COLUMNS = {"nl": NL_PROFILE_COLUMNS, "es": ES_PROFILE_COLUMNS}
+
+
+class ParquetSink(PartSink):
+    # Converts records to a fixed, typed schema and writes them as Parquet part files under
+    # `{prefix}/{run_id}/part-00000.parquet`: one row group per `row_group_size` records, one
+    # part per `part_rows` or per `max_age` seconds, whichever comes first. Only the categorical
+    # columns are dictionary-encoded. A part is handed to `upload` once its footer is written,
+    # and keys passed with its records go to `on_written` after that succeeds.
+    extension = ".parquet"
+    content_type = "application/vnd.apache.parquet"
+
+    def __init__(self, prefix, columns, upload, row_group_size=None, part_rows=None, compression=None,
+                 max_age=None, run_id=None, on_written=None):
+        settings = parquet_sink_settings()
+        super().__init__(prefix, upload, max_age or settings["max_age"], run_id=run_id, on_written=on_written)
+        self.columns = columns
+        self.schema = pa.schema([(name, arrow_type) for name, arrow_type, _, _ in columns])
+        self.row_group_size = row_group_size or settings["row_group_size"]
+        self.part_rows = part_rows or settings["part_rows"]
+        self.compression = compression or settings["compression"]
+        self._rows = []
+        self._part_rows = 0
+        self._buffer = None
+        self._writer = None
+
+    def _row(self, record):
+        return {name: convert(record.get(field or name)) for name, _, convert, field in self.columns}
+
+    def _write_rows(self, rows):
+        if self._writer is None:
+            self._buffer = io.BytesIO()
+            self._writer = pq.ParquetWriter(
+                self._buffer, self.schema, compression=self.compression,
+                use_dictionary=[name for name, arrow_type, _, _ in self.columns if arrow_type == CATEGORY]
+            )
+        self._writer.write_table(pa.Table.from_pylist(rows, schema=self.schema), row_group_size=len(rows))
+
+    async def _add(self, record):
+        self._rows.append(self._row(record))
+        if len(self._rows) >= self.row_group_size:
+            await self._write_row_group()
+
+    def _part_full(self):
+        return self._part_rows >= self.part_rows
+
+    async def _write_row_group(self):
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        # Encoding and compression are CPU work; keep them off the event loop
+        await asyncio.to_thread(self._write_rows, rows)
+        self._part_rows += len(rows)
+
+    async def _finish_part(self):
+        await self._write_row_group()
+        if self._writer is None:
+            return None
+        await asyncio.to_thread(self._writer.close)
+        data = self._buffer.getvalue()
+        self._buffer = self._writer = None
+        self._part_rows = 0
+        return data
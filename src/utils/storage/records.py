@@ -0,0 +1,66 @@
+import re
+
+# Placeholders the parsers emit for missing values; typed sinks store them as nulls
+MISSING = {"", "unavailable", "unavailbale", "null"}
+
+NL_CITY = re.compile(r'\b\d{4}\s?[A-Z]{2}\s+(.+)$')
+ES_CITY = re.compile(r'\b\d{5}\s+(.+)$')
+
+COMPETITOR_FIELDS = ("competitor_title", "competitor_url", "competitor_phone")
+
+# Column order of the CSV outputs
+NL_FIELDNAMES = ['uuid', 'business_id', 'business_name', 'crawled_url', 'phone', 'address', 'business_url', 'email',
+                 'description', 'business_images', 'miscellaneous_info', 'competitors']
+ES_FIELDNAMES = ['uuid', 'business_id', 'profession', 'crawled_url', 'phone', 'address', 'business_url', 'email',
+                 'description', 'business_images', 'miscellaneous_info', 'profile_title', 'latitude', 'longitude']
+
+
+def text(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return None if value in MISSING else value
+
+
+def number(value):
+    try:
+        return float(text(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def split_on(separator):
+    def split(value):
+        value = text(value)
+        return [part.strip() for part in value.split(separator) if part.strip()] if value else None
+    return split
+
+
+def city_from(pattern):
+    # Neither parser emits the city on its own; it follows the postcode in the address
+    def city(address):
+        match = pattern.search(text(address) or "")
+        return match.group(1).strip() if match else None
+    return city
+
+
+def misc_entries(value):
+    # One entry per item of a profile tab: {"KvK-nummer": "123"} -> key/values, "NOvA" -> values only
+    if not isinstance(value, dict):
+        return None
+    entries = []
+    for section, items in value.items():
+        for item in items:
+            if isinstance(item, dict):
+                for key, values in item.items():
+                    values = values if isinstance(values, list) else [values]
+                    entries.append({"section": section, "key": key, "values": [str(v) for v in values]})
+            else:
+                entries.append({"section": section, "key": None, "values": [str(item)]})
+    return entries
+
+
+def competitors(value):
+    if not isinstance(value, list):
+        return None
+    return [{name: text(competitor.get(name)) for name in COMPETITOR_FIELDS} for competitor in value]
@@ -0,0 +1,54 @@
+import csv
+import io
+from src.utils.storage.sink_base import PartSink, sink_settings
+from src.utils.storage.storage_hundler import save_stream_to_s3
+
+DEFAULT_SETTINGS = {
+    "max_bytes": 16 * 1024 * 1024,
+    "max_age": 60.0
+}
+
+
+def s3_sink_settings():
+    return sink_settings('s3_sink', DEFAULT_SETTINGS)
+
+
+class S3BatchSink(PartSink):
+    # Buffers records as CSV rows and uploads them as rolled part files under
+    # `{prefix}/{run_id}/part-00000.csv`, one part per `max_bytes` of rows or per `max_age`
+    # seconds, whichever comes first. A row with fields the open part's header lacks starts a
+    # new part. Keys passed with records are handed to `on_uploaded` once their part is stored.
+    extension = ".csv"
+    content_type = "text/csv"
+
+    def __init__(self, prefix, fieldnames, max_bytes=None, max_age=None, run_id=None, upload=None,
+                 on_uploaded=None):
+        settings = s3_sink_settings()
+        super().__init__(prefix, upload or save_stream_to_s3, max_age or settings["max_age"], run_id=run_id,
+                         on_written=on_uploaded)
+        self.fieldnames = list(fieldnames)
+        self.max_bytes = max_bytes or settings["max_bytes"]
+        self._buffer = None
+        self._writer = None
+        self._part_fieldnames = None
+
+    async def _add(self, record):
+        if self._buffer is not None and any(field not in self._part_fieldnames for field in record):
+            await self._roll()
+        if self._buffer is None:
+            # A part keeps one header; keys beyond the base fields extend it for this part only
+            self._part_fieldnames = self.fieldnames + [key for key in record if key not in self.fieldnames]
+            self._buffer = io.StringIO()
+            self._writer = csv.DictWriter(self._buffer, fieldnames=self._part_fieldnames)
+            self._writer.writeheader()
+        self._writer.writerow(record)
+
+    def _part_full(self):
+        return self._buffer.tell() >= self.max_bytes
+
+    async def _finish_part(self):
+        if self._buffer is None:
+            return None
+        data = self._buffer.getvalue().encode('utf-8')
+        self._buffer = self._writer = self._part_fieldnames = None
+        return data
@@ -0,0 +1,114 @@
+import asyncio
+import io
+import time
+from ochestrator.ochestrator import load_configs
+from src.utils.task_utils.utilities import generate_uuid
+from src.utils.logger.logger import custom_logger
+
+_settings = {}
+
+
+def sink_settings(name, defaults):
+    # A sink's defaults overlaid with its section of the config, read once per process
+    if name not in _settings:
+        configs = load_configs() or {}
+        settings = dict(defaults)
+        settings.update(configs.get(name) or {})
+        _settings[name] = settings
+    return _settings[name]
+
+
+def new_run_id():
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{generate_uuid()[:8]}"
+
+
+class PartSink:
+    # Base for sinks that buffer records into part files under `{prefix}/{run_id}/part-00000{ext}`
+    # and hand each finished part to `upload`. A part is finished once the subclass reports it
+    # full or it is `max_age` seconds old; a part whose upload fails stays queued and is tried
+    # again on the next roll or close(). Keys passed with records go to `on_written` once the
+    # part holding them is stored. Subclasses implement _add, _part_full and _finish_part.
+    extension = ""
+    content_type = "application/octet-stream"
+
+    def __init__(self, prefix, upload, max_age, run_id=None, on_written=None):
+        self.prefix = prefix
+        self.upload = upload
+        self.max_age = max_age
+        self.run_id = run_id or new_run_id()
+        self.on_written = on_written
+        self.parts = 0
+        self.records = 0
+        self._part_keys = []
+        self._opened_at = None
+        self._finished = []
+        self._lock = asyncio.Lock()
+        self._age_task = None
+
+    async def _add(self, record):
+        # Writes one record into the open part, opening one if needed
+        raise NotImplementedError
+
+    def _part_full(self):
+        raise NotImplementedError
+
+    async def _finish_part(self):
+        # Closes the open part and returns its bytes, or None when no part is open
+        raise NotImplementedError
+
+    async def write(self, record, key=None):
+        async with self._lock:
+            await self._add(record)
+            if self._opened_at is None:
+                self._opened_at = time.monotonic()
+            if key is not None:
+                self._part_keys.append(key)
+            self.records += 1
+            if self._part_full():
+                await self._roll()
+        if self._age_task is None:
+            self._age_task = asyncio.create_task(self._flush_when_stale())
+
+    async def _flush_when_stale(self):
+        while True:
+            await asyncio.sleep(self.max_age / 4)
+            async with self._lock:
+                if self._opened_at is not None and time.monotonic() - self._opened_at >= self.max_age:
+                    await self._roll()
+
+    async def _roll(self):
+        data = await self._finish_part()
+        if data is not None:
+            file_key = f"{self.prefix}/{self.run_id}/part-{self.parts:05d}{self.extension}"
+            self._finished.append((file_key, data, self._part_keys))
+            self.parts += 1
+        self._part_keys = []
+        self._opened_at = None
+        await self._upload_finished()
+
+    async def _upload_finished(self):
+        while self._finished:
+            file_key, data, keys = self._finished[0]
+            try:
+                await self.upload(io.BytesIO(data), file_key, content_type=self.content_type)
+            except Exception as e:
+                # The finished part stays queued; the next roll or close() tries it again
+                custom_logger(f"Upload of {file_key} failed, keeping it buffered: {e}", log_type="error")
+                return
+            self._finished.pop(0)
+            custom_logger(f"Stored {file_key} ({len(data)} bytes)", log_type="info")
+            if self.on_written and keys:
+                self.on_written(keys)
+
+    async def flush(self):
+        async with self._lock:
+            await self._roll()
+
+    async def close(self):
+        if self._age_task:
+            self._age_task.cancel()
+            await asyncio.gather(self._age_task, return_exceptions=True)
+            self._age_task = None
+        await self.flush()
+        if self._finished:
+            custom_logger(f"{self.prefix}: {len(self._finished)} part(s) could not be stored", log_type="error")
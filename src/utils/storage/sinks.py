@@ -0,0 +1,58 @@
+import asyncio
+import os
+from pathlib import Path
+from src.utils.storage.csv_sink import CsvSink
+from src.utils.storage.s3_sink import S3BatchSink
+from src.utils.storage.storage_hundler import save_stream_to_s3
+
+CSV = "csv"
+PARQUET = "parquet"
+JSONL = "jsonl"
+SQLITE = "sqlite"
+OUTPUT_SINKS = (CSV, PARQUET, JSONL, SQLITE)
+
+
+def _write_file(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, 'wb') as part_file:
+        part_file.write(data)
+    # Readers scanning the directory never see a half-written part
+    os.replace(partial, path)
+
+
+def local_upload(root):
+    # Same call shape as save_stream_to_s3, storing part files under a local directory
+    root = Path(root)
+
+    async def upload(data_stream, file_key, content_type=None):
+        await asyncio.to_thread(_write_file, root / file_key, data_stream.getvalue())
+
+    return upload
+
+
+def create_profile_sink(name, country, fieldnames, output_sink=CSV, to_s3=False, data_dir=None, shard_suffix="",
+                        on_written=None):
+    # Every sink takes write(record, key) and close(), and reports keys once they are stored
+    if output_sink == PARQUET:
+        # pyarrow is only needed when the columnar output is selected
+        from src.utils.storage.parquet_sink import ParquetSink, PROFILE_COLUMNS
+        if to_s3:
+            return ParquetSink(name, PROFILE_COLUMNS[country], save_stream_to_s3, on_written=on_written)
+        return ParquetSink(f"{name}_profile_data", PROFILE_COLUMNS[country], local_upload(data_dir),
+                           on_written=on_written)
+    if output_sink == JSONL:
+        from src.utils.storage.jsonl_sink import JsonlSink
+        if to_s3:
+            return JsonlSink(name, save_stream_to_s3, on_written=on_written)
+        return JsonlSink(f"{name}_profile_data", local_upload(data_dir), on_written=on_written)
+    if output_sink == SQLITE and not to_s3:
+        from src.utils.storage.sqlite_sink import SqliteSink, PROFILE_COLUMNS
+        # One database per data directory; every keyword upserts into the country's table
+        return SqliteSink(Path(data_dir) / "profiles.sqlite3", f"{country}_profiles", PROFILE_COLUMNS[country],
+                          source=name, on_written=on_written)
+    if output_sink == CSV and to_s3:
+        return S3BatchSink(name, fieldnames, on_uploaded=on_written)
+    if output_sink == CSV:
+        return CsvSink(Path(data_dir) / f"{name}{shard_suffix}_profile_data.csv", fieldnames, on_written=on_written)
+    raise ValueError(f"No sink for output '{output_sink}' (to_s3={to_s3})")
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import sqlite3
+import time
+from pathlib import Path
+from src.utils.storage.sink_base import sink_settings
+from src.utils.storage.records import NL_CITY, ES_CITY, text, number, split_on, city_from
+from src.utils.logger.logger import custom_logger
+
+DEFAULT_SETTINGS = {
+    "batch_size": 200,
+    "flush_interval": 5.0,
+    "busy_timeout": 30.0
+}
+
+INDEXED_COLUMNS = ("phone", "email", "city")
+
+def sqlite_sink_settings():
+    return sink_settings('sqlite_sink', DEFAULT_SETTINGS)
+
+
+def as_json(convert=None):
+    def encode(value):
+        value = convert(value) if convert else value
+        if isinstance(value, (dict, list)) and value:
+            return json.dumps(value, ensure_ascii=False)
+        return None
+    return encode
+
+
+# (column, SQL type, converter, record field it is read from when not the column itself)
+NL_PROFILE_COLUMNS = [
+    ("uuid", "TEXT", text, None),
+    ("business_id", "TEXT", text, None),
+    ("business_name", "TEXT", text, None),
+    ("crawled_url", "TEXT", text, None),
+    ("phone", "TEXT", text, None),
+    ("address", "TEXT", text, None),
+    ("city", "TEXT", city_from(NL_CITY), "address"),
+    ("business_url", "TEXT", text, None),
+    ("email", "TEXT", text, None),
+    ("description", "TEXT", text, None),
+    ("business_images", "TEXT", as_json(split_on(",")), None),
+    ("miscellaneous_info", "TEXT", as_json(), None),
+    ("competitors", "TEXT", as_json(), None),
+]
+
+ES_PROFILE_COLUMNS = [
+    ("uuid", "TEXT", text, None),
+    ("business_id", "TEXT", text, None),
+    ("profession", "TEXT", text, None),
+    ("crawled_url", "TEXT", text, None),
+    ("phone", "TEXT", text, None),
+    ("address", "TEXT", text, None),
+    ("city", "TEXT", city_from(ES_CITY), "address"),
+    ("business_url", "TEXT", text, None),
+    ("email", "TEXT", text, None),
+    ("description", "TEXT", text, None),
+    ("business_images", "TEXT", as_json(split_on(",")), None),
+    ("miscellaneous_info", "TEXT", as_json(split_on("|")), None),
+    ("profile_title", "TEXT", text, None),
+    ("latitude", "REAL", number, None),
+    ("longitude", "REAL", number, None),
+]
+
+PROFILE_COLUMNS = {"nl": NL_PROFILE_COLUMNS, "es": ES_PROFILE_COLUMNS}
+
+
+class SqliteSink:
+    # Upserts records into `table` of a WAL-mode SQLite database, keyed on business_id, so a
+    # rerun updates rows instead of adding them (rows without a business_id are always
+    # inserted). Rows are committed in one transaction per `batch_size` records or
+    # `flush_interval` seconds, and on close(); keys passed with records go to `on_written`
+    # after their transaction commits. Nested fields are stored as JSON text.
+    def __init__(self, path, table, columns, source=None, batch_size=None, flush_interval=None, on_written=None):
+        settings = sqlite_sink_settings()
+        self.path = Path(path)
+        self.table = table
+        self.columns = columns
+        self.source = source
+        self.batch_size = batch_size or settings["batch_size"]
+        self.flush_interval = flush_interval or settings["flush_interval"]
+        self.busy_timeout = settings["busy_timeout"]
+        self.on_written = on_written
+        self.records = 0
+        self._connection = None
+        self._rows = []
+        self._keys = []
+        self._lock = asyncio.Lock()
+        self._interval_task = None
+        names = [name for name, _, _, _ in columns] + ["source", "updated_at"]
+        updates = ", ".join(f"{name} = excluded.{name}" for name in names if name not in ("uuid", "business_id"))
+        self._upsert = (
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+            f"ON CONFLICT(business_id) DO UPDATE SET {updates}"
+        )
+
+    def _connect(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Shard processes write the same file; WAL lets readers and one writer proceed together
+        connection = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        columns = ", ".join(f"{name} {sql_type}" for name, sql_type, _, _ in self.columns)
+        with connection:
+            connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} (id INTEGER PRIMARY KEY, {columns}, "
+                f"source TEXT, updated_at REAL, UNIQUE(business_id))"
+            )
+            for name in INDEXED_COLUMNS:
+                connection.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_{name} ON {self.table} ({name})")
+        self._connection = connection
+
+    def _row(self, record):
+        values = [convert(record.get(field or name)) for name, _, convert, field in self.columns]
+        return values + [self.source, time.time()]
+
+    def _commit(self, rows):
+        if self._connection is None:
+            self._connect()
+        with self._connection:
+            self._connection.executemany(self._upsert, rows)
+
+    async def write(self, record, key=None):
+        async with self._lock:
+            self._rows.append(self._row(record))
+            if key is not None:
+                self._keys.append(key)
+            self.records += 1
+            if len(self._rows) >= self.batch_size:
+                await self._flush()
+        if self._interval_task is None:
+            self._interval_task = asyncio.create_task(self._flush_on_interval())
+
+    async def _flush_on_interval(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def _flush(self):
+        if not self._rows:
+            return
+        try:
+            await asyncio.to_thread(self._commit, self._rows)
+        except sqlite3.Error as e:
+            # The transaction rolled back; keep the rows for the next flush
+            custom_logger(f"Commit to {self.path.name} failed, keeping rows buffered: {e}", log_type="error")
+            return
+        self._rows = []
+        keys, self._keys = self._keys, []
+        if self.on_written and keys:
+            self.on_written(keys)
+
+    async def flush(self):
+        async with self._lock:
+            await self._flush()
+
+    async def close(self):
+        if self._interval_task:
+            self._interval_task.cancel()
+            await asyncio.gather(self._interval_task, return_exceptions=True)
+            self._interval_task = None
+        await self.flush()
+        if self._rows:
+            custom_logger(f"{self.path.name}: {len(self._rows)} rows could not be committed", log_type="error")
+        if self._connection is not None:
+            await asyncio.to_thread(self._connection.close)
+            self._connection = None
@@ -1,10 +1,14 @@
-import boto3
+import asyncio
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 from middlewares.errors.error_handler import handle_exceptions
 from src.utils.logger.logger import initialize_logging, custom_logger
-from src.utils.task_utils.loader import emulator
 
 load_dotenv()
 
@@ -14,28 +18,105 @@ AWS_ACCESS_KEY_ID = os.getenv('AWS_ACCESS_KEY_ID')
 AWS_SECRET_ACCESS_KEY = os.getenv('AWS_SECRET_ACCESS_KEY')
 AWS_BUCKET_NAME = os.getenv('AWS_BUCKET_NAME')
 AWS_REGION = os.getenv('AWS_REGION')
+# Points the client at a local S3 stand-in (MinIO, moto server) instead of AWS
+AWS_ENDPOINT_URL = os.getenv('AWS_ENDPOINT_URL')
+
+S3_IO_WORKERS = int(os.getenv('S3_IO_WORKERS', '8'))
+S3_MAX_PENDING_UPLOADS = int(os.getenv('S3_MAX_PENDING_UPLOADS', '32'))
+
+# Objects above the threshold go up as a multipart upload in chunks of this size
+TRANSFER_CONFIG = TransferConfig(multipart_threshold=8 * 1024 * 1024, multipart_chunksize=8 * 1024 * 1024)
+
+_s3_client = None
+_uploader = None
+_ensured_buckets = set()
+
+
+def get_s3_client():
+    # Created on first use; one client (and its connection pool) is shared by every I/O thread
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            's3',
+            region_name=AWS_REGION,
+            endpoint_url=AWS_ENDPOINT_URL,
+            aws_access_key_id=AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+            config=Config(max_pool_connections=S3_IO_WORKERS * 2, retries={'max_attempts': 5, 'mode': 'standard'})
+        )
+    return _s3_client
+
+
+def set_s3_client(client):
+    global _s3_client, _uploader
+    if _uploader:
+        _uploader.close()
+    _s3_client = client
+    _uploader = None
+    _ensured_buckets.clear()
+
 
+class S3Uploader:
+    # Runs the blocking boto3 calls on a dedicated thread pool so the event loop keeps
+    # driving the browser while objects upload. At most `max_pending` uploads are queued or
+    # running; further callers wait for a slot, which throttles producers to S3's pace.
+    def __init__(self, workers=S3_IO_WORKERS, max_pending=S3_MAX_PENDING_UPLOADS):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='s3-io')
+        self.loop = asyncio.get_running_loop()
+        self._slots = asyncio.Semaphore(max_pending)
+        self.uploaded = 0
+        self.uploaded_bytes = 0
 
-# S3 client
-s3_client = boto3.client(
-    's3',
-    region_name=AWS_REGION,
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY
-)
+    async def run(self, func, *args, **kwargs):
+        return await self.loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    async def upload(self, data_stream, bucket_name, file_key, content_type):
+        async with self._slots:
+            await self.run(
+                get_s3_client().upload_fileobj,
+                data_stream,
+                bucket_name,
+                file_key,
+                ExtraArgs={'ContentType': content_type},
+                Config=TRANSFER_CONFIG
+            )
+        self.uploaded += 1
+        self.uploaded_bytes += data_stream.getbuffer().nbytes if hasattr(data_stream, 'getbuffer') else 0
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+
+def get_uploader():
+    global _uploader
+    if _uploader is None or _uploader.loop is not asyncio.get_running_loop():
+        # An uploader left behind by another event loop (a shard process, an earlier asyncio.run)
+        # still owns its I/O threads
+        if _uploader:
+            _uploader.close()
+        _uploader = S3Uploader()
+    return _uploader
+
+
+async def close_uploader():
+    global _uploader
+    if _uploader:
+        uploader, _uploader = _uploader, None
+        await asyncio.get_running_loop().run_in_executor(None, uploader.close)
+        custom_logger(f"S3 uploads: {uploader.uploaded} objects, {uploader.uploaded_bytes} bytes", 'info')
 
 
 @handle_exceptions
 async def create_bucket(bucket_name):
+    kwargs = {'Bucket': bucket_name}
+    if AWS_REGION and AWS_REGION != 'us-east-1':
+        kwargs['CreateBucketConfiguration'] = {'LocationConstraint': AWS_REGION}
     try:
-        s3_client.create_bucket(
-            Bucket=bucket_name,
-            CreateBucketConfiguration={'LocationConstraint': AWS_REGION}
-        )
+        await get_uploader().run(get_s3_client().create_bucket, **kwargs)
         custom_logger(f'Bucket {bucket_name} created successfully.', 'info')
         return bucket_name
     except ClientError as e:
-        if e.response['Error']['Code'] == 'BucketAlreadyOwnedByYou':
+        if e.response['Error']['Code'] in ('BucketAlreadyOwnedByYou', 'BucketAlreadyExists'):
             custom_logger(f'Storage stream to bucket: {bucket_name} open...', 'warn')
             return bucket_name
         else:
@@ -43,32 +124,21 @@ async def create_bucket(bucket_name):
             raise e
 
 
+async def ensure_bucket(bucket_name):
+    # The bucket is created (or found) once per run, not before every upload
+    if bucket_name not in _ensured_buckets:
+        await create_bucket(bucket_name)
+        _ensured_buckets.add(bucket_name)
+    return bucket_name
+
+
 @handle_exceptions
-async def save_stream_to_s3(data_stream, file_key, content_type='application/octet-stream'):
+async def save_stream_to_s3(data_stream, file_key, content_type='application/octet-stream', bucket_name=None):
+    bucket_name = bucket_name or AWS_BUCKET_NAME
     try:
-        # Ensure the bucket exists
-        await create_bucket(AWS_BUCKET_NAME)
-
-        # Define the upload coroutine
-        async def upload_file():
-            emulator(is_in_progress=True)
-            try:
-                s3_client.upload_fileobj(
-                    data_stream,
-                    AWS_BUCKET_NAME,
-                    file_key,
-                    ExtraArgs={'ContentType': content_type}
-                )
-                emulator(is_in_progress=False)
-                custom_logger(f'File {file_key} uploaded successfully to {AWS_BUCKET_NAME}.', 'info')
-            except ClientError as e:
-                custom_logger(f'Error uploading file: {e}', 'error')
-                emulator(is_in_progress=False)
-                raise e
-
-        # Run the upload coroutine and await its completion
-        await upload_file()
-
+        await ensure_bucket(bucket_name)
+        await get_uploader().upload(data_stream, bucket_name, file_key, content_type)
+        custom_logger(f'File {file_key} uploaded successfully to {bucket_name}.', 'info')
     except Exception as e:
         custom_logger(f'Failed to save stream to S3: {e}', 'error')
-        raise e
\ No newline at end of file
+        raise e
@@ -0,0 +1,53 @@
+import io
+import threading
+import time
+from botocore.exceptions import ClientError
+
+
+class InMemoryS3:
+    # In-process stand-in for the boto3 S3 client calls the storage layer makes. Uploads sleep
+    # for `latency` seconds plus size / `bandwidth` (bytes per second) to model the network,
+    # the first `fail` uploads raise SlowDown, and concurrent uploads are counted. Install it
+    # with storage_hundler.set_s3_client().
+    def __init__(self, latency=0.0, bandwidth=None, bucket_exists=False, fail=0):
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.bucket_exists = bucket_exists
+        self.fail = fail
+        self.buckets = []
+        self.objects = {}
+        self.uploaded_bytes = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def create_bucket(self, Bucket, **kwargs):
+        self.buckets.append(Bucket)
+        if self.bucket_exists:
+            raise ClientError({'Error': {'Code': 'BucketAlreadyOwnedByYou'}}, 'CreateBucket')
+
+    def upload_fileobj(self, data_stream, bucket, key, ExtraArgs=None, Config=None):
+        with self._lock:
+            if self.fail:
+                self.fail -= 1
+                raise ClientError({'Error': {'Code': 'SlowDown'}}, 'PutObject')
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            data = data_stream.read()
+            time.sleep(self.latency + (len(data) / self.bandwidth if self.bandwidth else 0))
+            with self._lock:
+                self.objects[(bucket, key)] = (data, (ExtraArgs or {}).get('ContentType'))
+                self.uploaded_bytes += len(data)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def get_object(self, Bucket, Key):
+        data, content_type = self.objects[(Bucket, Key)]
+        return {'Body': io.BytesIO(data), 'ContentType': content_type, 'ContentLength': len(data)}
+
+    def list_objects_v2(self, Bucket, Prefix=''):
+        contents = [{'Key': key, 'Size': len(data)} for (bucket, key), (data, _) in sorted(self.objects.items())
+                    if bucket == Bucket and key.startswith(Prefix)]
+        return {'Contents': contents, 'KeyCount': len(contents)}
@@ -0,0 +1,44 @@
+import json
+import os
+from pathlib import Path
+
+
+class JsonlAppendLog:
+    # Append-only JSON Lines file behind the progress journal, the dedupe sidecars and the HTML
+    # archive index. read() yields each parsed line; append() writes each value as one line in a
+    # single O_APPEND write, so appends from concurrent shard processes stay intact.
+    def __init__(self, path):
+        self.path = Path(path)
+        self._fd = None
+        self._torn_tail = False
+
+    def exists(self):
+        return self.path.exists()
+
+    def read(self):
+        if not self.path.exists():
+            return
+        with self.path.open('r', encoding='utf-8') as lines:
+            for line in lines:
+                self._torn_tail = not line.endswith("\n")
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash can leave a half-written last line behind
+                    continue
+
+    def append(self, value):
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        line = json.dumps(value) + "\n"
+        if self._torn_tail:
+            # Start after a torn last line rather than on the end of it
+            line = "\n" + line
+            self._torn_tail = False
+        os.write(self._fd, line.encode('utf-8'))
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,53 @@
+from pathlib import Path
+from src.utils.task_utils.append_log import JsonlAppendLog
+from src.utils.logger.logger import custom_logger
+
+DONE = "done"
+FAILED = "failed"
+
+
+class ProgressJournal:
+    # Append-only JSONL journal keyed by (source file, url). The last line for a key wins, so
+    # restarts and reruns can skip profiles that are already saved and give failed ones a
+    # bounded number of further attempts.
+    def __init__(self, path, max_attempts=3):
+        self.path = Path(path)
+        self.max_attempts = max_attempts
+        self.entries = {}
+        self._log = JsonlAppendLog(self.path)
+        self._load()
+
+    def _load(self):
+        if not self._log.exists():
+            return
+        for entry in self._log.read():
+            self.entries[(entry['source'], entry['url'])] = entry
+        custom_logger(f"Loaded {len(self.entries)} journal entries from {self.path.name}", log_type="info")
+
+    def _append(self, entry):
+        self._log.append(entry)
+        self.entries[(entry['source'], entry['url'])] = entry
+
+    def state(self, source, url):
+        entry = self.entries.get((source, url))
+        return entry['state'] if entry else None
+
+    def attempts(self, source, url):
+        entry = self.entries.get((source, url))
+        return entry['attempts'] if entry else 0
+
+    def is_done(self, source, url):
+        return self.state(source, url) == DONE
+
+    def pending(self, endpoints):
+        return [(source, url) for source, url in endpoints
+                if not self.is_done(source, url) and self.attempts(source, url) < self.max_attempts]
+
+    def mark_done(self, source, url):
+        self._append({'source': source, 'url': url, 'state': DONE, 'attempts': self.attempts(source, url) + 1})
+
+    def mark_failed(self, source, url):
+        self._append({'source': source, 'url': url, 'state': FAILED, 'attempts': self.attempts(source, url) + 1})
+
+    def close(self):
+        self._log.close()
@@ -0,0 +1,83 @@
+import csv
+from pathlib import Path
+from src.utils.task_utils.append_log import JsonlAppendLog
+from src.utils.logger.logger import custom_logger
+
+
+def contact_key(record):
+    return record.get('email') or record.get('phone') or record.get('business_name')
+
+
+def sidecar_path(output_file):
+    output_file = Path(output_file)
+    return output_file.with_name(output_file.stem + ".keys.jsonl")
+
+
+class DedupeIndex:
+    # Keys of the rows already in an output file, held in memory and mirrored to an
+    # append-only sidecar (one JSON string per line) so a restart does not rescan the output.
+    # Without a sidecar the index is rebuilt once from `source`; a sidecar whose source has
+    # gone missing or empty is stale and is discarded.
+    def __init__(self, path, source=None, key=contact_key):
+        self.path = Path(path)
+        self.source = Path(source) if source else None
+        self.key = key
+        self.keys = set()
+        self._reserved = set()
+        self._log = JsonlAppendLog(self.path)
+        self._load()
+
+    def _source_has_rows(self):
+        if self.source is None or not self.source.exists():
+            return False
+        # Header plus at least one row; only the first two lines are read
+        with self.source.open('r', newline='', encoding='utf-8') as output:
+            return bool(output.readline() and output.readline())
+
+    def _load(self):
+        if self.path.exists() and self.source is not None and not self._source_has_rows():
+            self.path.unlink()
+        if self._log.exists():
+            self.keys.update(self._log.read())
+            custom_logger(f"Loaded {len(self.keys)} dedupe keys from {self.path.name}", log_type="info")
+        elif self._source_has_rows():
+            self._rebuild()
+
+    def _rebuild(self):
+        with self.source.open('r', newline='', encoding='utf-8') as output:
+            keys = {key for key in map(self.key, csv.DictReader(output)) if key}
+        for key in keys:
+            self._append(key)
+        self.keys = keys
+        custom_logger(f"Rebuilt {len(keys)} dedupe keys from {self.source.name}", log_type="info")
+
+    def _append(self, key):
+        self._log.append(key)
+
+    def __contains__(self, key):
+        return key in self.keys or key in self._reserved
+
+    def __len__(self):
+        return len(self.keys)
+
+    def reserve(self, key):
+        # Claims a key while its row is being written, so a concurrent save of the same key is
+        # seen as a duplicate; add() commits it, release() gives it back if the write failed
+        if key in self:
+            return False
+        self._reserved.add(key)
+        return True
+
+    def release(self, key):
+        self._reserved.discard(key)
+
+    def add(self, key):
+        self._reserved.discard(key)
+        if key in self.keys:
+            return False
+        self._append(key)
+        self.keys.add(key)
+        return True
+
+    def close(self):
+        self._log.close()
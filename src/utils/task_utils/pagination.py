@@ -0,0 +1,29 @@
+from src.utils.page_pool import PagePool
+from src.utils.task_utils.work_queue import run_worker_pool
+from src.utils.logger.logger import custom_logger
+
+
+async def collect_listing_pages(context, urls, process_url, concurrency=4, headers=None):
+    # Walks listing pages on `concurrency` pooled pages at once; pacing comes from the domain
+    # rate controller consulted by `process_url`, which also keeps its own per-page retries.
+    # Results are assembled back in listing order.
+    pool = await PagePool(context, size=max(1, min(concurrency, len(urls))), headers=headers).start()
+
+    async def handle(url):
+        custom_logger(f"Processing URL: {url}", log_type="info")
+        async with pool.lease() as page:
+            endpoints = await process_url(page, url)
+        return endpoints or []
+
+    try:
+        results = await run_worker_pool(urls, handle, concurrency=concurrency)
+    finally:
+        await pool.close()
+
+    all_endpoints = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            custom_logger(f"Failed to collect listing page {url}: {result}", log_type="warn")
+            continue
+        all_endpoints.extend(result)
+    return all_endpoints
@@ -0,0 +1,165 @@
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from ochestrator.ochestrator import load_configs
+from src.utils.logger.logger import custom_logger
+
+THROTTLE_STATUSES = {403, 429, 503}
+BLOCK_MARKERS = ("_Incapsula_Resource", "Request unsuccessful. Incapsula", "captcha-delivery", "/captcha")
+
+DEFAULT_SETTINGS = {
+    "initial_limit": 4,
+    "min_limit": 1,
+    "max_limit": 8,
+    "initial_interval": 0.5,
+    "min_interval": 0.1,
+    "max_interval": 10.0,
+    "decrease_factor": 0.5,
+    "latency_ceiling": 15.0
+}
+
+
+def looks_blocked(text):
+    return bool(text) and any(marker in text for marker in BLOCK_MARKERS)
+
+
+class RequestOutcome:
+    def __init__(self):
+        self.status = None
+        self.blocked = False
+
+
+class DomainRateController:
+    # AIMD control per domain: every window of clean responses adds one in-flight slot and
+    # shortens the gap between request starts; a 403/429/503, a captcha page or a timeout
+    # halves the slots and doubles the gap.
+    def __init__(self, domain, initial_limit=4, min_limit=1, max_limit=8, initial_interval=0.5,
+                 min_interval=0.1, max_interval=10.0, decrease_factor=0.5, latency_ceiling=15.0):
+        self.domain = domain
+        self.limit = max(min_limit, min(initial_limit, max_limit))
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.decrease_factor = decrease_factor
+        self.latency_ceiling = latency_ceiling
+        self.in_flight = 0
+        self.latency = None
+        self.successes = 0
+        self.throttles = 0
+        self._successes_in_window = 0
+        self._last_decrease = 0.0
+        self._next_start = 0.0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            now = time.monotonic()
+            wait = self._next_start - now
+            # A little jitter keeps the request starts from looking machine-timed
+            self._next_start = max(now, self._next_start) + self.interval * random.uniform(0.75, 1.25)
+        if wait > 0:
+            try:
+                await asyncio.sleep(wait)
+            except BaseException:
+                # A cancelled wait (a task timeout) gives the slot back; request() only owns it
+                # once acquire() has returned
+                await self.release()
+                raise
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self, latency):
+        self.successes += 1
+        self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+        if self.latency > self.latency_ceiling:
+            return
+        self._successes_in_window += 1
+        if self._successes_in_window >= self.limit:
+            self._successes_in_window = 0
+            self.limit = min(self.max_limit, self.limit + 1)
+            self.interval = max(self.min_interval, self.interval * 0.8)
+
+    def on_throttle(self, reason):
+        self.throttles += 1
+        self._successes_in_window = 0
+        now = time.monotonic()
+        # Requests already in flight fail together; count that burst as one signal
+        if now - self._last_decrease < max(1.0, self.latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, int(self.limit * self.decrease_factor))
+        self.interval = min(self.max_interval, max(self.interval * 2, 1.0))
+        custom_logger(f"{self.domain} throttling ({reason}): limit {self.limit}, "
+                      f"interval {self.interval:.2f}s", log_type="warn")
+
+    def on_outcome(self, outcome, latency):
+        if outcome.blocked:
+            self.on_throttle("captcha")
+        elif outcome.status in THROTTLE_STATUSES:
+            self.on_throttle(f"status {outcome.status}")
+        else:
+            self.on_success(latency)
+
+    @asynccontextmanager
+    async def request(self):
+        await self.acquire()
+        started = time.monotonic()
+        outcome = RequestOutcome()
+        try:
+            yield outcome
+        except (asyncio.TimeoutError, PlaywrightTimeoutError):
+            self.on_throttle("timeout")
+            raise
+        else:
+            self.on_outcome(outcome, time.monotonic() - started)
+        finally:
+            await self.release()
+
+    def summary(self):
+        latency = f"{self.latency:.2f}s" if self.latency is not None else "n/a"
+        return (f"{self.domain}: limit {self.limit}, interval {self.interval:.2f}s, latency {latency}, "
+                f"successes {self.successes}, throttles {self.throttles}")
+
+
+_controllers = {}
+_settings = None
+
+
+def rate_control_settings(domain):
+    global _settings
+    if _settings is None:
+        configs = load_configs() or {}
+        _settings = configs.get('rate_control') or {}
+    settings = dict(DEFAULT_SETTINGS)
+    settings.update(_settings.get('default') or {})
+    settings.update(_settings.get(domain) or {})
+    return settings
+
+
+def get_rate_controller(url):
+    domain = urlparse(url).hostname or url
+    if domain not in _controllers:
+        _controllers[domain] = DomainRateController(domain, **rate_control_settings(domain))
+    return _controllers[domain]
+
+
+def rate_control_summary():
+    return "\n".join(controller.summary() for controller in _controllers.values())
+
+
+async def controlled_goto(page, url, **kwargs):
+    async with get_rate_controller(url).request() as outcome:
+        response = await page.goto(url, **kwargs)
+        outcome.status = response.status if response else None
+        outcome.blocked = looks_blocked(page.url)
+    return response
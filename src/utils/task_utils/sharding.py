@@ -0,0 +1,116 @@
+import asyncio
+import csv
+import multiprocessing
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from src.utils.task_utils.dedupe import DedupeIndex, sidecar_path
+from src.utils.logger.logger import custom_logger, initialize_logging
+
+initialize_logging()
+
+
+def shard_for(url, shards):
+    # crc32 is stable across processes and runs, unlike hash() with PYTHONHASHSEED
+    return zlib.crc32(url.encode('utf-8')) % shards
+
+
+def partition_endpoints(endpoints, shards):
+    partitions = [[] for _ in range(shards)]
+    for filename, url in endpoints:
+        partitions[shard_for(url, shards)].append((filename, url))
+    return partitions
+
+
+def shard_suffix(shard_index):
+    return f".shard{shard_index}"
+
+
+def run_shard(processor_cls, method_name, shard_index, endpoints, init_kwargs, run_kwargs):
+    # Runs inside a worker process: own event loop, own browser, own output shard
+    initialize_logging()
+    processor = processor_cls(**init_kwargs)
+    processor.shard_suffix = shard_suffix(shard_index)
+    asyncio.run(getattr(processor, method_name)(endpoints, **run_kwargs))
+    return shard_index, processor.success_count
+
+
+def merge_shard_outputs(data_dir, shards, dedupe_key=None):
+    # With a dedupe_key, rows are checked against the target's own key index, the same one a
+    # single-process run keeps, so keys already merged or written earlier are not appended again
+    merged_files = set()
+    for shard_index in range(shards):
+        suffix = shard_suffix(shard_index)
+        for shard_file in sorted(data_dir.glob(f"*{suffix}_profile_data.csv")):
+            target = data_dir / shard_file.name.replace(suffix, "")
+            with shard_file.open('r', newline='', encoding='utf-8') as source:
+                reader = csv.DictReader(source)
+                rows = list(reader)
+                fieldnames = reader.fieldnames or []
+
+            write_header = not target.exists() or target.stat().st_size == 0
+            if not write_header:
+                with target.open('r', newline='', encoding='utf-8') as existing:
+                    fieldnames = next(csv.reader(existing), fieldnames)
+
+            index = None
+            if dedupe_key is not None:
+                index = DedupeIndex(sidecar_path(target), source=target, key=dedupe_key)
+                keys = set()
+                unique_rows = []
+                for row in rows:
+                    key = dedupe_key(row)
+                    if key and key not in index and key not in keys:
+                        keys.add(key)
+                        unique_rows.append(row)
+                if len(unique_rows) < len(rows):
+                    custom_logger(f"Dropped {len(rows) - len(unique_rows)} duplicate rows merging {shard_file.name}",
+                                  log_type="info")
+                rows = unique_rows
+
+            with target.open('a', newline='', encoding='utf-8') as out:
+                writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction='ignore')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(rows)
+
+            if index is not None:
+                # Keys are committed once their rows are in the target
+                for row in rows:
+                    index.add(dedupe_key(row))
+                index.close()
+
+            shard_file.unlink()
+            sidecar_path(shard_file).unlink(missing_ok=True)
+            merged_files.add(target)
+    return sorted(merged_files)
+
+
+async def run_sharded(processor_cls, method_name, endpoints, shards, data_dir, init_kwargs=None, run_kwargs=None,
+                      dedupe_key=None):
+    partitions = partition_endpoints(endpoints, shards)
+    custom_logger(f"Sharding {len(endpoints)} endpoints over {shards} processes: "
+                  f"{[len(p) for p in partitions]}", log_type="info")
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=shards, mp_context=multiprocessing.get_context('spawn')) as executor:
+        futures = [
+            loop.run_in_executor(executor, run_shard, processor_cls, method_name, index, partition,
+                                 init_kwargs or {}, run_kwargs or {})
+            for index, partition in enumerate(partitions) if partition
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    success_count = 0
+    for result in results:
+        if isinstance(result, Exception):
+            custom_logger(f"Shard failed: {result}", log_type="error")
+            continue
+        shard_index, shard_count = result
+        custom_logger(f"Shard {shard_index} saved {shard_count} profiles.", log_type="info")
+        success_count += shard_count
+
+    merged_files = merge_shard_outputs(data_dir, shards, dedupe_key)
+    for merged in merged_files:
+        custom_logger(f"Merged shard outputs into {merged}", log_type="info")
+
+    return success_count
@@ -0,0 +1,41 @@
+import asyncio
+from src.utils.logger.logger import custom_logger
+
+
+async def run_worker_pool(items, handler, concurrency=4, task_timeout=None):
+    # N long-lived workers pull from a shared queue, so a slow item only occupies its own
+    # slot instead of stalling a whole batch. Results keep the order of `items`; failed or
+    # timed-out items yield their exception, like asyncio.gather(return_exceptions=True).
+    queue = asyncio.Queue()
+    for index, item in enumerate(items):
+        queue.put_nowait((index, item))
+
+    results = [None] * len(items)
+
+    async def worker():
+        while True:
+            try:
+                index, item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                if task_timeout:
+                    results[index] = await asyncio.wait_for(handler(item), timeout=task_timeout)
+                else:
+                    results[index] = await handler(item)
+            except asyncio.TimeoutError as e:
+                custom_logger(f"Task timed out after {task_timeout}s: {item}", log_type="warn")
+                results[index] = e
+            except Exception as e:
+                results[index] = e
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, min(concurrency, len(items))))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+
+    return results
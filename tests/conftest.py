@@ -0,0 +1,22 @@
+import pytest
+
+
+class FakeUpload:
+    # Stands in for save_stream_to_s3 in the sink tests: keeps each stored object's bytes and
+    # content type by key, and the first `fail` uploads raise.
+    def __init__(self, fail=0):
+        self.objects = {}
+        self.content_types = {}
+        self.fail = fail
+
+    async def __call__(self, data_stream, file_key, content_type='application/octet-stream'):
+        if self.fail:
+            self.fail -= 1
+            raise RuntimeError("S3 unavailable")
+        self.objects[file_key] = data_stream.getvalue()
+        self.content_types[file_key] = content_type
+
+
+@pytest.fixture
+def upload():
+    return FakeUpload()
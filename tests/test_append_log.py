@@ -0,0 +1,13 @@
+from src.utils.task_utils.append_log import JsonlAppendLog
+
+
+def test_torn_last_line_is_skipped_and_not_appended_to(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_text('{"a": 1}\n{"a": 2', encoding='utf-8')
+
+    log = JsonlAppendLog(path)
+    assert list(log.read()) == [{"a": 1}]
+    log.append({"a": 3})
+    log.close()
+
+    assert list(JsonlAppendLog(path).read()) == [{"a": 1}, {"a": 3}]
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.utils.browser_session import BrowserSession, browser_context
+
+
+def make_playwright():
+    def launch(**kwargs):
+        browser = MagicMock()
+        browser.is_connected.return_value = True
+        browser.new_context = AsyncMock(return_value=MagicMock(route=AsyncMock()))
+        browser.close = AsyncMock()
+        return browser
+
+    playwright = MagicMock()
+    playwright.chromium.launch = AsyncMock(side_effect=lambda **kwargs: launch(**kwargs))
+    playwright.stop = AsyncMock()
+    return playwright
+
+
+@pytest.mark.asyncio
+async def test_stages_share_the_session_context():
+    session = BrowserSession()
+    session.playwright = make_playwright()
+    await session.ensure_started()
+    shared = session.context
+
+    async with browser_context(session, extra_http_headers={"a": "b"}) as first:
+        pass
+    async with browser_context(session) as second:
+        pass
+
+    assert first.context is shared and second is shared
+    assert session.playwright.chromium.launch.await_count == 1
+    session.browser.close.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stage_options_are_applied_to_shared_context_pages():
+    session = BrowserSession()
+    session.playwright = make_playwright()
+    await session.ensure_started()
+    page = MagicMock(set_extra_http_headers=AsyncMock())
+    session.context.new_page = AsyncMock(return_value=page)
+
+    async with browser_context(session, user_agent="UA", extra_http_headers={"a": "b"}) as context:
+        assert await context.new_page() is page
+
+    page.set_extra_http_headers.assert_awaited_once_with({"a": "b", "user-agent": "UA"})
+    with pytest.raises(TypeError):
+        async with browser_context(session, locale="es-ES"):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_dead_browser_is_relaunched():
+    session = BrowserSession()
+    session.playwright = make_playwright()
+    await session.ensure_started()
+    first_browser = session.browser
+
+    first_browser.is_connected.return_value = False
+    await session.ensure_started()
+
+    assert session.browser is not first_browser
+    assert session.playwright.chromium.launch.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_close_tears_down_once():
+    session = BrowserSession()
+    playwright = make_playwright()
+    session.playwright = playwright
+    await session.ensure_started()
+    browser = session.browser
+
+    await session.close()
+
+    browser.close.assert_awaited_once()
+    playwright.stop.assert_awaited_once()
+    assert session.browser is None and session.context is None
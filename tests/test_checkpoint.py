@@ -0,0 +1,115 @@
+import asyncio
+import csv
+import contextlib
+import pytest
+from unittest.mock import MagicMock
+from src.spiders import profiler_spider
+from src.spiders.es import es_profiles
+from src.utils.storage import csv_sink
+from src.utils.task_utils.checkpoint import ProgressJournal, DONE, FAILED
+
+
+def test_journal_resumes_from_disk(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    journal = ProgressJournal(path)
+    journal.mark_done("kw", "https://example.com/1")
+    journal.mark_failed("kw", "https://example.com/2")
+    journal.close()
+
+    resumed = ProgressJournal(path)
+    assert resumed.state("kw", "https://example.com/1") == DONE
+    assert resumed.state("kw", "https://example.com/2") == FAILED
+    assert resumed.attempts("kw", "https://example.com/2") == 1
+
+
+def test_pending_skips_done_and_exhausted(tmp_path):
+    journal = ProgressJournal(tmp_path / "progress.jsonl", max_attempts=2)
+    endpoints = [("kw", f"https://example.com/{i}") for i in range(4)]
+    journal.mark_done("kw", "https://example.com/0")
+    journal.mark_failed("kw", "https://example.com/1")
+    journal.mark_failed("kw", "https://example.com/2")
+    journal.mark_failed("kw", "https://example.com/2")
+
+    assert journal.pending(endpoints) == [("kw", "https://example.com/1"), ("kw", "https://example.com/3")]
+    journal.close()
+
+
+def test_truncated_last_line_is_ignored(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    journal = ProgressJournal(path)
+    journal.mark_done("kw", "https://example.com/1")
+    journal.close()
+    with path.open('a', encoding='utf-8') as f:
+        f.write('{"source": "kw", "url": "https://exa')
+
+    resumed = ProgressJournal(path)
+    assert resumed.is_done("kw", "https://example.com/1")
+    assert len(resumed.entries) == 1
+    resumed.mark_done("kw", "https://example.com/2")
+    resumed.close()
+
+    assert ProgressJournal(path).is_done("kw", "https://example.com/2")
+
+
+class FakePool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    async def start(self):
+        return self
+
+    async def close(self):
+        pass
+
+
+@contextlib.asynccontextmanager
+async def fake_browser_context(session, **kwargs):
+    yield MagicMock()
+
+
+async def fake_fetch_and_parse(url, *args):
+    return {'uuid': url, 'crawled_url': url, 'email': f"{url}@example.com"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("module, processor_cls, method", [
+    (profiler_spider, profiler_spider.MainProfileProcessor, 'process_product_endpoints'),
+    (es_profiles, es_profiles.EsMainProfileProcessor, 'es_process_product_endpoints'),
+])
+async def test_retry_after_mid_batch_failure_writes_each_profile_once(tmp_path, monkeypatch, module, processor_cls,
+                                                                      method):
+    real_run_worker_pool = module.run_worker_pool
+    real_sleep = asyncio.sleep
+    calls = []
+
+    async def crash_after_two(items, handler, **kwargs):
+        # The first attempt saves two profiles into the sink buffer, then the browser goes away
+        calls.append(len(items))
+        if len(calls) == 1:
+            for item in items[:2]:
+                await handler(item)
+            raise RuntimeError("browser crashed")
+        return await real_run_worker_pool(items, handler, **kwargs)
+
+    async def no_wait(delay, *args, **kwargs):
+        await real_sleep(0 if delay == 5 else delay)
+
+    monkeypatch.setattr(module, "browser_context", fake_browser_context)
+    monkeypatch.setattr(module, "PagePool", FakePool)
+    monkeypatch.setattr(module, "fetch_and_parse", fake_fetch_and_parse)
+    monkeypatch.setattr(module, "run_worker_pool", crash_after_two)
+    monkeypatch.setattr(module, "open_html_archive", lambda name: None)
+    monkeypatch.setattr(module.asyncio, "sleep", no_wait)
+    monkeypatch.setattr(csv_sink, "csv_sink_settings", lambda: {"flush_rows": 100, "flush_interval": 60.0})
+
+    processor = processor_cls(save_to_local=True, parse_workers=0)
+    processor.data_dir = tmp_path
+    processor.journal = ProgressJournal(tmp_path / "progress.jsonl")
+    endpoints = [("kw", f"https://example.com/{i}") for i in range(4)]
+
+    assert await getattr(processor, method)(endpoints, save_to_s3=False, save_to_local=True)
+
+    with (tmp_path / "kw_profile_data.csv").open(newline='', encoding='utf-8') as output:
+        urls = [row['crawled_url'] for row in csv.DictReader(output)]
+    assert sorted(urls) == [url for _, url in endpoints]
+    assert calls == [4, 2]
@@ -0,0 +1,59 @@
+import asyncio
+import csv
+import pytest
+from src.utils.storage.csv_sink import CsvSink
+
+
+def read_rows(path):
+    with path.open(newline='', encoding='utf-8') as output:
+        return list(csv.reader(output))
+
+
+@pytest.mark.asyncio
+async def test_rows_are_flushed_by_count_and_on_close(tmp_path):
+    path = tmp_path / "kw_profile_data.csv"
+    written = []
+    sink = CsvSink(path, ['uuid', 'phone'], flush_rows=2, flush_interval=60, on_written=written.extend)
+
+    for i in range(3):
+        await sink.write({'uuid': str(i), 'phone': "06"}, key=("kw", f"url-{i}"))
+    assert read_rows(path) == [['uuid', 'phone'], ['0', '06'], ['1', '06']]
+    assert written == [("kw", "url-0"), ("kw", "url-1")]
+
+    await sink.close()
+    assert read_rows(path)[-1] == ['2', '06']
+    assert written == [("kw", f"url-{i}") for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_flushed_on_interval(tmp_path):
+    path = tmp_path / "kw_profile_data.csv"
+    sink = CsvSink(path, ['uuid'], flush_rows=100, flush_interval=0.1)
+
+    await sink.write({'uuid': "1"})
+    await asyncio.sleep(0.3)
+    assert read_rows(path) == [['uuid'], ['1']]
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_extra_fields_do_not_shift_columns(tmp_path):
+    path = tmp_path / "kw_profile_data.csv"
+    sink = CsvSink(path, ['uuid', 'phone'], flush_interval=60)
+
+    await sink.write({'uuid': "1", 'extra': "x", 'phone': "06"})
+    await sink.close()
+
+    assert read_rows(path) == [['uuid', 'phone'], ['1', '06']]
+
+
+@pytest.mark.asyncio
+async def test_existing_file_keeps_its_header(tmp_path):
+    path = tmp_path / "kw_profile_data.csv"
+    path.write_text("phone,uuid\r\n06,0\r\n", encoding='utf-8')
+    sink = CsvSink(path, ['uuid', 'phone'], flush_interval=60)
+
+    await sink.write({'uuid': "1", 'phone': "07"})
+    await sink.close()
+
+    assert read_rows(path) == [['phone', 'uuid'], ['06', '0'], ['07', '1']]
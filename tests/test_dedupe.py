@@ -0,0 +1,78 @@
+import asyncio
+import csv
+import pytest
+from src.utils.task_utils.dedupe import DedupeIndex, contact_key
+from src.spiders.es.es_profiles import EsMainProfileProcessor
+
+
+def write_rows(path, rows):
+    with path.open('w', newline='', encoding='utf-8') as output:
+        writer = csv.DictWriter(output, fieldnames=['email', 'phone'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def test_contact_key_falls_back_from_email_to_phone_to_name():
+    assert contact_key({'email': "a@b.es", 'phone': "1"}) == "a@b.es"
+    assert contact_key({'email': "", 'phone': "1"}) == "1"
+    assert contact_key({'business_name': "Garcia"}) == "Garcia"
+    assert contact_key({}) is None
+
+
+def test_keys_survive_a_restart(tmp_path):
+    source = tmp_path / "kw_profile_data.csv"
+    write_rows(source, [{'email': "a@b.es"}])
+    index = DedupeIndex(tmp_path / "kw.keys.jsonl", source=source)
+    assert index.add("c@d.es")
+    assert not index.add("c@d.es")
+    index.close()
+
+    resumed = DedupeIndex(tmp_path / "kw.keys.jsonl", source=source)
+    assert "a@b.es" in resumed and "c@d.es" in resumed
+    assert len(resumed) == 2
+
+
+def test_index_is_rebuilt_from_existing_output(tmp_path):
+    source = tmp_path / "kw_profile_data.csv"
+    write_rows(source, [{'email': "a@b.es"}, {'email': "", 'phone': "912"}, {'email': "", 'phone': ""}])
+
+    index = DedupeIndex(tmp_path / "kw.keys.jsonl", source=source)
+    assert index.keys == {"a@b.es", "912"}
+    index.close()
+    assert (tmp_path / "kw.keys.jsonl").read_text(encoding='utf-8').count("\n") == 2
+
+
+def test_sidecar_of_an_emptied_output_is_discarded(tmp_path):
+    source = tmp_path / "kw_profile_data.csv"
+    write_rows(source, [{'email': "a@b.es"}])
+    DedupeIndex(tmp_path / "kw.keys.jsonl", source=source).close()
+    write_rows(source, [])
+
+    assert len(DedupeIndex(tmp_path / "kw.keys.jsonl", source=source)) == 0
+
+
+def test_reserved_key_counts_until_released(tmp_path):
+    index = DedupeIndex(tmp_path / "kw.keys.jsonl")
+    assert index.reserve("a@b.es")
+    assert not index.reserve("a@b.es")
+    index.release("a@b.es")
+    assert index.reserve("a@b.es")
+    assert index.add("a@b.es")
+    assert "a@b.es" in index
+
+
+@pytest.mark.asyncio
+async def test_es_save_to_local_appends_each_key_once(tmp_path):
+    processor = EsMainProfileProcessor()
+    processor.data_dir = tmp_path
+    records = [{'uuid': str(i), 'email': f"{i % 3}@b.es", 'phone': "912"} for i in range(6)]
+
+    await asyncio.gather(*(processor.es_save_to_local("abogado", record) for record in records))
+    await processor.close_sinks()
+    processor.close_dedupe_indexes()
+
+    with (tmp_path / "abogado_profile_data.csv").open(newline='', encoding='utf-8') as output:
+        rows = list(csv.DictReader(output))
+    assert [row['uuid'] for row in rows] == ["0", "1", "2"]
+    assert processor.success_count == 3
+    assert (tmp_path / "abogado_profile_data.keys.jsonl").exists()
@@ -0,0 +1,60 @@
+from pathlib import Path
+from bs4 import BeautifulSoup
+from src.utils.parsers.es_parse_profile import es_extract_profile_data, extract_embedded_fields
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def embedded(html):
+    return extract_embedded_fields(BeautifulSoup(html, 'html.parser'), html)
+
+
+def test_fixture_fields_come_from_the_data_script():
+    record = es_extract_profile_data((FIXTURES / 'es_profile.html').read_text(encoding='utf-8'))
+
+    assert record['profession'] == 'abogados'
+    assert record['email'] == 'contacto@garcia-abogados.es'
+    assert record['latitude'] == '40.4189'
+    assert record['longitude'] == '-3.6953'
+
+
+def test_embedded_json_is_decoded():
+    html = '<script>var utag_data = {"ficha": {"activity": "fontaneros", "phone": "600111222"}, "latitude": ""};</script>'
+
+    assert embedded(html) == {'activity': 'fontaneros', 'phone': '600111222'}
+
+
+def test_escaped_values_are_kept_as_written():
+    html = ('<script>var utag_data = {"adWebEstablecimiento": "https:\\/\\/www.example.es\\/", '
+            '"businessAddress": "Calle Pe\\u00f1a 1"};</script>')
+
+    assert embedded(html) == {'adWebEstablecimiento': 'https:\\/\\/www.example.es\\/',
+                              'businessAddress': 'Calle Pe\\u00f1a 1'}
+    # The values the regex fallback would read from the same document
+    assert embedded(html.replace('": "', '":"').replace('{', '(')) == embedded(html)
+
+
+def test_data_script_wins_over_later_occurrences():
+    html = ('<script>var utag_data = {"phone": "600111222"};</script>'
+            '<div data-x=\'{"phone":"699999999","customerMail":"a@b.es"}\'></div>')
+
+    assert embedded(html) == {'phone': '600111222', 'customerMail': 'a@b.es'}
+
+
+def test_regex_fallback_when_script_is_not_json():
+    html = ('<script>track({activity: 1, "activity":"dentistas"});</script>'
+            '<div data-x=\'{"customerMail":"a@b.es"}\'></div>'
+            '<script>var late = {"activity":"otro"};</script>')
+
+    assert embedded(html) == {'activity': 'dentistas', 'customerMail': 'a@b.es'}
+
+
+def test_missing_embedded_fields_default_to_unavailable():
+    html = (FIXTURES / 'es_profile.html').read_text(encoding='utf-8')
+    start = html.index('<script type="text/javascript">')
+    end = html.index('</script>', start) + len('</script>')
+    record = es_extract_profile_data(html[:start] + html[end:])
+
+    assert record['latitude'] == 'unavailable'
+    assert record['email'] == 'unavailable'
+    assert record['profession'] == 'otro'
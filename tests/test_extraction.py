@@ -0,0 +1,60 @@
+import json
+from pathlib import Path
+import pytest
+from bs4 import BeautifulSoup
+from src.utils.parsers.extraction import ExtractionSpec, FieldSpec, selector_hints
+from src.utils.parsers.parse_profile import extract_profile_data
+from src.utils.parsers.es_parse_profile import es_extract_profile_data
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+HTML = """
+<div class="card" id="first"><h2>Outside</h2></div>
+<section class="main">
+  <h2> Inside </h2>
+  <a class="link" href="/a">A</a><a class="link" href="">B</a><a class="link" href="/c">C</a>
+  <meta name="summary" content="from meta">
+</section>
+"""
+
+
+def test_selector_hints():
+    assert selector_hints('div.bloque-central .central div[itemscope]') == [('div', None, frozenset())]
+    assert selector_hints('div#profile .lg\\:grid-cols-11') == [(None, None, frozenset({'lg:grid-cols-11'}))]
+    assert selector_hints('a[href="x, y"], div > #toggle.box.open') == [
+        ('a', None, frozenset()), (None, 'toggle', frozenset({'box', 'open'}))
+    ]
+
+
+def test_spec_scopes_fallbacks_and_many():
+    spec = ExtractionSpec([
+        FieldSpec('main', 'section.main', element=True, required="Main"),
+        FieldSpec('heading', 'h2', within='main'),
+        FieldSpec('links', 'a.link', attr='href', many=True),
+        FieldSpec('summary', 'p.summary', fallback=('summary_meta',)),
+        FieldSpec('summary_meta', 'meta[name="summary"]', attr='content'),
+        FieldSpec('card_id', 'div.card', attr='id', regex=r'fi(\w+)')
+    ])
+
+    values = spec.extract(BeautifulSoup(HTML, 'html.parser'))
+
+    assert values['heading'] == 'Inside'
+    assert values['links'] == ['/a', '/c']
+    assert values['summary'] == 'from meta'
+    assert values['card_id'] == 'rst'
+
+
+def test_spec_required_field():
+    spec = ExtractionSpec([FieldSpec('main', 'article', element=True, required="Main container")])
+
+    with pytest.raises(ValueError, match="Main container not found"):
+        spec.extract(BeautifulSoup(HTML, 'html.parser'))
+
+
+@pytest.mark.parametrize("parse, name", [(extract_profile_data, 'nl_profile'), (es_extract_profile_data, 'es_profile')])
+@pytest.mark.parametrize("backend", ['html.parser', 'lxml'])
+def test_profile_records_match_recorded_output(parse, name, backend):
+    record = parse((FIXTURES / f'{name}.html').read_text(encoding='utf-8'), backend)
+    record.pop('uuid')
+
+    assert record == json.loads((FIXTURES / f'{name}.expected.json').read_text(encoding='utf-8'))
@@ -0,0 +1,94 @@
+import contextlib
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from playwright.async_api import Error as PlaywrightError
+from src.utils.fetchers.fetchers import BrowserFetcher, fetch_and_parse, needs_browser
+
+
+def make_fetcher(content):
+    fetcher = MagicMock()
+    fetcher.fetch = AsyncMock(return_value=content)
+    return fetcher
+
+
+def test_needs_browser():
+    assert needs_browser(None)
+    assert needs_browser({"error": "ValueError", "message": "Main container not found"})
+    assert not needs_browser({"error": "AttributeError", "message": "boom"})
+    assert not needs_browser({"business_id": "1"})
+
+
+@pytest.mark.asyncio
+async def test_static_fetch_skips_browser_when_parse_succeeds():
+    http_fetcher = make_fetcher("<html>static</html>")
+    browser_fetcher = make_fetcher("<html>rendered</html>")
+
+    result = await fetch_and_parse("https://example.com", lambda html: {"html": html}, browser_fetcher, http_fetcher)
+
+    assert result == {"html": "<html>static</html>"}
+    browser_fetcher.fetch.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_missing_container_falls_back_to_browser():
+    http_fetcher = make_fetcher("<html>static</html>")
+    browser_fetcher = make_fetcher("<html>rendered</html>")
+
+    def parse(html):
+        if "static" in html:
+            return {"error": "ValueError", "message": "Left container not found"}
+        return {"html": html}
+
+    result = await fetch_and_parse("https://example.com", parse, browser_fetcher, http_fetcher)
+
+    assert result == {"html": "<html>rendered</html>"}
+    browser_fetcher.fetch.assert_awaited_once_with("https://example.com")
+
+
+@pytest.mark.asyncio
+async def test_failed_static_fetch_falls_back_to_browser():
+    http_fetcher = make_fetcher(None)
+    browser_fetcher = make_fetcher("<html>rendered</html>")
+
+    result = await fetch_and_parse("https://example.com", lambda html: {"html": html}, browser_fetcher, http_fetcher)
+
+    assert result == {"html": "<html>rendered</html>"}
+
+
+@pytest.mark.asyncio
+async def test_browser_only_mode():
+    browser_fetcher = make_fetcher("<html>rendered</html>")
+
+    result = await fetch_and_parse("https://example.com", lambda html: {"html": html}, browser_fetcher)
+
+    assert result == {"html": "<html>rendered</html>"}
+
+
+@pytest.mark.asyncio
+async def test_parsed_document_is_archived():
+    http_fetcher = make_fetcher("<html>static</html>")
+    browser_fetcher = make_fetcher("<html>rendered</html>")
+    archive = MagicMock()
+    archive.store = AsyncMock(side_effect=OSError("disk full"))
+
+    parse = lambda html: {"error": "ValueError", "message": "Main container not found"} if "static" in html else {}
+    result = await fetch_and_parse("https://example.com", parse, browser_fetcher, http_fetcher, archive=archive,
+                                   source="kw")
+
+    assert result == {}
+    archive.store.assert_awaited_once_with("https://example.com", "<html>rendered</html>", "kw")
+
+
+@pytest.mark.asyncio
+async def test_browser_fetch_refuses_pages_that_did_not_render():
+    page = MagicMock(content=AsyncMock(return_value="<html>captcha</html>"))
+
+    @contextlib.asynccontextmanager
+    async def lease():
+        yield page
+
+    fetcher = BrowserFetcher(MagicMock(lease=lease), page_type="nl_profile")
+    with patch("src.utils.fetchers.fetchers.navigate", new=AsyncMock(return_value="blocked")):
+        with pytest.raises(PlaywrightError):
+            await fetcher.fetch("https://example.com")
+    page.content.assert_not_awaited()
@@ -0,0 +1,77 @@
+import csv
+import json
+from pathlib import Path
+import pytest
+from src.utils.storage.html_archive import HtmlArchive, INDEX_NAME
+from src.utils.parsers.reparse import reparse_archive
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.mark.asyncio
+async def test_pages_round_trip_and_survive_a_reload(tmp_path):
+    archive = HtmlArchive(tmp_path, run_id="run")
+    await archive.store("https://example.com/1", "<html>één</html>", "kw")
+    archive.close()
+
+    reloaded = HtmlArchive(tmp_path)
+    assert reloaded.read("https://example.com/1") == "<html>één</html>"
+    assert reloaded.entries["https://example.com/1"]["source"] == "kw"
+
+
+@pytest.mark.asyncio
+async def test_identical_pages_are_stored_once(tmp_path):
+    archive = HtmlArchive(tmp_path, run_id="run")
+    page = "<html>" + "x" * 5000 + "</html>"
+    await archive.store("https://example.com/1", page)
+    await archive.store("https://example.com/2", page)
+    archive.close()
+
+    assert archive.stored == 1
+    assert archive.entries["https://example.com/1"]["offset"] == archive.entries["https://example.com/2"]["offset"]
+    assert archive.read("https://example.com/2") == page
+    assert archive.stored_bytes < len(page) / 10
+
+
+@pytest.mark.asyncio
+async def test_segments_roll_at_the_size_limit(tmp_path):
+    archive = HtmlArchive(tmp_path, max_segment_bytes=40, run_id="run")
+    for i in range(4):
+        await archive.store(f"https://example.com/{i}", f"<html>page {i}</html>")
+    archive.close()
+
+    assert len(list(tmp_path.glob("segment-run-*.z"))) > 1
+    assert [archive.read(f"https://example.com/{i}") for i in range(4)] == [f"<html>page {i}</html>" for i in range(4)]
+
+
+@pytest.mark.asyncio
+async def test_torn_index_line_is_skipped(tmp_path):
+    archive = HtmlArchive(tmp_path, run_id="run")
+    await archive.store("https://example.com/1", "<html>1</html>")
+    archive.close()
+    with (tmp_path / INDEX_NAME).open('a', encoding='utf-8') as index:
+        index.write('{"url": "https://exa')
+
+    resumed = HtmlArchive(tmp_path, run_id="run2")
+    await resumed.store("https://example.com/2", "<html>2</html>")
+    resumed.close()
+
+    assert set(HtmlArchive(tmp_path).entries) == {"https://example.com/1", "https://example.com/2"}
+
+
+@pytest.mark.asyncio
+async def test_reparse_replays_archive_through_current_parser(tmp_path):
+    archive = HtmlArchive(tmp_path / "archive" / "nl", run_id="run")
+    page = (FIXTURES / "nl_profile.html").read_text(encoding="utf-8")
+    await archive.store("https://example.com/1", page, "advocaat")
+    await archive.store("https://example.com/2", "<html>not a profile</html>", "advocaat")
+    archive.close()
+
+    stats = await reparse_archive("nl", "csv", tmp_path / "out", archive_dir=tmp_path / "archive", workers=0)
+
+    assert (stats["pages"], stats["parsed"], stats["failed"]) == (2, 1, 1)
+    with (tmp_path / "out" / "advocaat_profile_data.csv").open(newline='', encoding='utf-8') as output:
+        rows = list(csv.DictReader(output))
+    expected = json.loads((FIXTURES / "nl_profile.expected.json").read_text(encoding="utf-8"))
+    assert [(row["business_id"], row["business_name"]) for row in rows] == \
+        [(expected["business_id"], expected["business_name"])]
@@ -0,0 +1,71 @@
+import gzip
+import json
+import zstandard
+import pytest
+from src.utils.storage import jsonl_sink
+from src.utils.storage.jsonl_sink import JsonlSink, GZIP, ZSTD, NONE
+from src.utils.storage.sinks import create_profile_sink, JSONL
+
+
+def records(upload, key):
+    data = upload.objects[key]
+    if key.endswith(".gz"):
+        data = gzip.decompress(data)
+    elif key.endswith(".zst"):
+        data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    return [json.loads(line) for line in data.decode('utf-8').splitlines()]
+
+
+RECORD = {
+    'uuid': "1",
+    'miscellaneous_info': {"Certificeringen": ["NOvA"], "Sociale Media": [{"LinkedIn": "https://li/x"}]},
+    'competitors': [{"competitor_title": "Jansen", "competitor_phone": ""}],
+    'description': "Ñandú & co",
+}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("compression, suffix", [(GZIP, ".jsonl.gz"), (ZSTD, ".jsonl.zst"), (NONE, ".jsonl")])
+async def test_nested_records_round_trip(compression, suffix, upload):
+    sink = JsonlSink("kw", upload, compression=compression, max_age=60, run_id="run")
+
+    await sink.write(RECORD)
+    await sink.write(dict(RECORD, uuid="2"))
+    await sink.close()
+
+    key = f"kw/run/part-00000{suffix}"
+    assert records(upload, key) == [RECORD, dict(RECORD, uuid="2")]
+
+
+@pytest.mark.asyncio
+async def test_parts_rotate_by_size(upload):
+    written = []
+    sink = JsonlSink("kw", upload, compression=NONE, max_bytes=400, max_age=60, run_id="run",
+                     on_written=written.extend)
+
+    for i in range(6):
+        await sink.write(dict(RECORD, uuid=str(i)), key=("kw", f"url-{i}"))
+    await sink.close()
+
+    assert 1 < sink.parts < 6
+    assert [record['uuid'] for key in sorted(upload.objects) for record in records(upload, key)] == \
+        [str(i) for i in range(6)]
+    assert written == [("kw", f"url-{i}") for i in range(6)]
+
+
+def test_zstd_falls_back_to_gzip_without_zstandard(monkeypatch, upload):
+    monkeypatch.setattr(jsonl_sink, "zstandard", None)
+    sink = JsonlSink("kw", upload, compression=ZSTD)
+    assert sink.compression == GZIP
+    assert sink.extension == ".jsonl.gz"
+
+
+@pytest.mark.asyncio
+async def test_factory_writes_local_jsonl_parts(tmp_path):
+    sink = create_profile_sink("kw", "es", ['uuid'], output_sink=JSONL, data_dir=tmp_path)
+    await sink.write(RECORD)
+    await sink.close()
+
+    parts = list((tmp_path / "kw_profile_data").rglob("part-*"))
+    assert len(parts) == 1
+    assert parts[0].name.startswith("part-00000.jsonl")
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.utils.navigation import NavigationPolicy, navigate, wait_for_outcome
+
+
+def make_page(present, delay=0.01):
+    async def wait_for_selector(selector, state=None, timeout=None):
+        if any(sel in selector for sel in present):
+            await asyncio.sleep(delay)
+            return MagicMock()
+        await asyncio.sleep(timeout / 1000)
+        raise TimeoutError(f"Timeout waiting for {selector}")
+
+    page = MagicMock()
+    page.wait_for_selector = AsyncMock(side_effect=wait_for_selector)
+    return page
+
+
+@pytest.mark.asyncio
+async def test_success_selector_wins_the_race():
+    policy = NavigationPolicy(success_selectors=['#profile'], empty_selectors=['.no-results'], selector_timeout=500)
+    assert await wait_for_outcome(make_page(['#profile']), policy) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_block_page_ends_the_wait_early():
+    policy = NavigationPolicy(success_selectors=['#profile'], selector_timeout=5000)
+    started = asyncio.get_running_loop().time()
+
+    outcome = await wait_for_outcome(make_page(['captcha']), policy)
+
+    assert outcome == "blocked"
+    assert asyncio.get_running_loop().time() - started < 1
+
+
+@pytest.mark.asyncio
+async def test_nothing_matching_times_out():
+    policy = NavigationPolicy(success_selectors=['#profile'], selector_timeout=50)
+    assert await wait_for_outcome(make_page([]), policy) == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_navigate_uses_policy_wait_and_budget():
+    policy = NavigationPolicy(success_selectors=['#profile'], wait_until="commit", timeout=1234)
+    page = make_page(['#profile'])
+
+    with patch("src.utils.navigation.get_navigation_policy", return_value=policy), \
+            patch("src.utils.navigation.controlled_goto", new=AsyncMock()) as mock_goto:
+        outcome = await navigate(page, "https://www.goudengids.nl/nl/bedrijf/x", "nl_profile")
+
+    assert outcome == "ok"
+    mock_goto.assert_awaited_once_with(page, "https://www.goudengids.nl/nl/bedrijf/x", wait_until="commit",
+                                       timeout=1234)
@@ -0,0 +1,79 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.utils.page_pool import PagePool
+
+
+def make_context():
+    def new_page():
+        page = MagicMock()
+        page.close = AsyncMock()
+        page.set_extra_http_headers = AsyncMock()
+        page.is_closed.return_value = False
+        return page
+
+    context = MagicMock()
+    context.new_page = AsyncMock(side_effect=lambda: new_page())
+    return context
+
+
+@pytest.mark.asyncio
+async def test_pool_creates_fixed_number_of_pages():
+    context = make_context()
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()) as mock_stealth:
+        pool = await PagePool(context, size=3).start()
+
+        for _ in range(10):
+            async with pool.lease():
+                pass
+
+    assert context.new_page.await_count == 3
+    assert mock_stealth.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_after_max_uses():
+    context = make_context()
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()):
+        pool = await PagePool(context, size=1, max_uses=2).start()
+
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        async with pool.lease() as third:
+            pass
+
+    assert first is second
+    assert third is not first
+    first.close.assert_awaited_once()
+    assert pool.recycled == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_recycles_on_error():
+    context = make_context()
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()):
+        pool = await PagePool(context, size=1, headers={"x": "1"}).start()
+
+        with pytest.raises(RuntimeError):
+            async with pool.lease() as broken:
+                raise RuntimeError("navigation failed")
+
+        async with pool.lease() as page:
+            pass
+
+    assert page is not broken
+    broken.close.assert_awaited_once()
+    page.set_extra_http_headers.assert_awaited_with({"x": "1"})
+
+
+@pytest.mark.asyncio
+async def test_pool_close_closes_all_pages():
+    context = make_context()
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()):
+        pool = await PagePool(context, size=2).start()
+        pages = list(pool._uses)
+        await pool.close()
+
+    for page in pages:
+        page.close.assert_awaited_once()
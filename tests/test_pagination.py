@@ -0,0 +1,64 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.spiders import profile_url_spider
+from src.utils.task_utils.pagination import collect_listing_pages
+
+
+def make_context():
+    def new_page():
+        page = MagicMock()
+        page.close = AsyncMock()
+        page.is_closed.return_value = False
+        return page
+
+    context = MagicMock()
+    context.new_page = AsyncMock(side_effect=lambda: new_page())
+    return context
+
+
+@pytest.mark.asyncio
+async def test_listing_results_are_assembled_in_page_order():
+    urls = [f"https://example.com/search/{i}" for i in range(1, 9)]
+
+    async def process_url(page, url):
+        page_num = int(url.rsplit('/', 1)[-1])
+        await asyncio.sleep(0.01 * (9 - page_num))
+        return [f"/profile/{page_num}a", f"/profile/{page_num}b"]
+
+    context = make_context()
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()):
+        endpoints = await collect_listing_pages(context, urls, process_url, concurrency=3)
+
+    assert endpoints == [f"/profile/{i}{s}" for i in range(1, 9) for s in "ab"]
+    assert context.new_page.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_listing_page_is_skipped():
+    urls = ["https://example.com/search/1", "https://example.com/search/2"]
+
+    async def process_url(page, url):
+        if url.endswith("/2"):
+            raise RuntimeError("page crashed")
+        return ["/profile/1"]
+
+    with patch("src.utils.page_pool.stealth_async", new=AsyncMock()):
+        endpoints = await collect_listing_pages(make_context(), urls, process_url, concurrency=2)
+
+    assert endpoints == ["/profile/1"]
+
+
+@pytest.mark.asyncio
+async def test_empty_listing_page_yields_nothing_and_blocked_page_is_retried():
+    extract = AsyncMock(return_value=["/nl/bedrijf/x"])
+    navigate = AsyncMock(side_effect=["empty", "blocked", "ok"])
+
+    with patch.object(profile_url_spider, "navigate", navigate), \
+            patch.object(profile_url_spider, "extract_listing_from_page", extract), \
+            patch.object(profile_url_spider.asyncio, "sleep", new=AsyncMock()):
+        assert await profile_url_spider.process_url(MagicMock(), "https://example.com/p/9") == []
+        extract.assert_not_awaited()
+        assert await profile_url_spider.process_url(MagicMock(), "https://example.com/p/1") == ["/nl/bedrijf/x"]
+
+    assert navigate.await_count == 3
@@ -0,0 +1,128 @@
+import asyncio
+import io
+import json
+from pathlib import Path
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from src.utils.storage.parquet_sink import ParquetSink, NL_PROFILE_COLUMNS, ES_PROFILE_COLUMNS
+from src.utils.storage.csv_sink import CsvSink
+from src.utils.storage.s3_sink import S3BatchSink
+from src.utils.storage.sinks import create_profile_sink, PARQUET, CSV
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def read_table(upload, key):
+    return pq.read_table(io.BytesIO(upload.objects[key]))
+
+
+def golden(name):
+    record = json.loads((FIXTURES / f"{name}.expected.json").read_text(encoding="utf-8"))
+    record["uuid"] = "uuid-1"
+    return record
+
+
+@pytest.mark.asyncio
+async def test_nl_record_is_stored_with_typed_nested_columns(upload):
+    sink = ParquetSink("kw", NL_PROFILE_COLUMNS, upload, run_id="run")
+    record = golden("nl_profile")
+    record["email"] = "unavailable"
+
+    await sink.write(record)
+    await sink.close()
+
+    table = read_table(upload, "kw/run/part-00000.parquet")
+    row = table.to_pylist()[0]
+    assert pa.types.is_dictionary(table.schema.field("city").type)
+    assert row["city"] == "Amsterdam"
+    assert row["email"] is None
+    assert row["business_images"] == ["https://cdn.goudengids.nl/img/devries/1.jpg",
+                                      "https://cdn.goudengids.nl/img/devries/2.jpg"]
+    assert row["competitors"][1] == {"competitor_title": "Bakker Legal", "competitor_phone": None,
+                                     "competitor_url": record["competitors"][1]["competitor_url"]}
+    assert {"section": "Certificeringen", "key": None, "values": ["NOvA"]} in row["miscellaneous_info"]
+    assert {"section": "Specialisaties", "key": "Talen", "values": ["Nederlands", "Engels"]} in row["miscellaneous_info"]
+
+
+@pytest.mark.asyncio
+async def test_es_record_types(upload):
+    sink = ParquetSink("kw", ES_PROFILE_COLUMNS, upload, run_id="run")
+
+    await sink.write(golden("es_profile"))
+    await sink.close()
+
+    table = read_table(upload, "kw/run/part-00000.parquet")
+    row = table.to_pylist()[0]
+    assert table.schema.field("latitude").type == pa.float64()
+    assert pa.types.is_dictionary(table.schema.field("profession").type)
+    assert row["latitude"] == pytest.approx(40.4189)
+    assert row["city"] == "Madrid"
+    assert row["miscellaneous_info"] == ["Parking cercano", "Acceso para silla de ruedas", "Idiomas:español, inglés"]
+
+
+@pytest.mark.asyncio
+async def test_records_roll_into_row_groups_and_parts(upload):
+    written = []
+    sink = ParquetSink("kw", ES_PROFILE_COLUMNS, upload, row_group_size=2, part_rows=4, run_id="run",
+                       on_written=written.extend)
+
+    for i in range(5):
+        await sink.write({"uuid": str(i), "profession": "abogados"}, key=("kw", f"url-{i}"))
+    assert written == [("kw", f"url-{i}") for i in range(4)]
+    await sink.close()
+
+    assert sorted(upload.objects) == ["kw/run/part-00000.parquet", "kw/run/part-00001.parquet"]
+    first = pq.ParquetFile(io.BytesIO(upload.objects["kw/run/part-00000.parquet"]))
+    assert first.metadata.num_row_groups == 2
+    assert first.metadata.num_rows == 4
+    assert read_table(upload, "kw/run/part-00001.parquet").column("uuid").to_pylist() == ["4"]
+    assert written == [("kw", f"url-{i}") for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_stale_part_is_stored_by_age(upload):
+    written = []
+    sink = ParquetSink("kw", ES_PROFILE_COLUMNS, upload, max_age=0.1, run_id="run", on_written=written.extend)
+
+    await sink.write({"uuid": "1"}, key=("kw", "url-1"))
+    await asyncio.sleep(0.3)
+
+    assert read_table(upload, "kw/run/part-00000.parquet").column("uuid").to_pylist() == ["1"]
+    assert written == [("kw", "url-1")]
+    await sink.close()
+    assert sink.parts == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_part_is_kept_and_retried(upload):
+    upload.fail = 1
+    written = []
+    sink = ParquetSink("kw", ES_PROFILE_COLUMNS, upload, run_id="run", on_written=written.extend)
+
+    await sink.write({"uuid": "1"}, key=("kw", "url-1"))
+    await sink.flush()
+    assert upload.objects == {} and written == []
+
+    await sink.close()
+    assert list(upload.objects) == ["kw/run/part-00000.parquet"]
+    assert written == [("kw", "url-1")]
+
+
+@pytest.mark.asyncio
+async def test_factory_writes_local_parquet_parts(tmp_path):
+    sink = create_profile_sink("kw", "nl", ['uuid'], output_sink=PARQUET, data_dir=tmp_path)
+    await sink.write(golden("nl_profile"))
+    await sink.close()
+
+    parts = list((tmp_path / "kw_profile_data").rglob("*.parquet"))
+    assert len(parts) == 1
+    assert pq.read_table(parts[0]).num_rows == 1
+    assert not list(tmp_path.rglob("*.partial"))
+
+
+def test_factory_selects_csv_sinks(tmp_path):
+    assert isinstance(create_profile_sink("kw", "nl", ['uuid'], output_sink=CSV, to_s3=True), S3BatchSink)
+    local = create_profile_sink("kw", "nl", ['uuid'], output_sink=CSV, data_dir=tmp_path, shard_suffix="_shard1")
+    assert isinstance(local, CsvSink)
+    assert local.path == tmp_path / "kw_shard1_profile_data.csv"
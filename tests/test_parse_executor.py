@@ -0,0 +1,78 @@
+import asyncio
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+import pytest
+from src.utils.parsers.parse_executor import ParseExecutor, default_parse_workers
+from src.utils.parsers.parse_profile import extract_profile_data
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def without_uuid(record):
+    return {k: v for k, v in record.items() if k != 'uuid'}
+
+
+def test_default_parse_workers_splits_cores_between_shards():
+    assert default_parse_workers() >= 1
+    assert default_parse_workers(shards=1000) == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_parse_matches_inline_parse():
+    html = (FIXTURES / 'nl_profile.html').read_text(encoding='utf-8')
+    executor = ParseExecutor(workers=2).start()
+    try:
+        record = await executor.parse(extract_profile_data, html)
+    finally:
+        executor.close()
+
+    assert without_uuid(record) == without_uuid(extract_profile_data(html))
+
+
+@pytest.mark.asyncio
+async def test_zero_workers_parses_inline():
+    executor = ParseExecutor(workers=0).start()
+
+    assert await executor.parse(lambda html: {"html": html}, "<p>x</p>") == {"html": "<p>x</p>"}
+    executor.close()
+
+
+class FakePool(Executor):
+    def __init__(self, broken=False):
+        self.broken = broken
+        self.shutdowns = 0
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken:
+            future.set_exception(BrokenProcessPool("worker died"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdowns += 1
+
+
+class FakeParseExecutor(ParseExecutor):
+    def __init__(self, pools):
+        super().__init__(workers=1)
+        self.pools = pools
+
+    def start(self):
+        self._executor = self.pools.pop(0)
+        return self
+
+
+@pytest.mark.asyncio
+async def test_concurrent_breakage_restarts_the_pool_once():
+    broken, replacement = FakePool(broken=True), FakePool()
+    executor = FakeParseExecutor([broken, replacement]).start()
+
+    results = await asyncio.gather(*(executor.parse(lambda html: {"html": html}, f"<p>{i}</p>") for i in range(3)))
+
+    assert results == [{"html": f"<p>{i}</p>"} for i in range(3)]
+    assert broken.shutdowns == 1
+    assert replacement.shutdowns == 0
+    assert executor._executor is replacement
@@ -0,0 +1,50 @@
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from src.utils.parsers.parse_listing import (BROWSER, ES_LISTING, HTML, IN_PAGE_EXTRACT, NL_LISTING,
+                                             es_extract_listing_endpoints, extract_listing_endpoints,
+                                             extract_listing_from_page)
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def test_nl_listing_endpoints_skip_banners():
+    endpoints = extract_listing_endpoints((FIXTURES / 'nl_listing.html').read_text(encoding='utf-8'))
+
+    assert len(endpoints) == 25
+    assert endpoints[0] == "/nl/bedrijf/Amsterdam/L10000000/Advocatenkantoor+0/"
+
+
+def test_es_listing_endpoints_skip_links_without_href():
+    endpoints = es_extract_listing_endpoints((FIXTURES / 'es_listing.html').read_text(encoding='utf-8'))
+
+    assert len(endpoints) == 30
+    assert all(url.startswith("https://www.paginasamarillas.es/f/") for url in endpoints)
+
+
+def test_listing_without_results_container():
+    assert extract_listing_endpoints("<html><body></body></html>") == []
+    assert es_extract_listing_endpoints("<html><body></body></html>") == []
+
+
+@pytest.mark.asyncio
+async def test_browser_mode_extracts_in_page():
+    page = MagicMock()
+    page.evaluate = AsyncMock(return_value=["/nl/bedrijf/a/"])
+    page.content = AsyncMock()
+
+    assert await extract_listing_from_page(page, NL_LISTING, mode=BROWSER) == ["/nl/bedrijf/a/"]
+    page.evaluate.assert_awaited_once_with(IN_PAGE_EXTRACT, list(NL_LISTING))
+    page.content.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_html_mode_parses_the_document():
+    page = MagicMock()
+    page.evaluate = AsyncMock()
+    page.content = AsyncMock(return_value=(FIXTURES / 'es_listing.html').read_text(encoding='utf-8'))
+
+    endpoints = await extract_listing_from_page(page, ES_LISTING, mode=HTML)
+
+    assert len(endpoints) == 30
+    page.evaluate.assert_not_awaited()
@@ -0,0 +1,39 @@
+from pathlib import Path
+import pytest
+from src.utils.parsers.backends import PARSER_BACKENDS, make_soup
+from src.utils.parsers.parse_profile import extract_profile_data
+from src.utils.parsers.es_parse_profile import es_extract_profile_data
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def read_fixture(name):
+    return (FIXTURES / name).read_text(encoding='utf-8')
+
+
+def without_uuid(record):
+    return {k: v for k, v in record.items() if k != 'uuid'}
+
+
+@pytest.mark.parametrize("parse, fixture", [
+    (extract_profile_data, 'nl_profile.html'),
+    (es_extract_profile_data, 'es_profile.html')
+])
+def test_backends_produce_identical_records(parse, fixture):
+    html = read_fixture(fixture)
+    records = [without_uuid(parse(html, backend)) for backend in PARSER_BACKENDS]
+
+    assert 'error' not in records[0]
+    assert all(record == records[0] for record in records)
+
+
+@pytest.mark.parametrize("parse", [extract_profile_data, es_extract_profile_data])
+def test_backends_report_the_same_error(parse):
+    html = "<html><body><div>no profile here</div></body></html>"
+
+    assert len({tuple(sorted(parse(html, backend).items())) for backend in PARSER_BACKENDS}) == 1
+
+
+def test_make_soup_uses_requested_backend():
+    assert make_soup("<p>x</p>", "html.parser").builder.NAME == "html.parser"
+    assert make_soup("<p>x</p>", "lxml").builder.NAME == "lxml"
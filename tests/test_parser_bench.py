@@ -0,0 +1,28 @@
+from benchmarks.parser_bench import compare_reports, count_records, run_case
+
+
+def make_report(pages_per_sec, peak_traced_kb, records_per_page=1):
+    return {"cases": {"nl_profile": {"pages_per_sec": pages_per_sec, "peak_traced_kb": peak_traced_kb,
+                                     "records_per_page": records_per_page}}}
+
+
+def test_count_records():
+    assert count_records(["a", "b"]) == 2
+    assert count_records({"business_id": "1"}) == 1
+    assert count_records({"error": "ValueError"}) == 0
+
+
+def test_compare_reports_flags_regressions():
+    baseline = make_report(100, 100)
+
+    assert compare_reports(make_report(90, 110), baseline) == []
+    assert len(compare_reports(make_report(70, 100), baseline)) == 1
+    assert len(compare_reports(make_report(100, 130, records_per_page=0), baseline)) == 2
+
+
+def test_run_case_measures_a_fixture():
+    result = run_case("es_listing", iterations=2, backend="html.parser")
+
+    assert result["records_per_page"] == 30
+    assert result["pages_per_sec"] > 0
+    assert result["peak_traced_kb"] > 0
@@ -0,0 +1,112 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.utils.task_utils.rate_controller import DomainRateController, RequestOutcome, controlled_goto, looks_blocked
+
+
+def make_controller(**kwargs):
+    settings = dict(initial_limit=2, min_limit=1, max_limit=4, initial_interval=0.0, min_interval=0.0)
+    settings.update(kwargs)
+    return DomainRateController("www.example.com", **settings)
+
+
+def test_additive_increase_after_clean_window():
+    controller = make_controller()
+    for _ in range(2):
+        controller.on_success(0.5)
+    assert controller.limit == 3
+    for _ in range(3):
+        controller.on_success(0.5)
+    assert controller.limit == 4
+    for _ in range(10):
+        controller.on_success(0.5)
+    assert controller.limit == 4
+
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_gives_its_slot_back():
+    controller = make_controller(initial_limit=1, max_limit=1, initial_interval=0.5)
+    async with controller.request():
+        pass
+
+    # The second request is still pacing when the task timeout cancels it
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(controller.acquire(), timeout=0.05)
+    assert controller.in_flight == 0
+
+    await asyncio.wait_for(controller.acquire(), timeout=2)
+    assert controller.in_flight == 1
+    await controller.release()
+
+
+def test_multiplicative_decrease_on_throttle_signals():
+    controller = make_controller(initial_limit=4)
+    outcome = RequestOutcome()
+    outcome.status = 429
+    controller.on_outcome(outcome, 0.5)
+
+    assert controller.limit == 2
+    assert controller.interval >= 1.0
+    assert controller.throttles == 1
+
+    # A burst of failures from requests already in flight counts once
+    controller.on_throttle("timeout")
+    assert controller.limit == 2
+    assert controller.throttles == 2
+
+
+def test_slow_responses_do_not_grow_the_window():
+    controller = make_controller(latency_ceiling=1.0)
+    for _ in range(10):
+        controller.on_success(5.0)
+    assert controller.limit == 2
+
+
+def test_looks_blocked():
+    assert looks_blocked("<script src='/_Incapsula_Resource?x=1'></script>")
+    assert not looks_blocked("<html><div id='profile'></div></html>")
+    assert not looks_blocked(None)
+
+
+@pytest.mark.asyncio
+async def test_in_flight_requests_are_capped_by_limit():
+    controller = make_controller(initial_limit=2, max_limit=2)
+    in_flight = 0
+    peak = 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with controller.request():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_timeouts_count_as_throttling():
+    controller = make_controller(initial_limit=4)
+    with pytest.raises(asyncio.TimeoutError):
+        async with controller.request():
+            raise asyncio.TimeoutError()
+    assert controller.limit == 2
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_controlled_goto_records_status(monkeypatch):
+    controller = make_controller(initial_limit=4)
+    monkeypatch.setattr("src.utils.task_utils.rate_controller.get_rate_controller", lambda url: controller)
+
+    page = MagicMock()
+    page.url = "https://www.example.com/profile"
+    page.goto = AsyncMock(return_value=MagicMock(status=403))
+
+    await controlled_goto(page, "https://www.example.com/profile", timeout=1000)
+
+    page.goto.assert_awaited_once_with("https://www.example.com/profile", timeout=1000)
+    assert controller.limit == 2
@@ -0,0 +1,60 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from src.utils.resource_policy import ResourcePolicy, ESTIMATED_BYTES
+
+
+def make_route(url, resource_type):
+    route = MagicMock()
+    route.request.url = url
+    route.request.resource_type = resource_type
+    route.abort = AsyncMock()
+    route.continue_ = AsyncMock()
+    return route
+
+
+def test_blocks_by_resource_type():
+    policy = ResourcePolicy()
+    assert policy.should_block("https://www.goudengids.nl/img/logo.png", "image")
+    assert policy.should_block("https://www.goudengids.nl/fonts/a.woff2", "font")
+    assert not policy.should_block("https://www.goudengids.nl/nl/zoeken/abogado", "document")
+
+
+def test_blocks_denied_domains_and_subdomains():
+    policy = ResourcePolicy()
+    assert policy.should_block("https://www.google-analytics.com/analytics.js", "script")
+    assert policy.should_block("https://stats.g.doubleclick.net/collect", "xhr")
+    assert not policy.should_block("https://notdoubleclick.net/app.js", "script")
+
+
+def test_allow_list_blocks_third_parties():
+    policy = ResourcePolicy(allow_domains=["goudengids.nl"], deny_domains=[])
+    assert not policy.should_block("https://www.goudengids.nl/app.js", "script")
+    assert policy.should_block("https://cdn.example.com/app.js", "script")
+
+
+@pytest.mark.asyncio
+async def test_route_handler_counts_blocked_requests():
+    policy = ResourcePolicy()
+    blocked = make_route("https://www.goudengids.nl/img/a.jpg", "image")
+    allowed = make_route("https://www.goudengids.nl/", "document")
+
+    await policy.handle_route(blocked)
+    await policy.handle_route(allowed)
+
+    blocked.abort.assert_awaited_once()
+    allowed.continue_.assert_awaited_once()
+    assert policy.blocked_requests == 1
+    assert policy.bytes_saved == ESTIMATED_BYTES["image"]
+    assert policy.blocked_by_type == {"image": 1}
+
+
+@pytest.mark.asyncio
+async def test_disabled_policy_installs_no_route():
+    context = MagicMock()
+    context.route = AsyncMock()
+
+    await ResourcePolicy(enabled=False).apply(context)
+    context.route.assert_not_awaited()
+
+    await ResourcePolicy().apply(context)
+    context.route.assert_awaited_once()
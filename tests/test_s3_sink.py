@@ -0,0 +1,78 @@
+import asyncio
+import csv
+import io
+import pytest
+from src.utils.storage.s3_sink import S3BatchSink
+
+
+def rows(upload, key):
+    return list(csv.DictReader(io.StringIO(upload.objects[key].decode('utf-8'))))
+
+
+@pytest.mark.asyncio
+async def test_records_are_batched_into_size_rolled_parts(upload):
+    uploaded = []
+    sink = S3BatchSink("kw", ['uuid', 'phone'], max_bytes=60, max_age=60, run_id="run", upload=upload,
+                       on_uploaded=uploaded.extend)
+
+    for i in range(6):
+        await sink.write({'uuid': f"id-{i}", 'phone': "0612345678"}, key=("kw", f"url-{i}"))
+    await sink.close()
+
+    assert sink.records == 6
+    assert 1 < sink.parts < 6
+    assert sorted(upload.objects) == [f"kw/run/part-{i:05d}.csv" for i in range(sink.parts)]
+    assert sum(len(rows(upload, key)) for key in upload.objects) == 6
+    assert uploaded == [("kw", f"url-{i}") for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_new_field_starts_a_new_part(upload):
+    sink = S3BatchSink("kw", ['uuid'], run_id="run", upload=upload)
+
+    await sink.write({'uuid': "1"})
+    await sink.write({'uuid': "2", 'extra': "x"})
+    await sink.close()
+
+    assert rows(upload, "kw/run/part-00000.csv") == [{'uuid': "1"}]
+    assert rows(upload, "kw/run/part-00001.csv") == [{'uuid': "2", 'extra': "x"}]
+
+
+@pytest.mark.asyncio
+async def test_stale_part_is_flushed_by_age(upload):
+    sink = S3BatchSink("kw", ['uuid'], max_age=0.1, run_id="run", upload=upload)
+
+    await sink.write({'uuid': "1"})
+    await asyncio.sleep(0.3)
+
+    assert "kw/run/part-00000.csv" in upload.objects
+    await sink.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_keeps_rows_for_the_next_flush(upload):
+    upload.fail = 1
+    uploaded = []
+    sink = S3BatchSink("kw", ['uuid'], run_id="run", upload=upload, on_uploaded=uploaded.extend)
+
+    await sink.write({'uuid': "1"}, key=("kw", "url-1"))
+    await sink.flush()
+    assert upload.objects == {} and uploaded == []
+
+    await sink.close()
+    assert rows(upload, "kw/run/part-00000.csv") == [{'uuid': "1"}]
+    assert uploaded == [("kw", "url-1")]
+
+
+@pytest.mark.asyncio
+async def test_new_field_after_failed_upload_keeps_both_parts(upload):
+    upload.fail = 1
+    sink = S3BatchSink("kw", ['uuid'], run_id="run", upload=upload)
+
+    await sink.write({'uuid': "1"})
+    await sink.write({'uuid': "2", 'extra': "x"})
+    assert upload.objects == {}
+    await sink.close()
+
+    assert rows(upload, "kw/run/part-00000.csv") == [{'uuid': "1"}]
+    assert rows(upload, "kw/run/part-00001.csv") == [{'uuid': "2", 'extra': "x"}]
@@ -0,0 +1,79 @@
+import csv
+import pytest
+from src.utils.task_utils.dedupe import DedupeIndex, contact_key
+from src.utils.task_utils.sharding import partition_endpoints, merge_shard_outputs, run_sharded, shard_for
+
+
+class DummyProcessor:
+    def __init__(self, data_dir=None):
+        self.data_dir = data_dir
+        self.success_count = 0
+        self.shard_suffix = ""
+
+    async def process(self, endpoints):
+        path = self.data_dir / f"kw{self.shard_suffix}_profile_data.csv"
+        with path.open('w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=['crawled_url'])
+            writer.writeheader()
+            for _, url in endpoints:
+                writer.writerow({'crawled_url': url})
+                self.success_count += 1
+
+
+def test_partition_is_stable_and_complete():
+    endpoints = [("kw", f"https://example.com/{i}") for i in range(100)]
+    partitions = partition_endpoints(endpoints, 4)
+
+    assert sorted(e for p in partitions for e in p) == sorted(endpoints)
+    for index, partition in enumerate(partitions):
+        assert all(shard_for(url, 4) == index for _, url in partition)
+
+
+def test_merge_shard_outputs(tmp_path):
+    for index in range(2):
+        with (tmp_path / f"kw.shard{index}_profile_data.csv").open('w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['crawled_url'])
+            writer.writerow([f"https://example.com/{index}"])
+
+    merged = merge_shard_outputs(tmp_path, 2)
+
+    assert merged == [tmp_path / "kw_profile_data.csv"]
+    with merged[0].open(newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert [row['crawled_url'] for row in rows] == ["https://example.com/0", "https://example.com/1"]
+    assert not list(tmp_path.glob("*.shard*"))
+
+
+def test_merge_dedupes_across_shards_and_the_target(tmp_path):
+    with (tmp_path / "kw_profile_data.csv").open('w', newline='') as f:
+        csv.writer(f).writerows([['email', 'crawled_url'], ["old@example.com", "https://example.com/old"]])
+    shard_rows = [[("old@example.com", "a"), ("one@example.com", "b")],
+                  [("one@example.com", "c"), ("two@example.com", "d")]]
+    for index, rows in enumerate(shard_rows):
+        with (tmp_path / f"kw.shard{index}_profile_data.csv").open('w', newline='') as f:
+            csv.writer(f).writerows([['email', 'crawled_url'], *rows])
+        (tmp_path / f"kw.shard{index}_profile_data.keys.jsonl").write_text("")
+
+    merge_shard_outputs(tmp_path, 2, dedupe_key=contact_key)
+
+    with (tmp_path / "kw_profile_data.csv").open(newline='') as f:
+        urls = [row['crawled_url'] for row in csv.DictReader(f)]
+    assert urls == ["https://example.com/old", "b", "d"]
+    assert not list(tmp_path.glob("*.shard*"))
+    index = DedupeIndex(tmp_path / "kw_profile_data.keys.jsonl", source=tmp_path / "kw_profile_data.csv")
+    assert index.keys == {"old@example.com", "one@example.com", "two@example.com"}
+    index.close()
+
+
+@pytest.mark.asyncio
+async def test_run_sharded_merges_counts_and_files(tmp_path):
+    endpoints = [("kw", f"https://example.com/{i}") for i in range(12)]
+
+    total = await run_sharded(DummyProcessor, 'process', endpoints, 3, tmp_path,
+                              init_kwargs={'data_dir': tmp_path})
+
+    assert total == 12
+    with (tmp_path / "kw_profile_data.csv").open(newline='') as f:
+        urls = {row['crawled_url'] for row in csv.DictReader(f)}
+    assert urls == {url for _, url in endpoints}
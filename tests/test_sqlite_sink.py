@@ -0,0 +1,86 @@
+import json
+import sqlite3
+from pathlib import Path
+import pytest
+from src.utils.storage.sqlite_sink import SqliteSink, NL_PROFILE_COLUMNS, ES_PROFILE_COLUMNS
+from src.utils.storage.sinks import create_profile_sink, SQLITE
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def golden(name, **overrides):
+    record = json.loads((FIXTURES / f"{name}.expected.json").read_text(encoding="utf-8"))
+    record["uuid"] = "uuid-1"
+    record.update(overrides)
+    return record
+
+
+def query(path, sql):
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    try:
+        return connection.execute(sql).fetchall()
+    finally:
+        connection.close()
+
+
+@pytest.mark.asyncio
+async def test_rerun_updates_rows_instead_of_adding_them(tmp_path):
+    path = tmp_path / "profiles.sqlite3"
+    for phone in ("+31201234567", "+31209999999"):
+        sink = SqliteSink(path, "nl_profiles", NL_PROFILE_COLUMNS, source="advocaat", flush_interval=60)
+        await sink.write(golden("nl_profile", phone=phone))
+        await sink.close()
+
+    rows = query(path, "SELECT * FROM nl_profiles")
+    assert len(rows) == 1
+    assert rows[0]["phone"] == "+31209999999"
+    assert rows[0]["city"] == "Amsterdam"
+    assert rows[0]["source"] == "advocaat"
+    assert json.loads(rows[0]["competitors"])[0]["competitor_title"] == "Jansen Advocaten"
+    assert json.loads(rows[0]["miscellaneous_info"])["Certificeringen"] == ["NOvA", "VAAN"]
+
+
+@pytest.mark.asyncio
+async def test_rows_without_business_id_are_all_kept(tmp_path):
+    path = tmp_path / "profiles.sqlite3"
+    sink = SqliteSink(path, "es_profiles", ES_PROFILE_COLUMNS, flush_interval=60)
+    await sink.write(golden("es_profile", business_id="unavailable"))
+    await sink.write(golden("es_profile", business_id="unavailable", uuid="uuid-2"))
+    await sink.close()
+
+    rows = query(path, "SELECT business_id, latitude, miscellaneous_info FROM es_profiles")
+    assert [row["business_id"] for row in rows] == [None, None]
+    assert rows[0]["latitude"] == pytest.approx(40.4189)
+    assert json.loads(rows[0]["miscellaneous_info"])[0] == "Parking cercano"
+
+
+@pytest.mark.asyncio
+async def test_batches_commit_and_report_keys(tmp_path):
+    path = tmp_path / "profiles.sqlite3"
+    written = []
+    sink = SqliteSink(path, "es_profiles", ES_PROFILE_COLUMNS, batch_size=2, flush_interval=60,
+                      on_written=written.extend)
+
+    for i in range(3):
+        await sink.write({"business_id": str(i)}, key=("kw", f"url-{i}"))
+    assert len(query(path, "SELECT * FROM es_profiles")) == 2
+    assert written == [("kw", "url-0"), ("kw", "url-1")]
+
+    await sink.close()
+    assert len(query(path, "SELECT * FROM es_profiles")) == 3
+    assert written == [("kw", f"url-{i}") for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_factory_creates_wal_database_with_indexes(tmp_path):
+    sink = create_profile_sink("advocaat", "nl", ['uuid'], output_sink=SQLITE, data_dir=tmp_path)
+    await sink.write(golden("nl_profile"))
+    await sink.close()
+
+    path = tmp_path / "profiles.sqlite3"
+    assert query(path, "PRAGMA journal_mode")[0][0] == "wal"
+    indexes = {row["name"] for row in query(path, "PRAGMA index_list(nl_profiles)")}
+    assert {"nl_profiles_phone", "nl_profiles_email", "nl_profiles_city"} <= indexes
+    with pytest.raises(ValueError):
+        create_profile_sink("advocaat", "nl", ['uuid'], output_sink=SQLITE, to_s3=True)
@@ -0,0 +1,32 @@
+from benchmarks.storage_bench import compare_reports, run_case
+from src.utils.storage import storage_hundler
+
+
+def make_report(records_per_sec, bytes_per_sec, loop_blocked_ms):
+    return {"cases": {"nl_save_to_s3": {"records_per_sec": records_per_sec, "bytes_per_sec": bytes_per_sec,
+                                        "loop_blocked_ms": loop_blocked_ms}}}
+
+
+def test_compare_reports_flags_regressions():
+    baseline = make_report(100, 1000, 10)
+
+    assert compare_reports(make_report(90, 900, 14), baseline) == []
+    assert len(compare_reports(make_report(70, 1000, 10), baseline)) == 1
+    assert len(compare_reports(make_report(100, 700, 40), baseline)) == 2
+
+
+def test_run_case_counts_objects_per_record():
+    result = run_case("save_stream", records=20, latency=0.0)
+
+    assert result["objects"] == 20
+    assert result["bytes"] > 0
+    assert result["objects_per_sec"] > 0
+    assert storage_hundler._s3_client is None
+
+
+def test_run_case_batches_processor_records():
+    result = run_case("es_save_to_s3", records=20, latency=0.0)
+
+    assert result["records"] == 20
+    assert result["objects"] == 1
+    assert result["loop_blocked_ms"] >= 0
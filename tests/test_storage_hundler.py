@@ -0,0 +1,83 @@
+import asyncio
+import io
+import pytest
+from botocore.exceptions import ClientError
+from src.utils.storage import storage_hundler
+from src.utils.storage.storage_hundler import S3Uploader, close_uploader, save_stream_to_s3, set_s3_client
+from src.utils.storage.testing import InMemoryS3
+
+
+@pytest.fixture
+def stub_client():
+    client = InMemoryS3(latency=0.1)
+    set_s3_client(client)
+    yield client
+    set_s3_client(None)
+
+
+@pytest.mark.asyncio
+async def test_uploads_do_not_block_the_event_loop(stub_client):
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.gather(*(
+        save_stream_to_s3(io.BytesIO(b"a,b\n1,2\n"), f"kw_{i}.csv", content_type='text/csv', bucket_name="bucket")
+        for i in range(4)
+    ))
+    task.cancel()
+    await close_uploader()
+
+    assert len(stub_client.objects) == 4
+    assert stub_client.objects[("bucket", "kw_0.csv")] == (b"a,b\n1,2\n", 'text/csv')
+    # Four 100ms uploads ran on the I/O threads while the loop kept ticking
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+async def test_bucket_is_ensured_once(stub_client):
+    stub_client.bucket_exists = True
+    for i in range(3):
+        await save_stream_to_s3(io.BytesIO(b"x"), f"kw_{i}.csv", bucket_name="bucket")
+    await close_uploader()
+
+    assert stub_client.buckets == ["bucket"]
+    assert len(stub_client.objects) == 3
+
+
+@pytest.mark.asyncio
+async def test_pending_uploads_are_bounded(stub_client):
+    uploader = S3Uploader(workers=4, max_pending=2)
+    try:
+        await asyncio.gather(*(uploader.upload(io.BytesIO(b"x"), "bucket", f"k{i}", 'text/csv') for i in range(6)))
+    finally:
+        uploader.close()
+
+    assert stub_client.max_active <= 2
+    assert uploader.uploaded == 6
+
+
+@pytest.mark.asyncio
+async def test_upload_errors_reach_the_caller(stub_client):
+    stub_client.fail = 1
+    with pytest.raises(ClientError):
+        await save_stream_to_s3(io.BytesIO(b"x"), "kw.csv", bucket_name="bucket")
+    await close_uploader()
+    assert storage_hundler._uploader is None
+
+
+def test_uploader_from_another_loop_is_closed(stub_client):
+    async def current_uploader():
+        return storage_hundler.get_uploader()
+
+    first = asyncio.run(current_uploader())
+    second = asyncio.run(current_uploader())
+
+    assert second is not first
+    assert first.executor._shutdown
+    assert not second.executor._shutdown
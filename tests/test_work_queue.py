@@ -0,0 +1,61 @@
+import asyncio
+import pytest
+from src.utils.task_utils.work_queue import run_worker_pool
+
+
+@pytest.mark.asyncio
+async def test_results_keep_input_order():
+    async def handler(item):
+        await asyncio.sleep(0.01 * (5 - item))
+        return item * 2
+
+    results = await run_worker_pool(list(range(5)), handler, concurrency=3)
+    assert results == [0, 2, 4, 6, 8]
+
+
+@pytest.mark.asyncio
+async def test_slow_item_does_not_stall_other_slots():
+    finished = []
+
+    async def handler(item):
+        await asyncio.sleep(0.3 if item == "slow" else 0.01)
+        finished.append(item)
+        return item
+
+    items = ["slow"] + [f"fast-{i}" for i in range(9)]
+    await run_worker_pool(items, handler, concurrency=2)
+
+    # With fixed batches the fast items would wait behind "slow"; here one slot drains them all
+    assert finished[-1] == "slow"
+
+
+@pytest.mark.asyncio
+async def test_timeouts_and_errors_are_returned():
+    async def handler(item):
+        if item == "hang":
+            await asyncio.sleep(10)
+        if item == "boom":
+            raise ValueError("boom")
+        return item
+
+    results = await run_worker_pool(["ok", "hang", "boom"], handler, concurrency=3, task_timeout=0.05)
+
+    assert results[0] == "ok"
+    assert isinstance(results[1], asyncio.TimeoutError)
+    assert isinstance(results[2], ValueError)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded():
+    in_flight = 0
+    peak = 0
+
+    async def handler(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+
+    await run_worker_pool(list(range(20)), handler, concurrency=4)
+    assert peak == 4